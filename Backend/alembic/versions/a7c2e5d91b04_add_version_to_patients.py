@@ -0,0 +1,26 @@
+"""add version column to patients
+
+Revision ID: a7c2e5d91b04
+Revises: d4e9f1a7b823
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c2e5d91b04'
+down_revision: Union[str, Sequence[str], None] = 'd4e9f1a7b823'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('patients', sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('patients', 'version')
@@ -0,0 +1,35 @@
+"""add session_tombstones table and patients.updated_at index
+
+Revision ID: a9d3c1e6f042
+Revises: f2b7e9c4a130
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3c1e6f042'
+down_revision: Union[str, Sequence[str], None] = 'f2b7e9c4a130'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'session_tombstones',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_session_tombstones_deleted_at', 'session_tombstones', ['deleted_at'])
+    op.create_index('ix_patients_updated_at', 'patients', ['updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_patients_updated_at', table_name='patients')
+    op.drop_index('ix_session_tombstones_deleted_at', table_name='session_tombstones')
+    op.drop_table('session_tombstones')
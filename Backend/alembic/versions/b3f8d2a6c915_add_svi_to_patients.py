@@ -0,0 +1,27 @@
+"""add svi column to patients
+
+Revision ID: b3f8d2a6c915
+Revises: a7c2e5d91b04
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f8d2a6c915'
+down_revision: Union[str, Sequence[str], None] = 'a7c2e5d91b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('patients', sa.Column('svi', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('patients', 'svi')
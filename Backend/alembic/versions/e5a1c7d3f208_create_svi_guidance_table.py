@@ -0,0 +1,36 @@
+"""create svi_guidance table
+
+Revision ID: e5a1c7d3f208
+Revises: b3f8d2a6c915
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c7d3f208'
+down_revision: Union[str, Sequence[str], None] = 'b3f8d2a6c915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'svi_guidance',
+        sa.Column('stcnty', sa.String(length=5), nullable=False),
+        sa.Column('dataset_version', sa.String(length=16), nullable=False),
+        sa.Column('prompt_version', sa.String(length=16), nullable=False),
+        sa.Column('location', sa.Text(), nullable=False),
+        sa.Column('guidance', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('stcnty', 'dataset_version', 'prompt_version'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('svi_guidance')
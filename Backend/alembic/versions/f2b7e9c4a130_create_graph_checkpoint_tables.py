@@ -0,0 +1,51 @@
+"""create graph checkpoint tables
+
+Revision ID: f2b7e9c4a130
+Revises: c8d4f6a2e719
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7e9c4a130'
+down_revision: Union[str, Sequence[str], None] = 'c8d4f6a2e719'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'graph_checkpoints',
+        sa.Column('thread_id', sa.Text(), nullable=False),
+        sa.Column('checkpoint_ns', sa.Text(), server_default='', nullable=False),
+        sa.Column('checkpoint_id', sa.Text(), nullable=False),
+        sa.Column('parent_checkpoint_id', sa.Text(), nullable=True),
+        sa.Column('type', sa.Text(), nullable=False),
+        sa.Column('checkpoint', sa.LargeBinary(), nullable=False),
+        sa.Column('metadata', postgresql.JSONB(astext_type=sa.Text()), server_default='{}', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id'),
+    )
+    op.create_table(
+        'graph_checkpoint_writes',
+        sa.Column('thread_id', sa.Text(), nullable=False),
+        sa.Column('checkpoint_ns', sa.Text(), server_default='', nullable=False),
+        sa.Column('checkpoint_id', sa.Text(), nullable=False),
+        sa.Column('task_id', sa.Text(), nullable=False),
+        sa.Column('idx', sa.Integer(), nullable=False),
+        sa.Column('channel', sa.Text(), nullable=False),
+        sa.Column('type', sa.Text(), nullable=False),
+        sa.Column('blob', sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('graph_checkpoint_writes')
+    op.drop_table('graph_checkpoints')
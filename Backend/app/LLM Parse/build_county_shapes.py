@@ -0,0 +1,127 @@
+"""
+Build cdc_data/county_shapes.npz, the bundled county boundaries used by the
+offline lat/lon -> county resolver in cdcsvi_lookup.py.
+
+Input is a Census cartographic boundary county shapefile
+(cb_<year>_us_county_500k). Rings are simplified with Douglas-Peucker (~100 m
+at the default tolerance), quantized to 1e-5 degrees and delta-encoded, which
+keeps the file under 2 MB. Only the 50 states and DC are kept, matching the
+SVI table.
+
+Usage (needs pyshp, which is not a runtime dependency):
+    pip install pyshp
+    python build_county_shapes.py /path/to/cb_2022_us_county_500k [--tolerance 0.001]
+
+Use the same vintage as the SVI CSV so county FIPS codes line up (e.g. the
+Connecticut planning regions only exist from 2022 onwards).
+"""
+import argparse
+import os
+
+import numpy as np
+import shapefile
+
+OUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cdc_data", "county_shapes.npz")
+SCALE = 100_000  # stored units per degree; cdcsvi_lookup.py reads this back from the file
+
+# Census LSAD code -> suffix, to rebuild full names like "Orleans Parish".
+LSAD_SUFFIX = {
+    "03": "City and Borough",
+    "04": "Borough",
+    "05": "Census Area",
+    "06": "County",
+    "12": "Municipality",
+    "15": "Parish",
+    "25": "city",
+}
+
+
+def _simplify(ring: np.ndarray, tolerance: float) -> np.ndarray:
+    """Douglas-Peucker on a closed ring; always keeps the endpoints."""
+    if len(ring) <= 4:
+        return ring
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(ring) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        seg = ring[end] - ring[start]
+        pts = ring[start + 1:end] - ring[start]
+        norm = np.hypot(*seg)
+        if norm == 0:
+            dist = np.hypot(pts[:, 0], pts[:, 1])
+        else:
+            dist = np.abs(seg[0] * pts[:, 1] - seg[1] * pts[:, 0]) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = start + 1 + i
+            keep[mid] = True
+            stack.append((start, mid))
+            stack.append((mid, end))
+    out = ring[keep]
+    return out if len(out) >= 4 else ring[[0, len(ring) // 3, 2 * len(ring) // 3, -1]]
+
+
+def _centroid(rings: list[np.ndarray]) -> tuple[float, float]:
+    """Area-weighted centroid of the largest ring (lon, lat)."""
+    ring = max(rings, key=lambda r: abs(_signed_area(r)))
+    x, y = ring[:, 0], ring[:, 1]
+    cross = x[:-1] * y[1:] - x[1:] * y[:-1]
+    area = cross.sum() / 2
+    if area == 0:
+        return float(x.mean()), float(y.mean())
+    return float(((x[:-1] + x[1:]) * cross).sum() / (6 * area)), float(((y[:-1] + y[1:]) * cross).sum() / (6 * area))
+
+
+def _signed_area(ring: np.ndarray) -> float:
+    x, y = ring[:, 0], ring[:, 1]
+    return float((x[:-1] * y[1:] - x[1:] * y[:-1]).sum() / 2)
+
+
+def build(shapefile_path: str, tolerance: float) -> None:
+    reader = shapefile.Reader(shapefile_path)
+    stcnty, names, centroids, ring_counts, ring_sizes, points = [], [], [], [], [], []
+
+    for shape_rec in sorted(reader.iterShapeRecords(), key=lambda sr: sr.record["GEOID"]):
+        rec, shape = shape_rec.record, shape_rec.shape
+        if int(rec["STATEFP"]) > 56:
+            continue
+        coords = np.asarray(shape.points, dtype=np.float64)
+        # Aleutians West crosses the antimeridian; keep every longitude in (-360, 0].
+        coords[coords[:, 0] > 0, 0] -= 360
+        bounds = list(shape.parts) + [len(coords)]
+        rings = [_simplify(coords[a:b], tolerance) for a, b in zip(bounds[:-1], bounds[1:]) if b - a >= 4]
+
+        suffix = LSAD_SUFFIX.get(rec["LSAD"])
+        stcnty.append(int(rec["GEOID"]))
+        names.append(f'{rec["NAME"]} {suffix}' if suffix else rec["NAME"])
+        centroids.append(_centroid(rings))
+        ring_counts.append(len(rings))
+        ring_sizes.extend(len(r) for r in rings)
+        points.extend(rings)
+
+    np.savez_compressed(
+        OUT_PATH,
+        stcnty=np.asarray(stcnty, dtype=np.int32),
+        name=np.asarray(names),
+        centroid=np.asarray(centroids, dtype=np.float32),
+        ring_count=np.asarray(ring_counts, dtype=np.int32),
+        ring_size=np.asarray(ring_sizes, dtype=np.int32),
+        scale=np.int32(SCALE),
+        # Consecutive points are close, so deltas compress far better than
+        # absolute coordinates; np.cumsum restores them on load.
+        point_delta=np.diff(np.round(np.concatenate(points) * SCALE).astype(np.int64), axis=0, prepend=0).astype(np.int32),
+    )
+    total = sum(ring_sizes)
+    print(f"Wrote {len(stcnty)} counties, {len(ring_sizes)} rings, {total} points "
+          f"-> {OUT_PATH} ({os.path.getsize(OUT_PATH) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("shapefile", help="Path to a cb_<year>_us_county_500k shapefile (without extension)")
+    parser.add_argument("--tolerance", type=float, default=0.001, help="Simplification tolerance in degrees")
+    args = parser.parse_args()
+    build(args.shapefile, args.tolerance)
@@ -0,0 +1,53 @@
+"""
+Build cdc_data/zip_centroids.npz, the local ZIP table used by cdcsvi_lookup.py
+to validate ZIPs found in transcripts and to place them without a geocoding
+call.
+
+Input is the zips.json.bz2 file shipped in the MIT-licensed `zipcodes`
+package (1.x wheels; USPS ZIPs with a representative lat/lon). Active
+non-military ZIPs in the 50 states and DC are kept, matching the SVI table.
+
+Usage:
+    pip download --no-deps zipcodes==1.2.0 && unzip zipcodes-1.2.0-*.whl zipcodes/zips.json.bz2
+    python build_zip_table.py zipcodes/zips.json.bz2
+"""
+import argparse
+import bz2
+import json
+import os
+
+import numpy as np
+
+OUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cdc_data", "zip_centroids.npz")
+
+# Territories and military "states" have no SVI county rows.
+EXCLUDED_STATES = {"PR", "VI", "GU", "AS", "MP", "FM", "MH", "PW", "AA", "AE", "AP"}
+
+
+def build(source: str) -> None:
+    with bz2.open(source, "rt", encoding="utf-8") as f:
+        records = json.load(f)
+
+    rows = []
+    for rec in records:
+        if not rec.get("active") or rec.get("zip_code_type") == "MILITARY" or rec.get("state") in EXCLUDED_STATES:
+            continue
+        try:
+            rows.append((int(rec["zip_code"]), float(rec["lat"]), float(rec["long"])))
+        except (KeyError, ValueError):
+            continue
+    rows.sort()
+
+    np.savez_compressed(
+        OUT_PATH,
+        zip=np.asarray([r[0] for r in rows], dtype=np.int32),
+        lat=np.asarray([r[1] for r in rows], dtype=np.float32),
+        lon=np.asarray([r[2] for r in rows], dtype=np.float32),
+    )
+    print(f"Wrote {len(rows)} ZIPs -> {OUT_PATH} ({os.path.getsize(OUT_PATH) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Path to zipcodes' zips.json.bz2")
+    build(parser.parse_args().source)
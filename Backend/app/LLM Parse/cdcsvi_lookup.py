@@ -1,43 +1,253 @@
+import hashlib
+import math
 import re
 import os
+import unicodedata
+from functools import lru_cache
 import requests
+import numpy as np
 import pandas as pd
 
 
 
 SVI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cdc_data", "svi_interactive_map.csv")
+# Simplified county boundaries; regenerate with build_county_shapes.py.
+COUNTY_SHAPES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cdc_data", "county_shapes.npz")
+# Known ZIPs with centroids; regenerate with build_zip_table.py.
+ZIP_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cdc_data", "zip_centroids.npz")
 TRANSCRIPT_PATH = "transcripts/transcript.txt"
 
 if not os.path.exists(SVI_PATH):
     raise FileNotFoundError(f"SVI file not found at: {SVI_PATH}")
 
-svi_df = pd.read_csv(SVI_PATH)
+# Only these columns are read by the lookups. Flags are tiny integers and
+# names repeat heavily, so narrow ints and categoricals keep the table to a
+# few hundred KB instead of ~5 MB of float64/object columns. Those dtypes are
+# backed by flat numpy buffers that are never written after load, so a table
+# loaded before a server forks stays shared copy-on-write between workers
+# (object columns would be dirtied by refcount updates).
+SVI_FLAG_COLUMNS = ["F_THEME1", "F_LIMENG", "F_CROWD", "F_NOVEH", "F_GROUPQ"]
+SVI_COLUMN_DTYPES = {
+    "STATE": "category",
+    "ST_ABBR": "category",
+    "STCNTY": "int32",
+    "COUNTY": "category",
+    **{col: "int8" for col in SVI_FLAG_COLUMNS},
+}
+
+# Opt-in wider column set for analytics: SVI_EXTRA_COLUMNS=all or "EP_POV150,RPL_THEMES,...".
+_extra = os.getenv("SVI_EXTRA_COLUMNS", "").strip()
+
+
+def _load_svi_table() -> pd.DataFrame:
+    header = pd.read_csv(SVI_PATH, nrows=0).columns
+    missing = set(SVI_COLUMN_DTYPES) - set(header)
+    if missing:
+        raise ValueError(f"SVI CSV missing required columns: {sorted(missing)}")
+
+    if _extra.lower() == "all":
+        extra_cols = [c for c in header if c not in SVI_COLUMN_DTYPES]
+    else:
+        extra_cols = [c.strip() for c in _extra.split(",") if c.strip() and c.strip() not in SVI_COLUMN_DTYPES]
+    unknown = set(extra_cols) - set(header)
+    if unknown:
+        raise ValueError(f"SVI_EXTRA_COLUMNS not in SVI CSV: {sorted(unknown)}")
+
+    df = pd.read_csv(
+        SVI_PATH,
+        usecols=[*SVI_COLUMN_DTYPES, *extra_cols],
+        dtype=SVI_COLUMN_DTYPES,
+    )
+    for col in extra_cols:
+        if pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="float")
+        elif pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        else:
+            df[col] = df[col].astype("category")
+    return df
+
+
+svi_df = _load_svi_table()
+# Identifies the SVI release in caches keyed on its contents (e.g. LLM guidance).
+with open(SVI_PATH, "rb") as _f:
+    SVI_DATASET_VERSION = hashlib.sha256(_f.read()).hexdigest()[:12]
+_FLAGS = svi_df[SVI_FLAG_COLUMNS].to_numpy()
+_STCNTY = svi_df["STCNTY"].to_numpy()
+_POSITION_BY_STCNTY = {int(code): pos for pos, code in enumerate(_STCNTY)}
+
+
+# ---------------------------------------------------------------------------
+# Alias index: (county key, state abbreviation) -> row position in svi_df.
+#
+# Keys fold case, diacritics ("Doña" -> "dona"), punctuation and spacing, and
+# "Saint"/"Sainte" -> "st"/"ste", so "St. Johns", "Saint Johns" and
+# "st johns" share a key. Each county is indexed by its full name and by its
+# name without the type suffix. Bare names prefer suffixes in this order, so
+# "Baltimore, MD" is Baltimore County (as before) and "Baltimore City, MD" is
+# the independent city.
+# ---------------------------------------------------------------------------
+_COUNTY_SUFFIXES = (
+    "county", "parish", "borough", "census area", "city and borough",
+    "municipality", "planning region", "city",
+)
+# Longest first, so "city and borough" wins over "borough".
+_SUFFIX_MATCH_ORDER = sorted(_COUNTY_SUFFIXES, key=len, reverse=True)
+# Informal suffixes accepted on input only ("Orange Co., FL").
+_INPUT_ONLY_SUFFIXES = ("co",)
+
+
+def _fold(text: str) -> str:
+    """Lowercase ASCII words: accents removed, punctuation -> spaces, Saint -> st."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    text = re.sub(r"[^a-z0-9]+", " ", text).strip()
+    text = re.sub(r"\bsainte\b", "ste", text)
+    return re.sub(r"\bsaint\b", "st", text)
+
+
+def _strip_suffix(words: str, suffixes) -> str | None:
+    for suffix in suffixes:
+        if words.endswith(" " + suffix):
+            return words[: -len(suffix) - 1]
+    return None
+
+
+def _build_alias_index() -> tuple[dict, dict]:
+    states: dict[str, str] = {}
+    for state, abbr in zip(svi_df["STATE"].astype(str), svi_df["ST_ABBR"].astype(str)):
+        states[_fold(state).replace(" ", "")] = abbr
+        states[abbr.lower()] = abbr
+
+    index: dict[tuple[str, str], int] = {}
+    stripped: list[tuple[int, tuple[str, str], int]] = []
+    for pos, (county, abbr) in enumerate(zip(svi_df["COUNTY"].astype(str), svi_df["ST_ABBR"].astype(str))):
+        words = _fold(county)
+        index.setdefault((words.replace(" ", ""), abbr), pos)
+        for suffix in _SUFFIX_MATCH_ORDER:
+            if words.endswith(" " + suffix):
+                bare = words[: -len(suffix) - 1].replace(" ", "")
+                stripped.append((_COUNTY_SUFFIXES.index(suffix), (bare, abbr), pos))
+                break
+    for _, key, pos in sorted(stripped, key=lambda item: item[0]):
+        index.setdefault(key, pos)
+    return index, states
+
+
+_ALIAS_INDEX, _STATE_ALIASES = _build_alias_index()
+
+
+def svi_memory_footprint() -> dict:
+    """Bytes held by the in-memory SVI table, per column and in total."""
+    per_column = svi_df.memory_usage(deep=True, index=True)
+    return {
+        "rows": len(svi_df),
+        "columns": len(svi_df.columns),
+        "total_bytes": int(per_column.sum()),
+        "per_column_bytes": {k: int(v) for k, v in per_column.items()},
+    }
 
-required_cols = {"COUNTY", "STATE", "F_THEME1", "F_LIMENG", "F_CROWD", "F_NOVEH", "F_GROUPQ"}
-missing = required_cols - set(svi_df.columns)
-if missing:
-    raise ValueError(f"SVI CSV missing required columns: {sorted(missing)}")
 
-svi_df["COUNTY_NORM"] = (
-    svi_df["COUNTY"]
-    .astype(str)
-    .str.strip()
-    .str.lower()
-    .str.replace(" county", "", regex=False)
+# ---------------------------------------------------------------------------
+# ZIP extraction. Transcripts are full of 5-digit numbers that are not ZIPs
+# (MRN fragments, lab values, phone numbers), so every candidate from one
+# regex pass is scored on the words around it and checked against the local
+# ZIP table; only the best valid one is geocoded.
+# ---------------------------------------------------------------------------
+# A 5-digit run (optionally ZIP+4) not glued to other digits, letters, IDs,
+# decimals or thousands separators; or, only after a ZIP cue, five digits as
+# speech-to-text spells them out ("3 4 7 7 1").
+_ZIP_CANDIDATE_RE = re.compile(
+    r"(?<![\w.#$/-])(?<!\d,)(\d{5})(?:-\d{4})?(?![\w/]|[.,]\d)"
+    r"|(?<![\w.])(\d(?:[ -]\d){4})(?!\w|\.\d|[ -]\d)"
 )
-svi_df["STATE_NORM"] = svi_df["STATE"].astype(str).str.strip().str.lower()
+_CONTEXT_BEFORE = 80
+_CONTEXT_AFTER = 24
+
+# (pattern, score) applied to the lowercased text just before the candidate.
+_ZIP_CUES_BEFORE = [
+    (re.compile(r"\b(zip|zipcode|zip code|postal code|post code)\b"), 6),
+    (re.compile(r"\b(lives?|living|resides?|residing|residence|home|address|moved|located|from)\b"), 3),
+    (re.compile(r"\b\d+\s+\w+(\s+\w+)?\s+(street|st|avenue|ave|road|rd|drive|dr|boulevard|blvd|lane|ln|way|court|ct|place|pl|circle|cir|parkway|pkwy|highway|hwy)\b[\w\s,]*$"), 4),
+    (re.compile(r"\b(mrn|medical record|record number|account|acct|patient id|id number|\bid\b|room|rm|bed|phone|call|extension|ext|fax|pager|lab|labs|count|level|glucose|platelets?|wbc|dose|order|npi|dea|policy|member|claim|badge)\b[^.?!]{0,20}$"), -6),
+]
+# Units or ratios right after the number: "12000 units", "15000/ul".
+_ZIP_CUES_AFTER = [
+    (re.compile(r"^\s*(mg|mcg|ml|g|units?|cells|per|/|mmol|meq|iu|cc|kg|lbs?|dollars|mm3|ul)\b"), -6),
+]
+_ZIP_KEYWORD = _ZIP_CUES_BEFORE[0][0]
+# "Kissimmee, FL 34741" / "Orlando Florida 32801"
+_STATE_BEFORE_RE = re.compile(
+    r"(,\s*(" + "|".join(sorted({a.lower() for a in svi_df["ST_ABBR"].astype(str)})) + r")"
+    r"|\b(" + "|".join(sorted({s.lower() for s in svi_df["STATE"].astype(str)})) + r"))\s*$"
+)
+
+
+@lru_cache(maxsize=None)
+def load_zip_table() -> dict | None:
+    """Sorted ZIP codes with centroids, or None if zip_centroids.npz is missing."""
+    if not os.path.exists(ZIP_TABLE_PATH):
+        return None
+    z = np.load(ZIP_TABLE_PATH)
+    return {"zip": z["zip"], "lat": z["lat"].astype(np.float64), "lon": z["lon"].astype(np.float64)}
+
+
+def _zip_index(zip_code: str) -> int | None:
+    table = load_zip_table()
+    if table is None:
+        return None
+    code = int(zip_code)
+    i = int(np.searchsorted(table["zip"], code))
+    return i if i < len(table["zip"]) and table["zip"][i] == code else None
+
+
+def is_known_zip(zip_code: str) -> bool:
+    """True if the ZIP is in the local table (or the table isn't available)."""
+    return load_zip_table() is None or _zip_index(zip_code) is not None
+
+
+def extract_zip_candidates(text: str) -> list[tuple[str, int]]:
+    """
+    Every plausible ZIP in the text as (zip, score), best first. One regex
+    pass over the text; each candidate is scored on a short window around it
+    (ZIP/address cues up, ID/lab/unit cues down) and dropped if it's not a
+    known ZIP. Spelled-out digits count only next to a ZIP cue.
+    """
+    scored: dict[str, int] = {}
+    lowered = text.lower()
+    for m in _ZIP_CANDIDATE_RE.finditer(text):
+        before = lowered[max(0, m.start() - _CONTEXT_BEFORE):m.start()]
+        after = lowered[m.end():m.end() + _CONTEXT_AFTER]
+        zip_code = m.group(1)
+        if zip_code is None:
+            if not _ZIP_KEYWORD.search(before):
+                continue
+            zip_code = re.sub(r"\D", "", m.group(2))
+        if not is_known_zip(zip_code):
+            continue
+        score = sum(weight for cue, weight in _ZIP_CUES_BEFORE if cue.search(before))
+        score += 2 if _STATE_BEFORE_RE.search(before) else 0
+        score += sum(weight for cue, weight in _ZIP_CUES_AFTER if cue.search(after))
+        if score > scored.get(zip_code, -1000):
+            scored[zip_code] = score
+    return sorted(scored.items(), key=lambda item: -item[1])
 
 
 def extract_zip_from_text(text: str) -> str | None:
-    m = re.search(r"\b\d{5}\b", text)
-    return m.group(0) if m else None
+    """Best-scoring known ZIP in the text, or None if every candidate looks like something else."""
+    candidates = extract_zip_candidates(text)
+    return candidates[0][0] if candidates and candidates[0][1] >= 0 else None
 
 
 def zip_to_latlon(zip_code: str) -> tuple[float, float] | None:
-    """Free ZIP -> lat/lon via Zippopotam.us (no key)."""
+    """ZIP -> lat/lon from the local ZIP table, else via Zippopotam.us (free, no key)."""
     if not (zip_code and zip_code.isdigit() and len(zip_code) == 5):
         return None
 
+    i = _zip_index(zip_code)
+    if i is not None:
+        table = load_zip_table()
+        return float(table["lat"][i]), float(table["lon"][i])
+
     url = f"https://api.zippopotam.us/us/{zip_code}"
     try:
         r = requests.get(url, timeout=8)
@@ -99,48 +309,310 @@ def latlon_to_county_fcc(lat: float, lon: float) -> dict | None:
         return None
 
 
+# ---------------------------------------------------------------------------
+# Offline lat/lon -> county. Candidate counties come from a grid over county
+# bounding boxes, then an even-odd point-in-polygon test over the candidates'
+# edges picks the containing one. Points that land in no polygon (on water, or
+# in slivers lost to simplification) take the nearest candidate centroid.
+# ---------------------------------------------------------------------------
+_GRID_DEG = 0.5
+_BANDS = 32  # horizontal bands per county; a point is only tested against its band's edges
+_BATCH_CHUNK = 4096  # points per vectorized block in latlon_to_stcnty_many
+
+
+@lru_cache(maxsize=None)
+def load_county_shapes() -> dict | None:
+    """Load county_shapes.npz and build the lookup indexes once; None if the file is missing."""
+    if not os.path.exists(COUNTY_SHAPES_PATH):
+        return None
+    z = np.load(COUNTY_SHAPES_PATH)
+    pts = np.cumsum(z["point_delta"].astype(np.int64), axis=0) / float(z["scale"])
+    ring_size = z["ring_size"].astype(np.int64)
+    ring_owner = np.repeat(np.arange(len(z["stcnty"])), z["ring_count"])
+
+    # Rings are closed (last point == first), so every point but a ring's
+    # last starts an edge. Edges stay grouped by county.
+    is_last = np.zeros(len(pts), dtype=bool)
+    is_last[np.cumsum(ring_size) - 1] = True
+    start = np.flatnonzero(~is_last)
+    x0, y0 = pts[start, 0], pts[start, 1]
+    x1, y1 = pts[start + 1, 0], pts[start + 1, 1]
+    dy = y1 - y0
+    slope = np.divide(x1 - x0, dy, out=np.zeros_like(dy), where=dy != 0)
+    edge_end = np.cumsum(np.bincount(ring_owner, weights=ring_size - 1).astype(np.int64))
+    edge_start = edge_end - np.diff(edge_end, prepend=0)
+
+    bbox = np.column_stack([
+        np.minimum.reduceat(np.minimum(x0, x1), edge_start), np.minimum.reduceat(np.minimum(y0, y1), edge_start),
+        np.maximum.reduceat(np.maximum(x0, x1), edge_start), np.maximum.reduceat(np.maximum(y0, y1), edge_start),
+    ])
+    grid: dict[tuple[int, int], list[int]] = {}
+    for county, (minx, miny, maxx, maxy) in enumerate(bbox):
+        for gx in range(int(minx // _GRID_DEG), int(maxx // _GRID_DEG) + 1):
+            for gy in range(int(miny // _GRID_DEG), int(maxy // _GRID_DEG) + 1):
+                grid.setdefault((gx, gy), []).append(county)
+
+    # Band index: edge ids grouped by (county, band), CSR-style. An edge is
+    # listed under every band its y-range touches.
+    owner = np.repeat(np.arange(len(bbox)), edge_end - edge_start)
+    band_height = (bbox[:, 3] - bbox[:, 1]) / _BANDS
+    band_height[band_height == 0] = 1.0
+    lo = _band_of(np.minimum(y0, y1), bbox[owner, 1], band_height[owner])
+    hi = _band_of(np.maximum(y0, y1), bbox[owner, 1], band_height[owner])
+    span = hi - lo + 1
+    edge_ids = np.repeat(np.arange(len(x0)), span)
+    bands = np.repeat(lo, span) + np.arange(len(edge_ids)) - np.repeat(np.cumsum(span) - span, span)
+    keys = owner[edge_ids] * _BANDS + bands
+    order = np.argsort(keys, kind="stable")
+    edge_ids = edge_ids[order]
+
+    # Edge arrays are stored in band order (duplicated where an edge spans
+    # bands) so each band is a contiguous slice: [x0, y0, y1, dx/dy].
+    shapes = {
+        "stcnty": z["stcnty"],
+        "centroid": z["centroid"].astype(np.float64),
+        "edges": np.stack([x0[edge_ids], y0[edge_ids], y1[edge_ids], slope[edge_ids]]),
+        "band_ptr": np.searchsorted(keys[order], np.arange(len(bbox) * _BANDS + 1)),
+        "band_height": band_height,
+        "band_height_list": band_height.tolist(),
+        "bbox": bbox,
+        "bbox_list": bbox.tolist(),
+        "centroid_list": z["centroid"].tolist(),
+        "grid": grid,
+    }
+    shapes["band_ptr_list"] = shapes["band_ptr"].tolist()
+    return shapes
+
+
+def _band_of(y, miny, height):
+    return np.clip(np.floor((y - miny) / height), 0, _BANDS - 1).astype(np.int64)
+
+
+def _locate_chunk(shapes: dict, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    found = np.full(len(lat), -1, dtype=np.int64)
+    empty: list[int] = []
+    cand = [
+        shapes["grid"].get((int(x // _GRID_DEG), int(y // _GRID_DEG)), empty) if math.isfinite(x) and math.isfinite(y) else empty
+        for x, y in zip(lon.tolist(), lat.tolist())
+    ]
+    pair_point = np.repeat(np.arange(len(lat)), [len(c) for c in cand])
+    if not len(pair_point):
+        return found
+    pair_county = np.concatenate(cand).astype(np.int64)
+    px, py = lon[pair_point], lat[pair_point]
+
+    # Even-odd test for every (point, candidate) pair whose bbox holds the
+    # point, against the edges of the point's band, all in one flat pass.
+    bbox = shapes["bbox"][pair_county]
+    boxed = np.flatnonzero((bbox[:, 0] <= px) & (px <= bbox[:, 2]) & (bbox[:, 1] <= py) & (py <= bbox[:, 3]))
+    county = pair_county[boxed]
+    keys = county * _BANDS + _band_of(py[boxed], bbox[boxed, 1], shapes["band_height"][county])
+    starts, ends = shapes["band_ptr"][keys], shapes["band_ptr"][keys + 1]
+    lengths = ends - starts
+    edge = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    owner = np.repeat(np.arange(len(boxed)), lengths)
+    x0, y0, y1, slope = shapes["edges"][:, edge]
+    ex, ey = px[boxed][owner], py[boxed][owner]
+    crossings = ((y0 > ey) != (y1 > ey)) & (ex < x0 + (ey - y0) * slope)
+    inside = np.bincount(owner, weights=crossings, minlength=len(boxed)).astype(np.int64) % 2 == 1
+    hits = boxed[inside]
+    found[pair_point[hits[::-1]]] = pair_county[hits[::-1]]  # first hit per point wins
+
+    # Nearest centroid among the grid candidates for points no polygon claimed.
+    open_pairs = found[pair_point] < 0
+    if open_pairs.any():
+        pp, pc = pair_point[open_pairs], pair_county[open_pairs]
+        cx, cy = shapes["centroid"][pc, 0], shapes["centroid"][pc, 1]
+        dist = ((cx - lon[pp]) * np.cos(np.radians(lat[pp]))) ** 2 + (cy - lat[pp]) ** 2
+        order = np.lexsort((dist, pp))
+        first = order[np.unique(pp[order], return_index=True)[1]]
+        found[pp[first]] = pc[first]
+    return found
+
+
+def _locate_counties(shapes: dict, lats, lons) -> np.ndarray:
+    """Row index into the shapes arrays for each point, -1 where nothing is near."""
+    lat = np.asarray(lats, dtype=np.float64).reshape(-1)
+    lon = np.asarray(lons, dtype=np.float64).reshape(-1)
+    lon = np.where(lon > 0, lon - 360, lon)  # same convention as the stored shapes
+    return np.concatenate([
+        _locate_chunk(shapes, lat[i:i + _BATCH_CHUNK], lon[i:i + _BATCH_CHUNK])
+        for i in range(0, len(lat), _BATCH_CHUNK)
+    ] or [np.empty(0, dtype=np.int64)])
+
+
+def _point_in_county(shapes: dict, county: int, x: float, y: float) -> bool:
+    band = min(max(int((y - shapes["bbox_list"][county][1]) / shapes["band_height_list"][county]), 0), _BANDS - 1)
+    key = county * _BANDS + band
+    x0, y0, y1, slope = shapes["edges"][:, shapes["band_ptr_list"][key]:shapes["band_ptr_list"][key + 1]]
+    crossings = ((y0 > y) != (y1 > y)) & (x < x0 + (y - y0) * slope)
+    return np.count_nonzero(crossings) % 2 == 1
+
+
+def _locate_county(shapes: dict, lat: float, lon: float) -> int:
+    """Scalar _locate_chunk: stops at the first containing polygon."""
+    if lon > 0:
+        lon -= 360
+    nearest, nearest_dist = -1, float("inf")
+    scale = math.cos(math.radians(lat)) ** 2
+    for county in shapes["grid"].get((int(lon // _GRID_DEG), int(lat // _GRID_DEG)), ()):
+        minx, miny, maxx, maxy = shapes["bbox_list"][county]
+        if minx <= lon <= maxx and miny <= lat <= maxy and _point_in_county(shapes, county, lon, lat):
+            return county
+        cx, cy = shapes["centroid_list"][county]
+        dist = (cx - lon) ** 2 * scale + (cy - lat) ** 2
+        if dist < nearest_dist:
+            nearest, nearest_dist = county, dist
+    return nearest
+
+
+def latlon_to_stcnty(lat: float, lon: float) -> str | None:
+    """Offline lat/lon -> 5-digit STCNTY from the bundled county shapes, or None."""
+    shapes = load_county_shapes()
+    if shapes is None or not (math.isfinite(lat) and math.isfinite(lon)):
+        return None
+    county = _locate_county(shapes, lat, lon)
+    return f"{shapes['stcnty'][county]:05d}" if county >= 0 else None
+
+
+def latlon_to_stcnty_many(lats, lons) -> list[str | None]:
+    """
+    Batch offline lat/lon -> 5-digit STCNTY for arrays of coordinates, using
+    the bundled county shapes. None for points outside every county (or if
+    the shapes file is missing).
+    """
+    shapes = load_county_shapes()
+    if shapes is None:
+        return [None] * len(np.asarray(lats).reshape(-1))
+    return [f"{shapes['stcnty'][i]:05d}" if i >= 0 else None for i in _locate_counties(shapes, lats, lons)]
+
+
+def latlon_to_county_local(lat: float, lon: float) -> dict | None:
+    """
+    Offline equivalent of latlon_to_county_fcc. Returns None if the point
+    can't be placed or its county isn't in the SVI table (e.g. the shapes
+    and the CSV are from different vintages), so callers can fall back.
+    """
+    stcnty = latlon_to_stcnty(lat, lon)
+    pos = _POSITION_BY_STCNTY.get(int(stcnty)) if stcnty else None
+    if pos is None:
+        return None
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "county_name": str(svi_df["COUNTY"].iat[pos]),
+        "state_name": str(svi_df["STATE"].iat[pos]),
+        "state_fips": stcnty[:2],
+        "county_fips": stcnty,
+        "stcnty": stcnty,
+        "source": "local",
+    }
+
+
 def zip_to_county(zip_code: str) -> dict | None:
     latlon = zip_to_latlon(zip_code)
     if not latlon:
         return None
 
     lat, lon = latlon
-    return {"zip": zip_code, **(latlon_to_county_fcc(lat, lon) or {})}
+    county = latlon_to_county_local(lat, lon) or latlon_to_county_fcc(lat, lon)
+    return {"zip": zip_code, **(county or {})}
+
+
+def _parse_location(location: str) -> tuple[str, str] | None:
+    """'Osceola County, Florida' -> ('osceola county', 'florida'); None if not 'County, State'."""
+    parts = [x.strip() for x in location.split(",")]
+    if len(parts) == 3 and _fold(parts[2]).replace(" ", "") in ("us", "usa", "unitedstates"):
+        parts = parts[:2]
+    if len(parts) != 2 or not all(parts):
+        return None
+    return parts[0].lower(), parts[1].lower()
+
+
+def _lookup_position(county: str, state: str) -> int | None:
+    abbr = _STATE_ALIASES.get(_fold(state).replace(" ", ""))
+    if abbr is None:
+        return None
+    words = _fold(county)
+    pos = _ALIAS_INDEX.get((words.replace(" ", ""), abbr))
+    if pos is None:
+        bare = _strip_suffix(words, (*_SUFFIX_MATCH_ORDER, *_INPUT_ONLY_SUFFIXES))
+        if bare:
+            pos = _ALIAS_INDEX.get((bare.replace(" ", ""), abbr))
+    return pos
+
+
+def resolve_stcnty(location: str) -> str | None:
+    """
+    Resolve a 'County, State' string in any common spelling to its 5-digit
+    county FIPS (STCNTY), e.g. 'Saint Johns County, Florida' or
+    'St. Johns, FL' -> '12109'. Two dict lookups; None if unknown.
+    """
+    parsed = _parse_location(location)
+    if parsed is None:
+        return None
+    pos = _lookup_position(*parsed)
+    return f"{_STCNTY[pos]:05d}" if pos is not None else None
+
+
+def get_county_record(stcnty: str) -> dict | None:
+    """{"stcnty", "location": "County, State", "flags"} for a 5-digit STCNTY, or None."""
+    pos = _POSITION_BY_STCNTY.get(int(stcnty)) if stcnty.isdigit() else None
+    if pos is None:
+        return None
+    location = f'{svi_df["COUNTY"].iat[pos]}, {svi_df["STATE"].iat[pos]}'
+    return {"stcnty": f"{_STCNTY[pos]:05d}", "location": location, "flags": _flags_at(pos)}
+
+
+def _not_found(county: str, state: str) -> dict:
+    county_norm = county.replace(" county", "").strip()
+    return {"error": f"County/State not found in CDC SVI dataset: {county_norm}, {state}"}
+
+
+def _flags_at(pos: int) -> dict:
+    return {col: int(val) for col, val in zip(SVI_FLAG_COLUMNS, _FLAGS[pos])}
 
 
 def get_info_from_cdcsvi(location: str) -> dict:
     """
     location format: "County, State"
-    Example: "Osceola County, Florida" or "Osceola, Florida"
+    Example: "Osceola County, Florida", "Osceola, FL" or "St. Johns, FL"
     Returns: F_THEME1, F_LIMENG, F_CROWD, F_NOVEH, F_GROUPQ
     """
-    try:
-        county, state = [x.strip().lower() for x in location.split(",")]
-    except ValueError:
+    parsed = _parse_location(location)
+    if parsed is None:
         return {"error": "Location must be formatted as 'County, State'"}
 
-    county_norm = county.replace(" county", "").strip()
-    state_norm = state.strip()
-
-    match = svi_df[(svi_df["COUNTY_NORM"] == county_norm) & (svi_df["STATE_NORM"] == state_norm)]
+    pos = _lookup_position(*parsed)
+    if pos is None:
+        return _not_found(*parsed)
+    return _flags_at(pos)
 
-    if match.empty:
-        return {"error": f"County/State not found in CDC SVI dataset: {county_norm}, {state_norm}"}
 
-    def _safe_int(val) -> int:
-        try:
-            return int(float(val))
-        except (ValueError, TypeError):
-            return 0
+def get_info_from_cdcsvi_many(locations: list[str]) -> dict[str, dict]:
+    """
+    Batch form of get_info_from_cdcsvi: every distinct location is resolved
+    through the alias index and all flag rows are gathered from svi_df in
+    one vectorized take. Returns {location: flags-or-error}.
+    """
+    results: dict[str, dict] = {}
+    found: list[tuple[str, int]] = []
+    for location in dict.fromkeys(locations):
+        parsed = _parse_location(location)
+        if parsed is None:
+            results[location] = {"error": "Location must be formatted as 'County, State'"}
+            continue
+        pos = _lookup_position(*parsed)
+        if pos is None:
+            results[location] = _not_found(*parsed)
+        else:
+            found.append((location, pos))
 
-    row = match.iloc[0]
-    return {
-        "F_THEME1": _safe_int(row["F_THEME1"]),
-        "F_LIMENG": _safe_int(row["F_LIMENG"]),
-        "F_CROWD": _safe_int(row["F_CROWD"]),
-        "F_NOVEH": _safe_int(row["F_NOVEH"]),
-        "F_GROUPQ": _safe_int(row["F_GROUPQ"]),
-    }
+    if found:
+        rows = _FLAGS[[pos for _, pos in found]]
+        for (location, _), row in zip(found, rows):
+            results[location] = {col: int(val) for col, val in zip(SVI_FLAG_COLUMNS, row)}
+    return results
 
 if __name__ == "__main__":
     if not os.path.exists(TRANSCRIPT_PATH):
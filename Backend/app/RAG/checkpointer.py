@@ -0,0 +1,227 @@
+"""
+Postgres checkpointer for the RAG graph, on the app's own SQLAlchemy pool.
+
+LangGraph saves a checkpoint after every completed step (and the writes of
+nodes that finished inside a step that didn't). stop_recording runs the graph
+under a thread id per session and recording, so if the request is cut off
+(Vercel's 60s limit, a worker dying mid-loop) a retry with the same media_id
+picks up from the last completed node instead of re-running finished LLM
+calls. Threads are deleted once their result has been saved to the patient
+row; anything left behind by runs that were never retried is pruned after
+RAG_CHECKPOINT_TTL_HOURS.
+
+Tables: graph_checkpoints and graph_checkpoint_writes (see app/models.py).
+Only the async interface is implemented (the sync methods are
+BaseCheckpointSaver's, which raise NotImplementedError); the graph is
+always run asynchronously from the routes.
+"""
+from __future__ import annotations
+import json
+import os
+import random
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_serializable_checkpoint_metadata,
+)
+from sqlalchemy import text
+
+from app.db import AsyncSessionLocal
+
+CHECKPOINT_TTL_HOURS = float(os.getenv("RAG_CHECKPOINT_TTL_HOURS", 24))
+
+
+class PostgresCheckpointer(BaseCheckpointSaver[str]):
+
+    def _tuple(self, row, writes) -> CheckpointTuple:
+        thread_id, ns = row["thread_id"], row["checkpoint_ns"]
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": row["checkpoint_id"]}},
+            checkpoint=self.serde.loads_typed((row["type"], row["checkpoint"])),
+            metadata=row["metadata"],
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": row["parent_checkpoint_id"]}}
+                if row["parent_checkpoint_id"]
+                else None
+            ),
+            pending_writes=[(w["task_id"], w["channel"], self.serde.loads_typed((w["type"], w["blob"]))) for w in writes],
+        )
+
+    async def _writes(self, db, thread_id: str, ns: str, checkpoint_id: str) -> list:
+        result = await db.execute(
+            text("""
+                SELECT task_id, channel, type, blob FROM graph_checkpoint_writes
+                WHERE thread_id = :thread_id AND checkpoint_ns = :ns AND checkpoint_id = :checkpoint_id
+                ORDER BY task_id, idx
+            """),
+            {"thread_id": thread_id, "ns": ns, "checkpoint_id": checkpoint_id},
+        )
+        return result.mappings().all()
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text(f"""
+                    SELECT * FROM graph_checkpoints
+                    WHERE thread_id = :thread_id AND checkpoint_ns = :ns
+                    {"AND checkpoint_id = :checkpoint_id" if checkpoint_id else ""}
+                    ORDER BY checkpoint_id DESC
+                    LIMIT 1
+                """),
+                {"thread_id": thread_id, "ns": ns, "checkpoint_id": checkpoint_id},
+            )
+            row = result.mappings().one_or_none()
+            if row is None:
+                return None
+            return self._tuple(row, await self._writes(db, thread_id, ns, row["checkpoint_id"]))
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        clauses, params = [], {}
+        if config:
+            clauses.append("thread_id = :thread_id")
+            params["thread_id"] = config["configurable"]["thread_id"]
+            if (ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = :ns")
+                params["ns"] = ns
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = :checkpoint_id")
+                params["checkpoint_id"] = checkpoint_id
+        if filter:
+            clauses.append("metadata @> CAST(:filter AS JSONB)")
+            params["filter"] = json.dumps(filter)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < :before_id")
+            params["before_id"] = before_id
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text(f"""
+                    SELECT * FROM graph_checkpoints {where}
+                    ORDER BY checkpoint_id DESC
+                    {"LIMIT :limit" if limit is not None else ""}
+                """),
+                {**params, "limit": limit},
+            )
+            for row in result.mappings().all():
+                writes = await self._writes(db, row["thread_id"], row["checkpoint_ns"], row["checkpoint_id"])
+                yield self._tuple(row, writes)
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        # Channel values are stored inline: the state is one transcript and one form.
+        type_, blob = self.serde.dumps_typed(checkpoint)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text("""
+                    INSERT INTO graph_checkpoints (
+                        thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata
+                    ) VALUES (
+                        :thread_id, :ns, :checkpoint_id, :parent_id, :type, :checkpoint, CAST(:metadata AS JSONB)
+                    )
+                    ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id) DO UPDATE
+                    SET type = EXCLUDED.type, checkpoint = EXCLUDED.checkpoint, metadata = EXCLUDED.metadata
+                """),
+                {
+                    "thread_id": thread_id,
+                    "ns": ns,
+                    "checkpoint_id": checkpoint["id"],
+                    "parent_id": config["configurable"].get("checkpoint_id"),
+                    "type": type_,
+                    "checkpoint": blob,
+                    "metadata": json.dumps(get_serializable_checkpoint_metadata(config, metadata), default=str),
+                },
+            )
+            await db.commit()
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint["id"]}}
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            rows.append({
+                "thread_id": config["configurable"]["thread_id"],
+                "ns": config["configurable"].get("checkpoint_ns", ""),
+                "checkpoint_id": config["configurable"]["checkpoint_id"],
+                "task_id": task_id,
+                "idx": WRITES_IDX_MAP.get(channel, idx),
+                "channel": channel,
+                "type": type_,
+                "blob": blob,
+            })
+        if not rows:
+            return
+        # Special writes (errors, interrupts) replace the previous one; regular writes are kept once.
+        upsert = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text(f"""
+                    INSERT INTO graph_checkpoint_writes (
+                        thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, blob
+                    ) VALUES (:thread_id, :ns, :checkpoint_id, :task_id, :idx, :channel, :type, :blob)
+                    ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx) DO
+                    {"UPDATE SET channel = EXCLUDED.channel, type = EXCLUDED.type, blob = EXCLUDED.blob" if upsert else "NOTHING"}
+                """),
+                rows,
+            )
+            await db.commit()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("DELETE FROM graph_checkpoint_writes WHERE thread_id = :thread_id"), {"thread_id": thread_id})
+            await db.execute(text("DELETE FROM graph_checkpoints WHERE thread_id = :thread_id"), {"thread_id": thread_id})
+            await db.commit()
+
+    async def aprune(self, max_age_hours: float = CHECKPOINT_TTL_HOURS) -> None:
+        """Drop threads whose newest checkpoint is older than max_age_hours."""
+        async with AsyncSessionLocal() as db:
+            stale = """
+                SELECT thread_id FROM graph_checkpoints
+                GROUP BY thread_id
+                HAVING max(created_at) < now() - make_interval(secs => :secs)
+            """
+            params = {"secs": max_age_hours * 3600}
+            await db.execute(text(f"DELETE FROM graph_checkpoint_writes WHERE thread_id IN ({stale})"), params)
+            await db.execute(text(f"DELETE FROM graph_checkpoints WHERE thread_id IN ({stale})"), params)
+            await db.commit()
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        # Same scheme as langgraph's InMemorySaver: sortable counter + random suffix.
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
@@ -0,0 +1,200 @@
+"""
+Local transcript condensation ahead of the model calls.
+
+With TRANSCRIPT_CONDENSE=1 (off by default, see node_condense.py) the
+extraction reads the transcript through condense(), which cuts only what
+can't carry handoff content, without a model call:
+
+  filler       um, uh, erm, hmm, and "you know" / "I mean" set off by commas
+  phatic       sentences made only of greetings, thanks and acknowledgements
+               ("Good morning.", "Okay, thank you.")
+  stutters     a word or short phrase said twice in a row ("the the",
+               "I have, I have"); never a number word ("two two")
+
+The phatic test is a short list of words a sentence must consist of
+entirely, so anything else said in it (a symptom, a name, a drug) keeps
+it; a sentence with a number is always kept, and so is one answering a
+kept question, however short ("No.", "Okay."). Repeated sentences are
+kept: two identical lines may be two doses. Everything kept is copied
+character for character, so values are quoted exactly as spoken. The span
+map records where each kept piece came from, and to_original() maps any
+span of the condensed text back to the raw one. The auditor and the
+corrector always read the raw transcript, so what condensation cut can
+still be caught there.
+"""
+from __future__ import annotations
+import bisect
+import re
+from typing import List, NamedTuple, Tuple
+
+# Spans are [condensed_start, original_start, length], in order; lists so they sit in graph state as is.
+Span = List[int]
+
+
+class Condensed(NamedTuple):
+    text: str
+    spans: List[Span]
+
+
+_LABEL_RE = re.compile(r"[ \t]*([A-Z][\w .'-]{0,24}):[ \t]*")
+# Sentence end: ., ? or ! followed by whitespace, an opening capital/quote or the end; not "97.3".
+_SENTENCE_END_RE = re.compile(r"[.?!]+(?=\s|$|[A-Z\"'])")
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "jr", "sr", "approx"}
+_WORD_RE = re.compile(r"[a-z']+|\d+")
+
+# At the start of a sentence a filler takes its trailing comma, elsewhere its leading one.
+_FILLERS = r"(?<![\w-])(?:(?i:u+m+|u+h+|hmm+|mm+|ah+)|erm|er)(?![\w-])"
+_FILLER_RE = re.compile(
+    rf"^\s*{_FILLERS}(?:\s*,)?|,?\s*{_FILLERS}"
+    r"|^\s*(?i:you know|i mean),(?=\s)|,\s*(?i:you know|i mean)(?=,)",
+)
+_FILLER_WORDS = {"um", "umm", "uh", "uhh", "hmm", "hmmm", "mm", "mmm", "ah", "erm", "er"}
+_STUTTER_RE = re.compile(r"(?<![\w'])([a-z']+(?:\s+[a-z']+){0,2})(?:[\s,]+\1)+(?![\w'])", re.IGNORECASE)
+_NUMERALS = {
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen",
+    "nineteen", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety",
+    "hundred", "thousand", "half", "once", "twice",
+}
+# Never collapsed as stutters: numbers ("two oh oh five") and grammatical doubles ("had had", "that that").
+_NUMBER_WORDS = _NUMERALS | {"oh", "had", "that"}
+
+_PHATIC = {
+    "hi", "hello", "hey", "good", "morning", "afternoon", "evening", "night",
+    "thank", "thanks", "you", "so", "much", "very",
+    "okay", "ok", "alright", "all", "right", "sure", "great", "perfect", "awesome", "wonderful", "cool",
+    "got", "it", "sounds", "bye", "goodbye", "see", "later", "take", "care", "have", "a", "nice", "day",
+    "oh", "ha", "haha", "welcome", "you're", "that's", "everything",
+}
+
+
+class _Sentence:
+    __slots__ = ("start", "end", "words", "question")
+
+    def __init__(self, text: str, start: int, end: int):
+        self.start, self.end = start, end
+        self.words = [w for w in _WORD_RE.findall(_FILLER_RE.sub(" ", text).lower()) if w not in _FILLER_WORDS]
+        self.question = text.rstrip().endswith("?")
+
+
+def _sentences(text: str, start: int, end: int) -> List[_Sentence]:
+    out, pos = [], start
+    for m in _SENTENCE_END_RE.finditer(text, start, end):
+        head = text[pos:m.start()].rsplit(None, 1)
+        if head and m.group() == "." and head[-1].lower() in _ABBREVIATIONS:
+            continue
+        out.append((pos, m.end()))
+        pos = m.end()
+    if text[pos:end].strip():
+        out.append((pos, end))
+    sentences = []
+    for s, e in out:
+        while s < e and text[s].isspace():
+            s += 1
+        if s < e:
+            sentences.append(_Sentence(text[s:e], s, e))
+    return sentences
+
+
+def _phatic(words: List[str]) -> bool:
+    """Only greetings, thanks and acknowledgements: no number, no word outside _PHATIC."""
+    return not any(w.isdigit() or w in _NUMERALS for w in words) and all(w in _PHATIC for w in words)
+
+
+def _removals(text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """Filler and stutter ranges inside one kept sentence."""
+    sentence = text[start:end]
+    ranges = [(start + m.start(), start + m.end()) for m in _FILLER_RE.finditer(sentence)]
+    for m in _STUTTER_RE.finditer(sentence):
+        if not _NUMBER_WORDS & set(m.group(1).lower().split()):
+            ranges.append((start + m.start(1) + len(m.group(1)), start + m.end()))
+    ranges.sort()
+    merged: List[Tuple[int, int]] = []
+    for s, e in ranges:
+        if merged and s <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(e, merged[-1][1]))
+        else:
+            merged.append((s, e))
+    return merged
+
+
+def condense(transcript: str) -> Condensed:
+    """The transcript without filler, pleasantries and stutters, with its span map."""
+    pieces: List[Tuple[int, int]] = []   # kept [start, end) ranges of the transcript, in order
+    answering = False   # the previous sentence was a kept question
+
+    pos = 0
+    for line in transcript.splitlines(keepends=True):
+        line_start, line_end = pos, pos + len(line.rstrip("\r\n"))
+        pos += len(line)
+        label = _LABEL_RE.match(transcript, line_start, line_end)
+        body_start = label.end() if label else line_start
+        kept: List[Tuple[int, int]] = []
+        for sentence in _sentences(transcript, body_start, line_end):
+            words = sentence.words
+            keep = bool(words) and (answering or not _phatic(words))
+            if keep:
+                removals = _removals(transcript, sentence.start, sentence.end)
+                cursor = sentence.start
+                for s, e in removals:
+                    kept.append((cursor, s))
+                    cursor = e
+                kept.append((cursor, sentence.end))
+            # Only the sentence right after a question counts as its answer.
+            answering = keep and sentence.question
+        if kept:
+            if label:
+                pieces.append((label.start(1), label.end(1) + 1))  # "Nurse:"
+            pieces.extend(kept)
+
+    parts: List[str] = []
+    spans: List[Span] = []
+    length = 0
+    previous_end = None
+    for s, e in pieces:
+        while s < e and transcript[s].isspace():
+            s += 1
+        while e > s and transcript[e - 1].isspace():
+            e -= 1
+        if s == e:
+            continue
+        if previous_end is not None:
+            gap = transcript[previous_end:s]
+            separator = "\n" if "\n" in gap else "" if not gap or transcript[s] in ",.?!;:" else " "
+            parts.append(separator)
+            length += len(separator)
+        parts.append(transcript[s:e])
+        if spans and not parts[-2] and spans[-1][1] + spans[-1][2] == s:
+            spans[-1][2] += e - s  # contiguous in both texts
+        else:
+            spans.append([length, s, e - s])
+        length += e - s
+        previous_end = e
+    return Condensed("".join(parts), spans)
+
+
+def to_original(spans: List[Span], start: int, end: int) -> Tuple[int, int]:
+    """The raw-transcript span covering condensed[start:end]; separators map to the next piece."""
+    if not spans:
+        return start, end
+    starts = [span[0] for span in spans]
+
+    def _map(offset: int, is_end: bool) -> int:
+        i = bisect.bisect_right(starts, offset - 1 if is_end else offset) - 1
+        if i < 0:
+            return spans[0][1]
+        c, o, n = spans[i]
+        inside = offset - c
+        if is_end:
+            return o + min(inside, n)
+        if inside >= n and i + 1 < len(spans):
+            return spans[i + 1][1]  # in the separator after this piece
+        return o + min(inside, n)
+
+    return _map(start, False), _map(end, True)
+
+
+def locate(condensed: Condensed, quote: str) -> Tuple[int, int] | None:
+    """Where quote (as it appears in the condensed text) was said in the raw transcript."""
+    i = condensed.text.find(quote)
+    return None if i < 0 else to_original(condensed.spans, i, i + len(quote))
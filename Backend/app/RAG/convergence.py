@@ -0,0 +1,77 @@
+"""
+Helpers that let the verify/regenerate loop stop as soon as another pass
+can't help, and re-audit only what the corrector changed.
+
+Auditor errors are prefixed with the dotted path of the field they concern
+("vital_signs.heart_rate: ..."), which is what ties an error to a field
+across passes.
+"""
+from __future__ import annotations
+import re
+from typing import Any, List
+
+from .state import MAX_LOOPS
+
+_MISSING = object()
+_FIELD_RE = re.compile(r"^\s*`?([A-Za-z_]\w*(?:\.\w+|\[\d+\])*)`?\s*:")
+
+
+def flatten(form: Any, prefix: str = "") -> dict[str, Any]:
+    """Leaf values by dotted path; lists are compared as whole values."""
+    if isinstance(form, dict) and form:
+        out: dict[str, Any] = {}
+        for key, value in form.items():
+            out.update(flatten(value, f"{prefix}.{key}" if prefix else key))
+        return out
+    return {prefix: form}
+
+
+def changed_paths(before: dict, after: dict) -> List[str]:
+    old, new = flatten(before), flatten(after)
+    return sorted(p for p in old.keys() | new.keys() if old.get(p, _MISSING) != new.get(p, _MISSING))
+
+
+def subset(form: dict, paths: List[str]) -> dict:
+    """Nested dict holding only the given leaf paths (removed fields show as null)."""
+    leaves = flatten(form)
+    out: dict = {}
+    for path in paths:
+        node = out
+        *parents, last = path.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[last] = leaves.get(path)
+    return out
+
+
+def field_of(error: str) -> str | None:
+    match = _FIELD_RE.match(error)
+    return match.group(1) if match else None
+
+
+def touches(field: str, paths: List[str]) -> bool:
+    """Whether an error's field overlaps any changed path (either may be the parent)."""
+    return any(field == p or p.startswith(field + ".") or field.startswith(p + ".") for p in paths)
+
+
+def _error_key(errors: List[str]) -> frozenset[str]:
+    return frozenset(re.sub(r"[^a-z0-9]+", " ", e.lower()).strip() for e in errors)
+
+
+def termination_reason(errors: List[str], history: List[List[str]], loop_count: int, form_changed: bool) -> str | None:
+    """
+    Why the loop should stop after this audit, or None to run another
+    correction. history holds the error lists of earlier passes.
+    """
+    if not errors:
+        return "valid"
+    if not form_changed:
+        return "no_change"            # the corrector returned the same form
+    key = _error_key(errors)
+    if any(_error_key(h) == key for h in history):
+        return "repeated_errors"      # back to an error set we've already seen
+    if history and len(errors) >= len(history[-1]):
+        return "not_improving"        # the error set stopped shrinking
+    if loop_count >= MAX_LOOPS:
+        return "max_loops"
+    return None
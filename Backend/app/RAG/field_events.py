@@ -0,0 +1,100 @@
+"""
+Turns a streamed graph run into form events for the client.
+
+Fields reach the client in three ways, all keyed by the dotted paths of
+convergence.flatten():
+
+  field          a value the client hasn't seen yet, with status
+                 "unverified": streamed from the initial extraction as each
+                 field completes, changed by a correction, or (on a resumed
+                 run) already in the checkpoint
+  verification   after every audit (in the fused topology, before the
+                 correction that comes with it): which fields the auditor
+                 confirmed ("verified") and which it flagged, with its
+                 messages.
+                 Errors that can't be tied to a field leave every field
+                 that isn't verified yet unconfirmed.
+
+FieldTracker remembers what was already sent, so a value streamed during
+extraction isn't repeated when the node's full output arrives.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List
+
+from .convergence import field_of, flatten, touches
+
+
+class FieldTracker:
+    def __init__(self):
+        self.sent: Dict[str, Any] = {}
+        self.status: Dict[str, str] = {}
+        self.loop = 0
+
+    def field(self, path: str, value: Any) -> dict | None:
+        """Event for one field, or None if the client already has this value."""
+        if path in self.sent and self.sent[path] == value:
+            return None
+        self.sent[path] = value
+        self.status[path] = "unverified"
+        return {"event": "field", "path": path, "value": value, "status": "unverified"}
+
+    def form(self, form: dict) -> List[dict]:
+        """Events for every field of form that differs from what was sent."""
+        events = [self.field(path, value) for path, value in flatten(form or {}).items()]
+        return [e for e in events if e is not None]
+
+    def verification(self, errors: List[str], loop: int, final: bool) -> dict:
+        flagged: Dict[str, List[str]] = {}
+        unattributed: List[str] = []
+        for error in errors:
+            field = field_of(error)
+            if field is None:
+                unattributed.append(error)
+                continue
+            # A field the form doesn't have (yet) is still reported under its own path.
+            for path in [p for p in self.sent if touches(field, [p])] or [field]:
+                flagged.setdefault(path, []).append(error)
+        for path in self.sent:
+            if path in flagged:
+                self.status[path] = "flagged"
+            elif not unattributed:
+                self.status[path] = "verified"
+            elif self.status[path] == "flagged":
+                self.status[path] = "unverified"
+        return {
+            "event": "verification",
+            "loop": loop,
+            "final": final,
+            "verified": sorted(p for p, s in self.status.items() if s == "verified"),
+            "flagged": flagged,
+            "errors": unattributed,
+        }
+
+    def node_update(self, node: str, update: dict) -> List[dict]:
+        """Events for one node's output from the graph's "updates" stream."""
+        if node == "verify_node":
+            final = update.get("termination_reason") is not None
+            return [self.verification(update.get("verification_errors") or [], self.loop, final)]
+        if node == "audit_correct_node":
+            # The audit covers the form the pass started from; a correction follows it.
+            final = update.get("termination_reason") is not None
+            events = [self.verification(update.get("verification_errors") or [], self.loop, final)]
+            if "extracted_form" in update:
+                self.loop = update["loop_count"]
+                events += self.form(update["extracted_form"])
+            return events
+        if node == "regenerate_node":
+            self.loop = update.get("loop_count", self.loop)
+        if "extracted_form" not in update:
+            return []  # e.g. condense_node
+        return self.form(update["extracted_form"] or {})
+
+    def resume(self, values: dict) -> List[dict]:
+        """Events that bring a client up to date with a checkpointed state."""
+        self.loop = values.get("loop_count", 0)
+        events = self.form(values.get("extracted_form") or {})
+        # The last audit only speaks for the form if nothing was corrected since.
+        if values.get("error_history") and values.get("audited_form") == values.get("extracted_form"):
+            final = values.get("termination_reason") is not None
+            events.append(self.verification(values.get("verification_errors") or [], self.loop, final))
+        return events
@@ -1,10 +1,13 @@
 from __future__ import annotations
 import logging
+import os
 from typing import Literal
 
 from langgraph.graph import StateGraph, START, END
 
-from .state import GraphState, MAX_LOOPS
+from .state import GraphState
+from .node_audit_correct import audit_correct_node
+from .node_condense import condense_node
 from .node_generate import initialization_node
 from .node_verify import verify_node
 from .node_regenerate import regenerate_node
@@ -12,31 +15,69 @@ from .node_regenerate import regenerate_node
 logger = logging.getLogger(__name__)
 
 
-def _route_after_verify(state: GraphState) -> Literal["regenerate_node", "__end__"]:
-    if state["is_valid"]:
-        logger.info("[RAG] router: form validated — done")
-        return END
+# RAG_TOPOLOGY picks how the form is checked after extraction:
+#   three_node  verify_node audits, regenerate_node corrects, until they converge
+#   fused       audit_correct_node audits and corrects in one model call per pass
+TOPOLOGIES = ("three_node", "fused")
+TOPOLOGY = os.getenv("RAG_TOPOLOGY", "three_node").lower()
 
-    if state.get("loop_count", 0) >= MAX_LOOPS:
+
+def _finish(state: GraphState) -> Literal["__end__"]:
+    if state.get("termination_reason") == "valid":
+        logger.info("[RAG] router: form validated — done")
+    else:
         logger.warning(
-            "[RAG] router: loop limit (%d) reached — returning best form despite errors: %s",
-            MAX_LOOPS,
+            "[RAG] router: stopping after %d correction(s) (%s) — returning best form despite errors: %s",
+            state.get("loop_count", 0),
+            state.get("termination_reason"),
             state["verification_errors"],
         )
-        return END
+    return END
+
+
+def _route_after_verify(state: GraphState) -> Literal["regenerate_node", "__end__"]:
+    return "regenerate_node" if state.get("termination_reason") is None else _finish(state)
+
+
+def _route_after_audit_correct(state: GraphState) -> Literal["audit_correct_node", "__end__"]:
+    return "audit_correct_node" if state.get("termination_reason") is None else _finish(state)
+
+
+def build(topology: str = TOPOLOGY) -> StateGraph:
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"unknown RAG_TOPOLOGY {topology!r} (expected one of {', '.join(TOPOLOGIES)})")
+    builder = StateGraph(GraphState)
+
+    builder.add_node("condense_node", condense_node)
+    builder.add_node("initialization_node", initialization_node)
+    builder.add_edge(START, "condense_node")
+    builder.add_edge("condense_node", "initialization_node")
+
+    if topology == "fused":
+        builder.add_node("audit_correct_node", audit_correct_node)
+        builder.add_edge("initialization_node", "audit_correct_node")
+        builder.add_conditional_edges("audit_correct_node", _route_after_audit_correct)
+    else:
+        builder.add_node("verify_node", verify_node)
+        builder.add_node("regenerate_node", regenerate_node)
+        builder.add_edge("initialization_node", "verify_node")
+        builder.add_conditional_edges("verify_node", _route_after_verify)
+        builder.add_edge("regenerate_node", "verify_node")
+    return builder
 
-    return "regenerate_node"
 
+builder = build()
 
-builder = StateGraph(GraphState)
+# Without a checkpointer: for scripts and benchmarks that run the graph in-process.
+compiled_graph = builder.compile(name=TOPOLOGY)
 
-builder.add_node("initialization_node", initialization_node)
-builder.add_node("verify_node", verify_node)
-builder.add_node("regenerate_node", regenerate_node)
 
-builder.add_edge(START, "initialization_node")
-builder.add_edge("initialization_node", "verify_node")
-builder.add_conditional_edges("verify_node", _route_after_verify)
-builder.add_edge("regenerate_node", "verify_node")
+def compile_checkpointed(topology: str = TOPOLOGY):
+    """
+    The graph as the routes run it: every step is saved to Postgres (see
+    checkpointer.py). The graph is named after its topology; the routes
+    keep each topology's checkpoints on their own threads.
+    """
+    from .checkpointer import PostgresCheckpointer
 
-compiled_graph = builder.compile()
+    return build(topology).compile(checkpointer=PostgresCheckpointer(), name=topology)
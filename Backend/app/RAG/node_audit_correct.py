@@ -0,0 +1,94 @@
+from __future__ import annotations
+import json
+import logging
+from typing import List
+
+from langchain_openai import ChatOpenAI
+
+from app import resilience
+from .convergence import changed_paths, termination_reason
+from .node_regenerate import _SCHEMA as _FORM_SCHEMA
+from .node_verify import _audit
+from .prompts import AUDIT_CORRECT_SYSTEM_PROMPT, VERIFY_SYSTEM_PROMPT
+from .state import MAX_LOOPS, GraphState
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = {
+    "title": "audit_and_correct",
+    "type": "object",
+    "properties": {
+        "is_valid": {"type": "boolean"},
+        "errors": {"type": "array", "items": {"type": "string"}},
+        "corrected_form": {"anyOf": [{k: v for k, v in _FORM_SCHEMA.items() if k != "title"}, {"type": "null"}]},
+    },
+    "required": ["is_valid", "errors", "corrected_form"],
+}
+
+_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, timeout=resilience.CLIENT_TIMEOUT, max_retries=0)
+_auditor = _llm.with_structured_output(schema=_SCHEMA)
+
+
+def _audit_and_correct(transcript: str, form: dict) -> tuple[List[str], dict | None]:
+    user_message = (
+        f"RAW TRANSCRIPT:\n{transcript}\n\n"
+        f"EXTRACTED JSON FORM:\n{json.dumps(form, indent=2)}"
+    )
+    result: dict = resilience.call("audit_correct", lambda: _auditor.invoke([
+        {"role": "system", "content": AUDIT_CORRECT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_message},
+    ], timeout=resilience.time_left()))
+    errors = result.get("errors") or []
+    # As in verify_node: "valid" with errors listed is trusted on the errors.
+    if result.get("is_valid") and not errors:
+        return [], None
+    return list(errors), result.get("corrected_form")
+
+
+def audit_correct_node(state: GraphState) -> dict:
+    """
+    The fused topology (RAG_TOPOLOGY=fused): one call audits the whole form
+    and, if it finds errors, returns the corrected form with them, instead
+    of verify_node and regenerate_node each making a round trip. The
+    correction is audited on the next pass, so the form the graph ends with
+    has always been audited, as in the three-node graph.
+
+    On the last pass a correction could not be audited, so only the audit
+    is asked for. A correction identical to the form stops the loop
+    straight away (no_change) rather than auditing it again.
+    """
+    loop = state.get("loop_count", 0)
+    form = state["extracted_form"]
+    previous = state.get("audited_form")
+    history = state.get("error_history") or []
+    changed = None if previous is None else changed_paths(previous, form)
+
+    corrected = None
+    if loop >= MAX_LOOPS:
+        logger.info("[RAG] audit_correct_node: final audit (loop %d)", loop)
+        errors = _audit(VERIFY_SYSTEM_PROMPT, state["transcript"], "EXTRACTED JSON FORM", form)
+    else:
+        logger.info("[RAG] audit_correct_node: auditing and correcting (loop %d)", loop)
+        errors, corrected = _audit_and_correct(state["transcript"], form)
+
+    reason = termination_reason(errors, history, loop, form_changed=changed is None or bool(changed))
+    if reason is None and (not corrected or not changed_paths(form, corrected)):
+        reason = "no_change"
+    if not errors:
+        logger.info("[RAG] audit_correct_node: form is VALID — exiting loop")
+    else:
+        logger.warning("[RAG] audit_correct_node: %d error(s) on loop %d", len(errors), loop)
+        for i, err in enumerate(errors, 1):
+            logger.warning("[RAG]   error %d: %s", i, err)
+
+    update = {
+        "is_valid": not errors,
+        "verification_errors": errors,
+        "audited_form": form,
+        "error_history": history + [errors],
+        "termination_reason": reason,
+    }
+    if reason is None:
+        logger.info("[RAG] audit_correct_node: correction applied (loop %d)", loop + 1)
+        update.update(extracted_form=corrected, loop_count=loop + 1)
+    return update
@@ -1,14 +1,27 @@
 import logging
 
+from langchain_core.runnables import RunnableConfig
+from langgraph.types import StreamWriter
+
 from app.llm_parse.parser import generate_form
-from .state import GraphState
+from .state import GraphState, model_transcript
 
 logger = logging.getLogger(__name__)
 
 
-def initialization_node(state: GraphState) -> dict:
+def initialization_node(state: GraphState, config: RunnableConfig, writer: StreamWriter) -> dict:
     logger.info("[RAG] initialization_node: generating initial form from transcript")
-    extracted = generate_form(state["transcript"])
+    on_field = None
+    if config.get("configurable", {}).get("stream_fields"):
+        # Fields go out on the graph's "custom" stream as the model writes them.
+        on_field = lambda path, value: writer({"path": path, "value": value})  # noqa: E731
+    extracted = generate_form(model_transcript(state), on_field=on_field)
     logger.info("[RAG] initialization_node: form generated successfully")
     logger.debug("[RAG] initialization_node: extracted_form=%s", extracted)
-    return {"extracted_form": extracted, "loop_count": 0}
+    return {
+        "extracted_form": extracted,
+        "loop_count": 0,
+        "audited_form": None,
+        "error_history": [],
+        "termination_reason": None,
+    }
@@ -5,6 +5,7 @@ from pathlib import Path
 
 from langchain_openai import ChatOpenAI
 
+from app import resilience
 from .prompts import REGENERATE_SYSTEM_PROMPT
 from .state import GraphState
 
@@ -13,7 +14,7 @@ logger = logging.getLogger(__name__)
 with open(Path(__file__).parent.parent / "LLM Parse" / "prompt" / "schema.json", encoding="utf-8") as f:
     _SCHEMA = {**json.load(f), "title": "nurse_shift_handoff"}
 
-_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, timeout=resilience.CLIENT_TIMEOUT, max_retries=0)
 _corrector = _llm.with_structured_output(schema=_SCHEMA)
 
 
@@ -29,10 +30,10 @@ def regenerate_node(state: GraphState) -> dict:
         f"VERIFICATION ERRORS:\n{errors_block}"
     )
 
-    corrected: dict = _corrector.invoke([
+    corrected: dict = resilience.call("correct", lambda: _corrector.invoke([
         {"role": "system", "content": REGENERATE_SYSTEM_PROMPT},
         {"role": "user", "content": user_message},
-    ])
+    ], timeout=resilience.time_left()))
 
     logger.info("[RAG] regenerate_node: correction complete")
     return {"extracted_form": corrected, "loop_count": loop}
@@ -6,7 +6,9 @@ from typing import List
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 
-from .prompts import VERIFY_SYSTEM_PROMPT
+from app import resilience
+from .convergence import changed_paths, field_of, subset, termination_reason, touches
+from .prompts import VERIFY_SCOPED_SYSTEM_PROMPT, VERIFY_SYSTEM_PROMPT
 from .state import GraphState
 
 logger = logging.getLogger(__name__)
@@ -17,32 +19,64 @@ class VerificationResult(BaseModel):
     errors: List[str]
 
 
-_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, timeout=resilience.CLIENT_TIMEOUT, max_retries=0)
 _auditor = _llm.with_structured_output(VerificationResult)
 
 
-def verify_node(state: GraphState) -> dict:
-    loop = state.get("loop_count", 0)
-    logger.info("[RAG] verify_node: running audit (loop %d)", loop)
-
+def _audit(system_prompt: str, transcript: str, label: str, form: dict) -> List[str]:
     user_message = (
-        f"RAW TRANSCRIPT:\n{state['transcript']}\n\n"
-        f"EXTRACTED JSON FORM:\n{json.dumps(state['extracted_form'], indent=2)}"
+        f"RAW TRANSCRIPT:\n{transcript}\n\n"
+        f"{label}:\n{json.dumps(form, indent=2)}"
     )
-
-    result: VerificationResult = _auditor.invoke([
-        {"role": "system", "content": VERIFY_SYSTEM_PROMPT},
+    result: VerificationResult = resilience.call("audit", lambda: _auditor.invoke([
+        {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_message},
-    ])
+    ], timeout=resilience.time_left()))
+    # An auditor that says "valid" but lists errors is trusted on the errors.
+    return [] if result.is_valid and not result.errors else list(result.errors)
+
+
+def verify_node(state: GraphState) -> dict:
+    """
+    First pass: audit the whole form. Later passes: audit only the fields
+    the corrector changed, and carry over earlier errors on fields it left
+    alone (those weren't fixed). Falls back to a full audit if an earlier
+    error can't be tied to a field. Skips the model entirely when nothing
+    changed.
+    """
+    loop = state.get("loop_count", 0)
+    form = state["extracted_form"]
+    previous = state.get("audited_form")
+    history = state.get("error_history") or []
+    previous_errors = history[-1] if history else []
+    changed = None if previous is None else changed_paths(previous, form)
+
+    if changed is None or any(field_of(e) is None for e in previous_errors):
+        logger.info("[RAG] verify_node: full audit (loop %d)", loop)
+        errors = _audit(VERIFY_SYSTEM_PROMPT, state["transcript"], "EXTRACTED JSON FORM", form)
+    elif not changed:
+        logger.info("[RAG] verify_node: corrector changed nothing (loop %d) — skipping audit", loop)
+        errors = previous_errors
+    else:
+        carried = [e for e in previous_errors if not touches(field_of(e), changed)]
+        logger.info("[RAG] verify_node: auditing %d changed field(s), carrying %d error(s) (loop %d)",
+                    len(changed), len(carried), loop)
+        errors = carried + _audit(
+            VERIFY_SCOPED_SYSTEM_PROMPT, state["transcript"], "CORRECTED FIELDS", subset(form, changed),
+        )
 
-    if result.is_valid:
+    reason = termination_reason(errors, history, loop, form_changed=changed is None or bool(changed))
+    if not errors:
         logger.info("[RAG] verify_node: form is VALID — exiting loop")
     else:
-        logger.warning("[RAG] verify_node: hallucinations detected on loop %d", loop)
-        for i, err in enumerate(result.errors, 1):
+        logger.warning("[RAG] verify_node: %d error(s) on loop %d", len(errors), loop)
+        for i, err in enumerate(errors, 1):
             logger.warning("[RAG]   error %d: %s", i, err)
 
     return {
-        "is_valid": result.is_valid,
-        "verification_errors": result.errors,
+        "is_valid": not errors,
+        "verification_errors": errors,
+        "audited_form": form,
+        "error_history": history + [errors],
+        "termination_reason": reason,
     }
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
 from typing_extensions import TypedDict
 
 MAX_LOOPS = 3
@@ -7,7 +7,20 @@ MAX_LOOPS = 3
 
 class GraphState(TypedDict):
     transcript: str                 # Raw diarized text from STT
+    condensed_transcript: str       # What the extraction reads (see condense.py)
+    transcript_spans: List[List[int]]  # Span map from condensed_transcript back to transcript
     extracted_form: dict            # JSON data from extraction — updated each correction cycle
     verification_errors: List[str]  # Errors flagged by the auditor node
     is_valid: bool                  # Routing flag: True exits the loop, False triggers regeneration
     loop_count: int                 # Number of regeneration cycles completed
+    audited_form: Optional[dict]    # Form as of the last audit, to diff the next one against
+    error_history: List[List[str]]  # Errors found by each audit pass, in order
+    termination_reason: Optional[str]  # Why the loop stopped (see convergence.py); None while it runs
+
+
+def model_transcript(state: GraphState) -> str:
+    """
+    The transcript for the extraction: condensed, or raw for runs checkpointed
+    before condensation. The auditor and the corrector read state["transcript"].
+    """
+    return state.get("condensed_transcript") or state["transcript"]
@@ -0,0 +1,191 @@
+"""
+Admission control for the expensive stages of processing a recording.
+
+Each resource has a gate that lets at most `limit` callers in at once.
+Callers beyond that queue for a slot (first come, first served). The queue
+holds at most `queue` of them and each waits at most `max_wait` seconds;
+past either bound the caller gets Overloaded instead of piling more work
+onto the instance. Overloaded carries a Retry-After estimate and is
+answered as 429 (see app.main).
+
+  stt       transcribing one recording
+  llm       one RAG graph run (extraction and the verify/correct loop);
+            a run makes several model calls, so this bounds pipelines,
+            not individual requests
+  geocode   ZIP → county lookups
+
+Limits come from ADMISSION_<RESOURCE>_LIMIT, _QUEUE and _MAX_WAIT. Where
+the platform kills requests after a fixed time (REQUEST_BUDGET_SECONDS, see
+app.resilience), the default waits are cut to a fifth of that budget, so a
+queued caller gets its 429 in time and an admitted one still has time for
+the work. Gates are per process and per event loop: scale the limits with
+the number of workers. GET /metrics exports queue depth, in-flight count, wait times and
+rejections per gate, so instances can be sized from real traffic.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.resilience import REQUEST_BUDGET
+
+logger = logging.getLogger(__name__)
+
+# Longest default queue wait when requests have a fixed time budget.
+_MAX_WAIT_CAP = REQUEST_BUDGET / 5 if REQUEST_BUDGET else None
+
+# Upper bounds (seconds) of the wait-time histogram buckets.
+WAIT_BUCKETS = (0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class Overloaded(Exception):
+    """No slot for this resource: its queue is full or the wait ran out."""
+
+    def __init__(self, resource: str, retry_after: float):
+        super().__init__(f"{resource} is at capacity")
+        self.resource = resource
+        self.retry_after = retry_after
+
+
+class Gate:
+    def __init__(self, name: str, limit: int, queue: int, max_wait: float):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._holds: deque[float] = deque(maxlen=50)
+        # Exported counters.
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "timeout": 0}
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_sum = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> float:
+        """Rough time until a newcomer would get a slot: the queue ahead of it, drained limit at a time."""
+        if not self._holds:
+            return self.max_wait
+        mean_hold = sum(self._holds) / len(self._holds)
+        return mean_hold * math.ceil((self.queued + 1) / self.limit)
+
+    def _observe_wait(self, seconds: float) -> None:
+        self.wait_sum += seconds
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if seconds <= bound:
+                self.wait_buckets[i] += 1
+                return
+        self.wait_buckets[-1] += 1
+
+    def _reject(self, reason: str) -> Overloaded:
+        self.rejected[reason] += 1
+        retry_after = self.retry_after()
+        logger.warning("[admission] %s rejected (%s): %d in flight, %d queued, retry after %.0fs",
+                       self.name, reason, self.in_flight, self.queued, retry_after)
+        return Overloaded(self.name, retry_after)
+
+    def _release(self) -> None:
+        # Hand the slot straight to the next waiter so a newcomer can't take it first.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    async def _acquire(self) -> None:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.queue:
+            raise self._reject("queue_full")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_wait)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                self._release()  # granted just as we gave up: pass it on
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                raise self._reject("timeout") from None
+            raise
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        started = time.monotonic()
+        await self._acquire()
+        acquired = time.monotonic()
+        self.admitted += 1
+        self._observe_wait(acquired - started)
+        try:
+            yield
+        finally:
+            self._holds.append(time.monotonic() - acquired)
+            self._release()
+
+
+def _gate(name: str, limit: int, queue: int, max_wait: float) -> Gate:
+    prefix = f"ADMISSION_{name.upper()}_"
+    if _MAX_WAIT_CAP is not None:
+        max_wait = min(max_wait, _MAX_WAIT_CAP)
+    return Gate(
+        name,
+        limit=int(os.getenv(prefix + "LIMIT", limit)),
+        queue=int(os.getenv(prefix + "QUEUE", queue)),
+        max_wait=float(os.getenv(prefix + "MAX_WAIT", max_wait)),
+    )
+
+
+GATES: dict[str, Gate] = {
+    "stt": _gate("stt", limit=4, queue=16, max_wait=120),
+    "llm": _gate("llm", limit=4, queue=16, max_wait=180),
+    "geocode": _gate("geocode", limit=8, queue=128, max_wait=30),
+}
+
+
+def slot(resource: str):
+    """`async with admission.slot("stt"):` — raises Overloaded if no slot can be had."""
+    return GATES[resource].slot()
+
+
+def prometheus() -> str:
+    """Gate state and counters in the Prometheus text format."""
+    lines = [
+        "# HELP carebridge_admission_limit Concurrent slots per resource.",
+        "# TYPE carebridge_admission_limit gauge",
+        *(f'carebridge_admission_limit{{resource="{g.name}"}} {g.limit}' for g in GATES.values()),
+        "# HELP carebridge_admission_in_flight Slots currently held.",
+        "# TYPE carebridge_admission_in_flight gauge",
+        *(f'carebridge_admission_in_flight{{resource="{g.name}"}} {g.in_flight}' for g in GATES.values()),
+        "# HELP carebridge_admission_queued Callers waiting for a slot.",
+        "# TYPE carebridge_admission_queued gauge",
+        *(f'carebridge_admission_queued{{resource="{g.name}"}} {g.queued}' for g in GATES.values()),
+        "# HELP carebridge_admission_admitted_total Callers that got a slot.",
+        "# TYPE carebridge_admission_admitted_total counter",
+        *(f'carebridge_admission_admitted_total{{resource="{g.name}"}} {g.admitted}' for g in GATES.values()),
+        "# HELP carebridge_admission_rejected_total Callers turned away with 429.",
+        "# TYPE carebridge_admission_rejected_total counter",
+        *(f'carebridge_admission_rejected_total{{resource="{g.name}",reason="{reason}"}} {count}'
+          for g in GATES.values() for reason, count in g.rejected.items()),
+        "# HELP carebridge_admission_wait_seconds Time from arrival to getting a slot.",
+        "# TYPE carebridge_admission_wait_seconds histogram",
+    ]
+    for g in GATES.values():
+        cumulative = 0
+        for bound, count in zip((*WAIT_BUCKETS, "+Inf"), g.wait_buckets):
+            cumulative += count
+            lines.append(f'carebridge_admission_wait_seconds_bucket{{resource="{g.name}",le="{bound}"}} {cumulative}')
+        lines.append(f'carebridge_admission_wait_seconds_sum{{resource="{g.name}"}} {g.wait_sum:.6f}')
+        lines.append(f'carebridge_admission_wait_seconds_count{{resource="{g.name}"}} {g.admitted}')
+    return "\n".join(lines) + "\n"
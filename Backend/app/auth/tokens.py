@@ -0,0 +1,166 @@
+"""
+Stateless, HMAC-signed bearer tokens.
+
+A token is base64url(claims JSON) + "." + base64url(HMAC-SHA256(claims)),
+signed with AUTH_SECRET. Verifying one needs no lookup, so every worker and
+serverless invocation sharing the secret accepts the same tokens. Claims:
+sub (email), name, iat, exp (unix seconds) and jti (random id).
+
+Revocation (logout) records the jti in revoked_tokens until the token would
+have expired anyway. Each process keeps that denylist in memory and
+re-reads it at most every AUTH_DENYLIST_REFRESH_SECONDS, so a revoked token
+stops working everywhere within that window while the hot path stays a
+signature check plus a set lookup.
+"""
+from __future__ import annotations
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+from datetime import datetime, timezone
+
+from fastapi import Header, HTTPException, Request
+from sqlalchemy import text
+
+from app.db import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# AUTH_REQUIRED=1 puts every data route behind a bearer token (see app.main).
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "").lower() in ("1", "true", "yes")
+
+_secret = os.getenv("AUTH_SECRET")
+if not _secret:
+    # Tokens from a random per-process key don't survive restarts and aren't
+    # accepted by other workers or serverless instances: logins would fail at
+    # random. Fine for local dev only, so it is refused when auth is required.
+    if AUTH_REQUIRED:
+        raise RuntimeError("AUTH_REQUIRED is set but AUTH_SECRET is not; set AUTH_SECRET to a long random string")
+    logger.warning("AUTH_SECRET is not set; using a random per-process signing key")
+    _secret = secrets.token_urlsafe(32)
+_KEY = _secret.encode()
+
+TOKEN_TTL_SECONDS = int(os.getenv("AUTH_TOKEN_TTL_SECONDS", 12 * 3600))  # one shift
+_DENYLIST_REFRESH_SECONDS = float(os.getenv("AUTH_DENYLIST_REFRESH_SECONDS", 30))
+
+
+class TokenError(ValueError):
+    """Raised for malformed, tampered or expired tokens."""
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(_KEY, payload.encode(), hashlib.sha256).digest())
+
+
+def issue_token(email: str, name: str, ttl_seconds: int = TOKEN_TTL_SECONDS) -> tuple[str, dict]:
+    """Return (token, claims) for a nurse."""
+    now = int(time.time())
+    claims = {"sub": email, "name": name, "iat": now, "exp": now + ttl_seconds, "jti": secrets.token_hex(8)}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload)}", claims
+
+
+def verify_token(token: str) -> dict:
+    """Check signature and expiry; return the claims. Raises TokenError."""
+    payload, _, signature = token.partition(".")
+    if not payload or not signature:
+        raise TokenError("Malformed token")
+    # Bytes, not str: compare_digest raises TypeError on non-ASCII strings.
+    if not hmac.compare_digest(signature.encode(), _sign(payload).encode()):
+        raise TokenError("Invalid token signature")
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError as exc:
+        raise TokenError("Malformed token") from exc
+    if not isinstance(claims, dict) or claims.get("exp", 0) <= time.time():
+        raise TokenError("Token expired")
+    return claims
+
+
+# ---------------------------------------------------------------------------
+# Denylist
+# ---------------------------------------------------------------------------
+
+_revoked: dict[str, float] = {}  # jti -> exp
+_revoked_loaded_at = float("-inf")
+_refresh_lock = asyncio.Lock()
+
+
+async def _refresh_denylist() -> None:
+    global _revoked, _revoked_loaded_at
+    async with _refresh_lock:
+        if time.monotonic() - _revoked_loaded_at < _DENYLIST_REFRESH_SECONDS:
+            return
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text("SELECT jti, expires_at FROM revoked_tokens WHERE expires_at > now()")
+            )
+            _revoked = {row["jti"]: row["expires_at"].timestamp() for row in result.mappings().all()}
+        _revoked_loaded_at = time.monotonic()
+
+
+async def is_revoked(jti: str) -> bool:
+    if time.monotonic() - _revoked_loaded_at >= _DENYLIST_REFRESH_SECONDS:
+        try:
+            await _refresh_denylist()
+        except Exception as exc:
+            # Keep serving from the last known list rather than failing auth.
+            logger.error("Token denylist refresh failed: %s", exc)
+    return jti in _revoked
+
+
+async def revoke(claims: dict) -> None:
+    """Deny a token until its expiry; also prunes entries that have expired."""
+    expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            text("""
+                INSERT INTO revoked_tokens (jti, expires_at) VALUES (:jti, :exp)
+                ON CONFLICT (jti) DO NOTHING
+            """),
+            {"jti": claims["jti"], "exp": expires_at},
+        )
+        await db.execute(text("DELETE FROM revoked_tokens WHERE expires_at <= now()"))
+        await db.commit()
+    _revoked[claims["jti"]] = claims["exp"]
+
+
+# ---------------------------------------------------------------------------
+# FastAPI dependency
+# ---------------------------------------------------------------------------
+
+async def current_nurse(request: Request, authorization: str | None = Header(default=None)) -> dict:
+    """
+    Claims of the bearer token on this request, or 401. The result is kept
+    on request.state, so routers, routes and nested dependencies that all
+    require it verify the token once per request.
+    """
+    cached = getattr(request.state, "nurse", None)
+    if cached is not None:
+        return cached
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Missing bearer token", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        claims = verify_token(token.strip())
+    except TokenError as exc:
+        raise HTTPException(status_code=401, detail=str(exc), headers={"WWW-Authenticate": "Bearer"})
+    if await is_revoked(claims["jti"]):
+        raise HTTPException(status_code=401, detail="Token revoked", headers={"WWW-Authenticate": "Bearer"})
+
+    request.state.nurse = claims
+    return claims
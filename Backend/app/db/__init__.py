@@ -3,6 +3,7 @@ from urllib.parse import urlparse, urlencode, urlunparse, parse_qs
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 load_dotenv()
 
@@ -25,6 +26,15 @@ engine = create_async_engine(
     connect_args={"ssl": True, "statement_cache_size": 0},
 )
 
+# Connections that are held for minutes (the advisory lock on a recording's
+# run, see routes/sessions.py) are opened outside the pool, so runs queued
+# for an admission slot can't starve it.
+lock_engine = create_async_engine(
+    _make_async_url(DATABASE_URL),
+    poolclass=NullPool,
+    connect_args={"ssl": True, "statement_cache_size": 0},
+)
+
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
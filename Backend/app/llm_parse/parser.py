@@ -1,13 +1,32 @@
-import os
+"""
+Transcript -> nurse_shift_handoff form (prompt.txt + schema.json in
+"LLM Parse/prompt").
+
+EXTRACTION_MODE picks how:
+
+  single     (default) one structured-output call for the whole schema
+  sectioned  one call per SECTIONS group, run concurrently, each with a
+             sub-schema cut from schema.json; results are merged back into
+             the full form shape. Wall time is bounded by the slowest
+             section instead of the whole output, at the cost of sending
+             the prompt and transcript once per section.
+
+Either mode can stream its output and report fields as they complete
+(extract_form's on_field), which the RAG graph uses to push unverified
+fields to the client while extraction is still running.
+"""
+import contextvars
 import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable
 
-from openai import OpenAI
-from dotenv import load_dotenv
-
-load_dotenv()
+from app import resilience, subsystems
+from app.llm_parse.partial_json import PartialJSONParser
 
-_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
 
 _LLM_PARSE_DIR = Path(__file__).parent.parent / "LLM Parse" / "prompt"
 
@@ -17,22 +36,126 @@ with open(_LLM_PARSE_DIR / "prompt.txt", "r", encoding="utf-8") as f:
 with open(_LLM_PARSE_DIR / "schema.json", "r", encoding="utf-8") as f:
     _SCHEMA = json.load(f)
 
+MODEL = "gpt-4o-mini"
+EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "single").lower()
 
-def generate_form(transcript: str) -> dict:
-    """Extract a structured handoff form from a raw transcript."""
-    response = _client.chat.completions.create(
-        model="gpt-4o-mini",
+# Groups of top-level schema properties extracted together in sectioned
+# mode. Small sections ride along with others so the transcript isn't sent
+# six times; the long outputs (summary, medication list) get their own call.
+SECTIONS: list[tuple[str, ...]] = [
+    ("patient_information", "nurse_on_shift"),
+    ("background", "vital_signs"),
+    ("current_assessment",),
+    ("medications",),
+]
+
+OnField = Callable[[str, Any], None]
+
+_section_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="extract")
+
+
+def section_schema(keys: tuple[str, ...]) -> dict:
+    """The part of schema.json covering the given top-level properties."""
+    return {
+        "type": "object",
+        "properties": {k: _SCHEMA["properties"][k] for k in keys},
+        "required": [k for k in _SCHEMA.get("required", []) if k in keys],
+        "additionalProperties": False,
+    }
+
+
+def _usage(response) -> dict:
+    usage = getattr(response, "usage", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+    }
+
+
+def _extract(transcript: str, schema: dict, system_prompt: str, on_field: OnField | None = None) -> tuple[dict, dict]:
+    request = dict(
+        model=MODEL,
         messages=[
-            {"role": "system", "content": _PROMPT},
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": transcript},
         ],
         response_format={
             "type": "json_schema",
             "json_schema": {
                 "name": "nurse_shift_handoff",
-                "schema": _SCHEMA,
+                "schema": schema,
                 "strict": False,
             },
         },
     )
-    return json.loads(response.choices[0].message.content)
+    if on_field is None:
+        response = resilience.call("parse", lambda: subsystems.get("openai").chat.completions.create(
+            **request, timeout=resilience.time_left(),
+        ))
+        return json.loads(response.choices[0].message.content), _usage(response)
+
+    def _stream() -> tuple[str, dict]:
+        # A fresh parser per attempt; a retried attempt re-reports the fields it re-generates.
+        parser = PartialJSONParser()
+        parts: list[str] = []
+        usage = {"prompt_tokens": 0, "completion_tokens": 0}
+        stream = subsystems.get("openai").chat.completions.create(
+            **request, stream=True, stream_options={"include_usage": True}, timeout=resilience.time_left(),
+        )
+        for chunk in stream:
+            if chunk.usage:
+                usage = _usage(chunk)
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                for path, value in parser.feed(delta):
+                    on_field(path, value)
+        return "".join(parts), usage
+
+    content, usage = resilience.call("parse", _stream)
+    return json.loads(content), usage
+
+
+def _extract_section(transcript: str, keys: tuple[str, ...], on_field: OnField | None = None) -> tuple[dict, dict]:
+    prompt = (
+        f"{_PROMPT}\n\nThis request covers only these sections of the handoff form: "
+        f"{', '.join(keys)}. Fill in exactly those sections."
+    )
+    return _extract(transcript, section_schema(keys), prompt, on_field)
+
+
+def extract_form(transcript: str, mode: str | None = None, on_field: OnField | None = None) -> tuple[dict, dict]:
+    """
+    Return (form, token usage) using the given or configured extraction mode.
+    With on_field, the response is streamed and on_field(path, value) is
+    called for each field as soon as the model has finished writing it
+    (see partial_json.py); in sectioned mode it is called from several
+    threads at once.
+    """
+    mode = mode or EXTRACTION_MODE
+    if mode == "single":
+        return _extract(transcript, _SCHEMA, _PROMPT, on_field)
+    if mode != "sectioned":
+        raise ValueError(f"Unknown EXTRACTION_MODE '{mode}' (expected 'single' or 'sectioned')")
+
+    context = contextvars.copy_context()
+    results = list(_section_pool.map(
+        lambda keys: context.copy().run(_extract_section, transcript, keys, on_field), SECTIONS,
+    ))
+    merged: dict = {}
+    usage = {"prompt_tokens": 0, "completion_tokens": 0}
+    for keys, (part, part_usage) in zip(SECTIONS, results):
+        for key in keys:
+            merged[key] = part.get(key)
+        for name in usage:
+            usage[name] += part_usage[name]
+    # Same key order as the single-call output.
+    return {k: merged.get(k) for k in _SCHEMA["properties"]}, usage
+
+
+def generate_form(transcript: str, on_field: OnField | None = None) -> dict:
+    """Extract a structured handoff form from a raw transcript."""
+    form, usage = extract_form(transcript, on_field=on_field)
+    logger.info("Extraction (%s): %d prompt + %d completion tokens",
+                EXTRACTION_MODE, usage["prompt_tokens"], usage["completion_tokens"])
+    return form
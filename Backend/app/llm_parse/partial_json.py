@@ -0,0 +1,171 @@
+"""
+Incremental parser for a JSON object arriving in chunks (a streamed model
+response). feed() takes the next piece of text and returns the fields that
+became complete with it, so a caller can show each form field the moment
+the model has finished writing it instead of waiting for the whole object.
+
+Objects are descended into and reported leaf by leaf under dotted paths
+("vital_signs.heart_rate"); strings, numbers, literals and arrays are
+reported whole once they close. That is the same path scheme as
+app/RAG/convergence.flatten(). An empty object is reported as a value.
+"""
+from __future__ import annotations
+import json
+from typing import Any, List, Tuple
+
+_WS = " \t\r\n"
+_SCALAR_END = _WS + ",}]"
+
+
+class PartialJSONError(ValueError):
+    pass
+
+
+class _Object:
+    __slots__ = ("path", "key", "expect", "empty")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.key: str | None = None
+        self.expect = "key"         # key → colon → value → comma → key ...
+        self.empty = True
+
+
+class PartialJSONParser:
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._stack: List[_Object] = []
+        self._started = False
+        self.done = False
+        # Scan state of the value (or key) currently being read.
+        self._start: int | None = None
+        self._in_string = False
+        self._escape = False
+        self._depth = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume chunk; return (path, value) for every field completed by it."""
+        self._buf += chunk
+        fields: List[Tuple[str, Any]] = []
+        while self._pos < len(self._buf) and not self.done:
+            if not self._step(fields):
+                break  # need more input
+        return fields
+
+    # -- internals ---------------------------------------------------------
+
+    def _path(self, frame: _Object) -> str:
+        return f"{frame.path}.{frame.key}" if frame.path else frame.key
+
+    def _skip_ws(self) -> bool:
+        while self._pos < len(self._buf) and self._buf[self._pos] in _WS:
+            self._pos += 1
+        return self._pos < len(self._buf)
+
+    def _close_object(self, fields: List[Tuple[str, Any]]) -> None:
+        frame = self._stack.pop()
+        self._pos += 1
+        if not self._stack:
+            self.done = True
+            return
+        parent = self._stack[-1]
+        if frame.empty:
+            fields.append((frame.path, {}))
+        parent.expect = "comma"
+
+    def _scan(self) -> int | None:
+        """Advance the current string/array/scalar scan; return its end index once complete."""
+        buf = self._buf
+        while self._pos < len(buf):
+            ch = buf[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 0:
+                        self._pos += 1
+                        return self._pos
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                self._depth += 1
+            elif ch in "]}":
+                if self._depth == 0:
+                    return self._pos  # end of a bare scalar
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pos += 1
+                    return self._pos
+            elif self._depth == 0 and ch in _SCALAR_END:
+                return self._pos
+            self._pos += 1
+        return None
+
+    def _begin_scan(self) -> None:
+        self._start = self._pos
+        self._in_string = False
+        self._escape = False
+        self._depth = 0
+
+    def _step(self, fields: List[Tuple[str, Any]]) -> bool:
+        if self._start is None and not self._skip_ws():
+            return False
+
+        if not self._started:
+            if self._buf[self._pos] != "{":
+                raise PartialJSONError(f"expected an object, got {self._buf[self._pos]!r}")
+            self._stack.append(_Object(""))
+            self._started = True
+            self._pos += 1
+            return True
+
+        frame = self._stack[-1]
+        ch = self._buf[self._pos]
+
+        if frame.expect == "key":
+            if self._start is None:
+                if ch == "}":
+                    self._close_object(fields)
+                    return True
+                if ch != '"':
+                    raise PartialJSONError(f"expected a key at offset {self._pos}")
+                self._begin_scan()
+            end = self._scan()
+            if end is None:
+                return False
+            frame.key = json.loads(self._buf[self._start:end])
+            frame.empty = False
+            frame.expect = "colon"
+            self._start = None
+        elif frame.expect == "colon":
+            if ch != ":":
+                raise PartialJSONError(f"expected ':' at offset {self._pos}")
+            self._pos += 1
+            frame.expect = "value"
+        elif frame.expect == "value":
+            if self._start is None:
+                if ch == "{":
+                    self._stack.append(_Object(self._path(frame)))
+                    self._pos += 1
+                    return True
+                self._begin_scan()
+            end = self._scan()
+            if end is None:
+                return False
+            raw = self._buf[self._start:end]
+            self._start = None
+            fields.append((self._path(frame), json.loads(raw)))
+            frame.expect = "comma"
+        else:  # comma
+            if ch == ",":
+                self._pos += 1
+                frame.expect = "key"
+            elif ch == "}":
+                self._close_object(fields)
+            else:
+                raise PartialJSONError(f"expected ',' or '}}' at offset {self._pos}")
+        return True
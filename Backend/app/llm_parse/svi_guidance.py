@@ -0,0 +1,203 @@
+"""
+County-level cache of LLM nurse guidance for SVI flags.
+
+The guidance (prompt/svi_prompt.txt + prompt/svi_schema.json; this module
+is the only place it is generated) depends only on a county's SVI flags,
+never on the patient. It is generated once per county and stored in svi_guidance,
+keyed by (stcnty, dataset_version, prompt_version):
+
+  dataset_version  hash of the SVI CSV (cdcsvi_lookup.SVI_DATASET_VERSION)
+  prompt_version   hash of the model, prompt and schema below
+
+Changing either simply keys new rows; old ones are never read again. Reads
+hit an in-process dict first, then the table. prewarm() fills the cache for
+every county we serve so /svi never waits on the model.
+
+Pre-warm from the command line (from Backend/):
+    python -m app.llm_parse.svi_guidance            # counties of stored sessions
+    python -m app.llm_parse.svi_guidance 12097 12095
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import resilience, subsystems
+
+logger = logging.getLogger(__name__)
+
+MODEL = "gpt-4.1-mini"
+_PROMPT_DIR = Path(__file__).parent.parent / "LLM Parse" / "prompt"
+
+with open(_PROMPT_DIR / "svi_prompt.txt", "r", encoding="utf-8") as f:
+    _PROMPT = f.read()
+
+with open(_PROMPT_DIR / "svi_schema.json", "r", encoding="utf-8") as f:
+    _SCHEMA = json.load(f)
+
+PROMPT_VERSION = hashlib.sha256(
+    "\n".join([MODEL, _PROMPT, json.dumps(_SCHEMA, sort_keys=True)]).encode()
+).hexdigest()[:12]
+
+_PREWARM_CONCURRENCY = 4
+
+# (stcnty, dataset_version, prompt_version) -> guidance
+_cache: dict[tuple[str, str, str], dict] = {}
+# Generations in flight, so concurrent misses for a county share one call.
+_inflight: dict[tuple[str, str, str], asyncio.Future] = {}
+
+
+def _extract_output_text(resp) -> str:
+    """Concatenate all text parts from a Responses API object."""
+    parts = []
+    for msg in getattr(resp, "output", []) or []:
+        for c in getattr(msg, "content", []) or []:
+            t = getattr(c, "text", None)
+            if t:
+                parts.append(t)
+    return "\n".join(parts).strip()
+
+
+def generate_guidance(location: str, flags: dict) -> dict:
+    """One model call: {"risk_areas": [...], "follow_up_questions": [...]} for a county's flags."""
+    response = resilience.call("svi_guidance", lambda: subsystems.get("openai").responses.create(
+        model=MODEL,
+        temperature=0.2,
+        input=[
+            {
+                "role": "developer",
+                "content": _PROMPT + "\n\nReturn ONLY valid JSON. No markdown. No code blocks.",
+            },
+            {"role": "user", "content": f"Location: {location}\nSVI Info: {flags}"},
+        ],
+        text={
+            "format": {
+                "type": "json_schema",
+                "name": "svi_nurse_guidance",
+                "schema": _SCHEMA,
+                "strict": True,
+            }
+        },
+        timeout=resilience.time_left(),
+    ))
+    return json.loads(_extract_output_text(response))
+
+
+def _key(stcnty: str, dataset_version: str) -> tuple[str, str, str]:
+    return stcnty, dataset_version, PROMPT_VERSION
+
+
+async def get_cached_many(stcntys: list[str], dataset_version: str, db: AsyncSession) -> dict[str, dict]:
+    """Cached guidance for the given counties (memory, then one query); misses are omitted."""
+    found = {s: _cache[_key(s, dataset_version)] for s in stcntys if _key(s, dataset_version) in _cache}
+    missing = [s for s in dict.fromkeys(stcntys) if s not in found]
+    if missing:
+        result = await db.execute(
+            text("""
+                SELECT stcnty, guidance FROM svi_guidance
+                WHERE stcnty = ANY(:stcntys) AND dataset_version = :dv AND prompt_version = :pv
+            """),
+            {"stcntys": missing, "dv": dataset_version, "pv": PROMPT_VERSION},
+        )
+        for row in result.mappings().all():
+            _cache[_key(row["stcnty"], dataset_version)] = row["guidance"]
+            found[row["stcnty"]] = row["guidance"]
+    return found
+
+
+async def _generate_once(stcnty: str, dataset_version: str, location: str, flags: dict) -> dict:
+    key = _key(stcnty, dataset_version)
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(asyncio.to_thread(generate_guidance, location, flags))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(future)
+
+
+async def ensure_guidance(county: dict, dataset_version: str, db: AsyncSession) -> dict | None:
+    """
+    Cached guidance for a county ({"stcnty", "location", "flags"}), generating
+    and storing it on a miss. Returns None if generation fails.
+    """
+    stcnty = county["stcnty"]
+    cached = await get_cached_many([stcnty], dataset_version, db)
+    if stcnty in cached:
+        return cached[stcnty]
+    try:
+        guidance = await _generate_once(stcnty, dataset_version, county["location"], county["flags"])
+    except Exception as exc:
+        logger.error("SVI guidance generation failed for %s (%s): %s", stcnty, county["location"], exc)
+        return None
+    await db.execute(
+        text("""
+            INSERT INTO svi_guidance (stcnty, dataset_version, prompt_version, location, guidance)
+            VALUES (:stcnty, :dv, :pv, :location, CAST(:guidance AS JSONB))
+            ON CONFLICT DO NOTHING
+        """),
+        {
+            "stcnty": stcnty, "dv": dataset_version, "pv": PROMPT_VERSION,
+            "location": county["location"], "guidance": json.dumps(guidance),
+        },
+    )
+    await db.commit()
+    _cache[_key(stcnty, dataset_version)] = guidance
+    logger.info("SVI guidance generated for %s (%s)", stcnty, county["location"])
+    return guidance
+
+
+async def served_counties(svi, db: AsyncSession) -> list[dict]:
+    """Distinct counties of sessions with a resolved SVI record."""
+    result = await db.execute(
+        text("SELECT DISTINCT svi->>'location' AS location FROM patients WHERE svi ? 'flags'")
+    )
+    stcntys = {svi.resolve_stcnty(row["location"]) for row in result.mappings().all()}
+    return [county for county in map(svi.get_county_record, sorted(s for s in stcntys if s)) if county]
+
+
+async def prewarm(counties: list[dict], dataset_version: str, session_factory) -> dict:
+    """
+    Make sure guidance exists for every county, generating misses with
+    bounded concurrency (each on its own DB session). Returns counts.
+    """
+    async with session_factory() as db:
+        cached = await get_cached_many([c["stcnty"] for c in counties], dataset_version, db)
+    todo = [c for c in counties if c["stcnty"] not in cached]
+    semaphore = asyncio.Semaphore(_PREWARM_CONCURRENCY)
+
+    async def _one(county: dict) -> bool:
+        async with semaphore, session_factory() as db:
+            return await ensure_guidance(county, dataset_version, db) is not None
+
+    results = await asyncio.gather(*(_one(c) for c in todo))
+    return {
+        "counties": len(counties),
+        "cached": len(cached),
+        "generated": sum(results),
+        "failed": len(results) - sum(results),
+    }
+
+
+async def _main(stcntys: list[str]) -> None:
+    from app.db import AsyncSessionLocal
+
+    svi = await subsystems.aget("svi")
+    if svi is None:
+        raise SystemExit("SVI lookup unavailable")
+    if stcntys:
+        counties = [c for c in map(svi.get_county_record, stcntys) if c]
+    else:
+        async with AsyncSessionLocal() as db:
+            counties = await served_counties(svi, db)
+    print(await prewarm(counties, svi.SVI_DATASET_VERSION, AsyncSessionLocal))
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(sys.argv[1:]))
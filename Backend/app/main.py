@@ -1,7 +1,10 @@
+import asyncio
 import logging
 import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 logging.basicConfig(
     level=logging.INFO,
@@ -10,16 +13,58 @@ logging.basicConfig(
 
 from app.routes.patients import router as patient_router
 from app.routes.auth import router as auth_router
+from app.auth.tokens import AUTH_REQUIRED, current_nurse
 from app.routes.sessions import router as sessions_router
 from app.routes.media import router as media_router
 from app.routes.svi import router as svi_router
+from app import admission, resilience
+from app.db import engine
+from app.warmup import WARMUP_ENABLED, readiness, warm_up
 
-app = FastAPI(title="CareBridge API")
-app.include_router(patient_router)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so /health answers immediately; /ready flips
+    # to 200 once every required subsystem is loaded (see warmup.py).
+    warmup_task = asyncio.create_task(warm_up()) if WARMUP_ENABLED else None
+    yield
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+    await engine.dispose()
+
+
+app = FastAPI(title="CareBridge API", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# AUTH_REQUIRED=1 puts every data route behind a bearer token from /auth/login.
+# Off by default until the frontend sends the Authorization header.
+_protected = [Depends(current_nurse)] if AUTH_REQUIRED else []
+
+
+# A full admission queue (app/admission.py) tells the client when to come back.
+@app.exception_handler(admission.Overloaded)
+async def overloaded(request: Request, exc: admission.Overloaded):
+    return ORJSONResponse(
+        {"detail": f"Server busy: {exc}", "resource": exc.resource},
+        status_code=429,
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+
+# Where the platform kills slow requests (REQUEST_BUDGET_SECONDS, set by
+# api/index.py on Vercel), upstream calls share the request's deadline and
+# answer 503 + Retry-After while there is still time to respond.
+if resilience.REQUEST_BUDGET:
+    @app.middleware("http")
+    async def request_budget(request: Request, call_next):
+        with resilience.request_budget():
+            return await call_next(request)
+
+
+app.include_router(patient_router, dependencies=_protected)
 app.include_router(auth_router)
-app.include_router(sessions_router)
-app.include_router(svi_router)
-app.include_router(media_router)
+app.include_router(sessions_router, dependencies=_protected)
+app.include_router(svi_router, dependencies=_protected)
+app.include_router(media_router, dependencies=_protected)
 
 # ALLOWED_ORIGIN can be set to your Vercel URL in production (e.g. https://your-app.vercel.app).
 # Defaults to "*" for local development.
@@ -43,3 +88,14 @@ def root():
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(admission.prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/ready")
+def ready():
+    is_ready, report = readiness()
+    return ORJSONResponse(report, status_code=200 if is_ready else 503)
@@ -0,0 +1,325 @@
+"""
+Local-disk, content-addressed media store.
+
+Layout under MEDIA_ROOT (default Backend/media_store):
+
+  blobs/<sha[:2]>/<sha256>        finished media; media_id is the SHA-256 hex
+  blobs/<sha[:2]>/<sha256>.json   {filename, content_type, size}
+  uploads/<upload_id>.part        bytes received so far
+  uploads/<upload_id>.json        {filename, content_type, size, sha256}
+
+A resumable upload is created, appended to with offset-checked chunks (a
+client that lost its connection asks for the current offset and carries on
+from there), then completed: the part file is hashed and renamed into
+blobs/. Identical content is stored once; if the client declares the hash
+up front and we already hold it, nothing is uploaded at all.
+
+The store holds patient audio only as long as a /stop retry may need it:
+uploads untouched for MEDIA_UPLOAD_TTL_HOURS and blobs stored (or last
+re-uploaded) more than MEDIA_BLOB_TTL_HOURS ago are deleted by sweep(),
+which writes run at most every few minutes. Chunk appends hold an flock on
+the part file, so the offset check holds across worker processes that
+share the disk.
+
+MEDIA_ROOT is local to one machine. On serverless hosts, where the
+requests of one upload can land on different instances, clients send the
+audio with the /stop request itself instead (see the frontend's
+stopRecording).
+
+All functions here do blocking file I/O; routes call them via
+asyncio.to_thread.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: single process, the thread lock is enough
+    fcntl = None
+
+MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", Path(__file__).resolve().parent.parent.parent / "media_store"))
+_BLOBS = MEDIA_ROOT / "blobs"
+_UPLOADS = MEDIA_ROOT / "uploads"
+
+MAX_MEDIA_BYTES = int(os.getenv("MEDIA_MAX_BYTES", 200 * 1024 * 1024))
+UPLOAD_TTL_SECONDS = float(os.getenv("MEDIA_UPLOAD_TTL_HOURS", 24)) * 3600
+BLOB_TTL_SECONDS = float(os.getenv("MEDIA_BLOB_TTL_HOURS", 72)) * 3600
+_SWEEP_INTERVAL_SECONDS = 600
+_COPY_BLOCK = 1024 * 1024
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+_UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# Running hash of each upload whose chunks arrived in order in this process,
+# so completing it needn't re-read the file. Missing (another worker took
+# some chunks, or a restart) just means a full re-hash on complete.
+_hashers: dict[str, tuple[int, "hashlib._Hash"]] = {}
+_lock = threading.Lock()
+_last_sweep = float("-inf")
+
+
+class MediaError(Exception):
+    """Base class; status_code is what the route should answer with."""
+    status_code = 400
+
+
+class MediaNotFound(MediaError):
+    status_code = 404
+
+
+class OffsetMismatch(MediaError):
+    """Chunk offset isn't where the upload currently ends."""
+    status_code = 409
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+def _blob_path(media_id: str) -> Path:
+    if not _SHA256_RE.match(media_id or ""):
+        raise MediaNotFound("Media not found")
+    return _BLOBS / media_id[:2] / media_id
+
+
+def _upload_paths(upload_id: str) -> tuple[Path, Path]:
+    if not _UPLOAD_ID_RE.match(upload_id or ""):
+        raise MediaNotFound("Upload not found")
+    return _UPLOADS / f"{upload_id}.part", _UPLOADS / f"{upload_id}.json"
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _locked(f) -> Iterator[None]:
+    """Exclusive lock on an open file, across processes where the platform has flock."""
+    with _lock:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def sweep(now: float | None = None) -> dict:
+    """
+    Delete abandoned uploads and expired blobs; returns how many of each. An
+    upload's .part and .json, and a blob and its .json sidecar, expire
+    together, by whichever was touched last.
+    """
+    now = time.time() if now is None else now
+    removed = {"uploads": 0, "blobs": 0}
+    for directory, ttl, kind in ((_UPLOADS, UPLOAD_TTL_SECONDS, "uploads"), (_BLOBS, BLOB_TTL_SECONDS, "blobs")):
+        if not directory.exists():
+            continue
+        groups: dict[Path, list[Path]] = {}
+        for path in directory.rglob("*"):
+            if path.is_file():
+                groups.setdefault(path.with_suffix(""), []).append(path)
+        for stem, paths in groups.items():
+            try:
+                touched = max(path.stat().st_mtime for path in paths)
+            except FileNotFoundError:
+                continue
+            if now - touched <= ttl:
+                continue
+            for path in paths:
+                path.unlink(missing_ok=True)
+            removed[kind] += 1
+            if kind == "uploads":
+                _hashers.pop(stem.name, None)
+    # Uploads another worker swept or completed.
+    for upload_id in list(_hashers):
+        if not (_UPLOADS / f"{upload_id}.json").exists():
+            _hashers.pop(upload_id, None)
+    return removed
+
+
+def _maybe_sweep() -> None:
+    global _last_sweep
+    now = time.time()
+    with _lock:
+        if now - _last_sweep < _SWEEP_INTERVAL_SECONDS:
+            return
+        _last_sweep = now
+    sweep(now)
+
+
+def _commit(part: Path, digest: str, filename: str | None, content_type: str | None) -> tuple[dict, bool]:
+    """Move a finished part file into blobs/; returns (record, deduplicated)."""
+    blob = _blob_path(digest)
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    deduplicated = blob.exists()
+    if deduplicated:
+        part.unlink(missing_ok=True)
+        # Uploaded again: keep it as long as a fresh one.
+        os.utime(blob)
+        try:
+            os.utime(blob.with_suffix(".json"))
+        except FileNotFoundError:
+            _write_json(blob.with_suffix(".json"), {
+                "filename": filename, "content_type": content_type, "size": blob.stat().st_size,
+            })
+    else:
+        os.replace(part, blob)
+        _write_json(blob.with_suffix(".json"), {
+            "filename": filename, "content_type": content_type, "size": blob.stat().st_size,
+        })
+    return get_media(digest), deduplicated
+
+
+def get_media(media_id: str) -> dict:
+    """{media_id, filename, content_type, size} of a stored blob."""
+    blob = _blob_path(media_id)
+    try:
+        meta = json.loads(blob.with_suffix(".json").read_text())
+    except FileNotFoundError:
+        raise MediaNotFound("Media not found")
+    return {"media_id": media_id, **meta}
+
+
+def media_path(media_id: str) -> Path:
+    """Filesystem path of a stored blob, for streaming responses."""
+    blob = _blob_path(media_id)
+    if not blob.exists():
+        raise MediaNotFound("Media not found")
+    return blob
+
+
+def read_media(media_id: str) -> tuple[bytes, dict]:
+    return media_path(media_id).read_bytes(), get_media(media_id)
+
+
+def put_stream(src: BinaryIO, filename: str | None, content_type: str | None) -> tuple[dict, bool]:
+    """Store a whole file in one go (hashing while copying)."""
+    _maybe_sweep()
+    _UPLOADS.mkdir(parents=True, exist_ok=True)
+    part = _UPLOADS / f"{secrets.token_hex(16)}.part"
+    hasher, size = hashlib.sha256(), 0
+    try:
+        with open(part, "wb") as dst:
+            while block := src.read(_COPY_BLOCK):
+                size += len(block)
+                if size > MAX_MEDIA_BYTES:
+                    raise MediaError(f"Media exceeds {MAX_MEDIA_BYTES} bytes")
+                hasher.update(block)
+                dst.write(block)
+        return _commit(part, hasher.hexdigest(), filename, content_type)
+    finally:
+        part.unlink(missing_ok=True)
+
+
+def create_upload(filename: str | None, content_type: str | None, size: int | None, sha256: str | None) -> dict:
+    """
+    Start a resumable upload. If the client's declared sha256 is already
+    stored, returns the media record instead ({"media_id", ...}).
+    """
+    if size is not None and not 0 <= size <= MAX_MEDIA_BYTES:
+        raise MediaError(f"Media exceeds {MAX_MEDIA_BYTES} bytes")
+    _maybe_sweep()
+    if sha256 is not None:
+        sha256 = sha256.lower()
+        if not _SHA256_RE.match(sha256):
+            raise MediaError("sha256 must be 64 hex characters")
+        try:
+            return {**get_media(sha256), "deduplicated": True}
+        except MediaNotFound:
+            pass
+
+    upload_id = secrets.token_hex(16)
+    part, meta = _upload_paths(upload_id)
+    _UPLOADS.mkdir(parents=True, exist_ok=True)
+    part.touch()
+    _write_json(meta, {"filename": filename, "content_type": content_type, "size": size, "sha256": sha256})
+    with _lock:
+        _hashers[upload_id] = (0, hashlib.sha256())
+    return {"upload_id": upload_id, "offset": 0, "size": size}
+
+
+def upload_status(upload_id: str) -> dict:
+    part, meta = _upload_paths(upload_id)
+    try:
+        info = json.loads(meta.read_text())
+        offset = part.stat().st_size
+    except FileNotFoundError:
+        raise MediaNotFound("Upload not found")
+    return {"upload_id": upload_id, "offset": offset, "size": info["size"]}
+
+
+def append_chunk(upload_id: str, offset: int, data: bytes) -> dict:
+    """Append data at offset; OffsetMismatch unless offset is the current end."""
+    part, meta = _upload_paths(upload_id)
+    if not meta.exists():
+        raise MediaNotFound("Upload not found")
+    try:
+        f = open(part, "ab")
+    except FileNotFoundError:
+        raise MediaNotFound("Upload not found")
+    with f, _locked(f):
+        current = os.fstat(f.fileno()).st_size
+        if offset != current:
+            raise OffsetMismatch(current)
+        if current + len(data) > MAX_MEDIA_BYTES:
+            raise MediaError(f"Media exceeds {MAX_MEDIA_BYTES} bytes")
+        f.write(data)
+        f.flush()
+        running = _hashers.get(upload_id)
+        if running and running[0] == offset:
+            running[1].update(data)
+            _hashers[upload_id] = (offset + len(data), running[1])
+        else:
+            _hashers.pop(upload_id, None)
+    os.utime(meta)  # still in progress: not abandoned
+    return {"upload_id": upload_id, "offset": current + len(data)}
+
+
+def complete_upload(upload_id: str) -> tuple[dict, bool]:
+    """Verify size/hash against what was declared and move into blobs/."""
+    part, meta = _upload_paths(upload_id)
+    try:
+        info = json.loads(meta.read_text())
+        size = part.stat().st_size
+    except FileNotFoundError:
+        raise MediaNotFound("Upload not found")
+    if info["size"] is not None and size != info["size"]:
+        raise OffsetMismatch(size)
+
+    with _lock:
+        running = _hashers.pop(upload_id, None)
+    if running and running[0] == size:
+        digest = running[1].hexdigest()
+    else:
+        hasher = hashlib.sha256()
+        with open(part, "rb") as f:
+            while block := f.read(_COPY_BLOCK):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+    if info["sha256"] and digest != info["sha256"]:
+        raise MediaError("Uploaded content does not match the declared sha256")
+
+    record = _commit(part, digest, info["filename"], info["content_type"])
+    meta.unlink(missing_ok=True)
+    return record
+
+
+def abort_upload(upload_id: str) -> None:
+    part, meta = _upload_paths(upload_id)
+    with _lock:
+        _hashers.pop(upload_id, None)
+    part.unlink(missing_ok=True)
+    meta.unlink(missing_ok=True)
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text, func
+from sqlalchemy import BigInteger, Column, DateTime, Integer, LargeBinary, PrimaryKeyConstraint, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 
 class Base(DeclarativeBase):
@@ -15,10 +15,75 @@ class Patient(Base):
     current_assessment = Column(JSONB, nullable=False)
     vital_signs = Column(JSONB, nullable=False, server_default="{}")
     medications = Column(JSONB, nullable=False, server_default="[]")
+    # Resolved SVI for patient_info.geo_location: {location, flags, metrics, questions[, error]}.
+    # Recomputed whenever geo_location changes; NULL means not resolved yet.
+    svi = Column(JSONB, nullable=True)
 
     transcript = Column(Text, nullable=True)
     status = Column(String(50), nullable=False, server_default="pending")
     progress = Column(Integer, nullable=False, server_default="0")
+    version = Column(Integer, nullable=False, server_default="0")
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+
+
+class SessionTombstone(Base):
+    """Ids of deleted sessions, so GET /sessions/changes can report deletions."""
+    __tablename__ = "session_tombstones"
+
+    id = Column(BigInteger, primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+
+
+class SviGuidance(Base):
+    """LLM nurse guidance per county; see app/llm_parse/svi_guidance.py."""
+    __tablename__ = "svi_guidance"
+    __table_args__ = (PrimaryKeyConstraint("stcnty", "dataset_version", "prompt_version"),)
+
+    stcnty = Column(String(5), nullable=False)
+    dataset_version = Column(String(16), nullable=False)
+    prompt_version = Column(String(16), nullable=False)
+    location = Column(Text, nullable=False)
+    guidance = Column(JSONB, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class RevokedToken(Base):
+    """Denylisted auth token ids until they expire; see app/auth/tokens.py."""
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class GraphCheckpoint(Base):
+    """RAG graph checkpoints per stop_recording run; see app/RAG/checkpointer.py."""
+    __tablename__ = "graph_checkpoints"
+    __table_args__ = (PrimaryKeyConstraint("thread_id", "checkpoint_ns", "checkpoint_id"),)
+
+    thread_id = Column(Text, nullable=False)
+    checkpoint_ns = Column(Text, nullable=False, server_default="")
+    checkpoint_id = Column(Text, nullable=False)
+    parent_checkpoint_id = Column(Text, nullable=True)
+    type = Column(Text, nullable=False)
+    checkpoint = Column(LargeBinary, nullable=False)
+    metadata_ = Column("metadata", JSONB, nullable=False, server_default="{}")
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class GraphCheckpointWrite(Base):
+    """Outputs of nodes that finished inside a step whose checkpoint wasn't written yet."""
+    __tablename__ = "graph_checkpoint_writes"
+    __table_args__ = (PrimaryKeyConstraint("thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx"),)
+
+    thread_id = Column(Text, nullable=False)
+    checkpoint_ns = Column(Text, nullable=False, server_default="")
+    checkpoint_id = Column(Text, nullable=False)
+    task_id = Column(Text, nullable=False)
+    idx = Column(Integer, nullable=False)
+    channel = Column(Text, nullable=False)
+    type = Column(Text, nullable=False)
+    blob = Column(LargeBinary, nullable=False)
@@ -0,0 +1,299 @@
+"""
+Deadlines, retries, hedging and a circuit breaker for upstream (OpenAI) calls.
+
+Every model call goes through call(op, fn):
+
+  deadline     each op has a total time budget; attempts never run past it.
+               Where the platform kills requests after a fixed time (Vercel's
+               maxDuration), REQUEST_BUDGET_SECONDS caps every op's budget
+               and, through request_budget(), the whole request's: a call
+               that can't finish in time fails with UpstreamUnavailable
+               (503 + Retry-After) before the platform cuts the response
+  attempt      each attempt also has its own timeout. Attempts run on a
+               shared thread pool and are abandoned (not awaited) when they
+               time out; call sites pass time_left() as the request's HTTP
+               timeout, so an abandoned attempt frees its thread when its
+               own time is up rather than after the client's default
+  retries      timeouts, connection errors, 408/409/429 and 5xx are retried
+               with full-jitter exponential backoff (honouring Retry-After),
+               as long as the next attempt still fits in the deadline
+  hedging      with OPENAI_HEDGING=1, if an attempt is still running after
+               the op's observed p95 latency, a duplicate is started and
+               whichever answers first wins
+  breaker      after BREAKER_FAILURES consecutive failed calls the upstream
+               is marked open and calls fail immediately with
+               UpstreamUnavailable for BREAKER_RESET_SECONDS, then one trial
+               call is let through
+
+The SDK clients are created with max_retries=0 so retries don't compound.
+UpstreamUnavailable carries retry_after so routes can answer 503 and mark
+the session as errored straight away instead of hanging. Errors that are
+not retried (bad request, auth, parsing) count neither as failures nor as
+successes for the breaker.
+"""
+from __future__ import annotations
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+HEDGING_ENABLED = os.getenv("OPENAI_HEDGING", "").lower() in ("1", "true", "yes")
+BREAKER_FAILURES = int(os.getenv("OPENAI_BREAKER_FAILURES", 5))
+BREAKER_RESET_SECONDS = float(os.getenv("OPENAI_BREAKER_RESET_SECONDS", 30))
+# Seconds a request may run before the platform kills it; unset (0) means no
+# limit. api/index.py sets it below Vercel's maxDuration.
+REQUEST_BUDGET = float(os.getenv("REQUEST_BUDGET_SECONDS", 0)) or None
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+@dataclass(frozen=True)
+class Policy:
+    deadline: float             # seconds for the whole call, retries included
+    attempt_timeout: float      # seconds for a single attempt
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    hedge_after: float | None = None  # seconds before hedging until enough latencies are observed
+
+
+def _fit(policy: Policy, budget: float | None = REQUEST_BUDGET) -> Policy:
+    """policy with its deadline, attempt timeout and hedge delay cut down to fit in budget."""
+    if budget is None or policy.deadline <= budget:
+        return policy
+    attempt_timeout = min(policy.attempt_timeout, budget)
+    hedge_after = policy.hedge_after and policy.hedge_after * attempt_timeout / policy.attempt_timeout
+    return replace(policy, deadline=budget, attempt_timeout=attempt_timeout, hedge_after=hedge_after)
+
+
+# Budgets per operation. STT uploads a whole recording, so it gets the most room.
+POLICIES: dict[str, Policy] = {op: _fit(policy) for op, policy in {
+    "stt": Policy(deadline=300, attempt_timeout=120, hedge_after=60),
+    "parse": Policy(deadline=120, attempt_timeout=45, hedge_after=20),
+    "audit": Policy(deadline=90, attempt_timeout=30, hedge_after=12),
+    "correct": Policy(deadline=120, attempt_timeout=45, hedge_after=20),
+    "audit_correct": Policy(deadline=120, attempt_timeout=45, hedge_after=20),
+    "svi_guidance": Policy(deadline=90, attempt_timeout=30, hedge_after=15),
+}.items()}
+
+# Longest single HTTP request any op allows; the SDK clients' default timeout
+# for requests made outside call().
+CLIENT_TIMEOUT = max(p.attempt_timeout for p in POLICIES.values())
+
+# Absolute (monotonic) deadlines of the current request and of the running attempt.
+_request_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("request_deadline", default=None)
+_attempt_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("attempt_deadline", default=None)
+
+
+@contextmanager
+def request_budget(seconds: float | None = REQUEST_BUDGET) -> Iterator[None]:
+    """Calls made inside (including from threads started with the context) share one deadline."""
+    if seconds is None:
+        yield
+        return
+    token = _request_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def time_left(default: float = CLIENT_TIMEOUT) -> float:
+    """Seconds left for the running attempt; pass it as the HTTP timeout of the upstream request."""
+    deadline = _attempt_deadline.get()
+    return default if deadline is None else max(0.1, deadline - time.monotonic())
+
+
+class UpstreamUnavailable(Exception):
+    """The call can't succeed in time: breaker open, deadline spent or retries exhausted."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AttemptTimeout(TimeoutError):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+
+class CircuitBreaker:
+    def __init__(self, failures: int = BREAKER_FAILURES, reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.failures_to_open = failures
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self._opened_at >= self.reset_seconds else "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset_seconds:
+                raise UpstreamUnavailable("OpenAI circuit open", retry_after=self.reset_seconds - waited)
+            if self._trial_in_flight:
+                raise UpstreamUnavailable("OpenAI circuit half-open, trial call in flight", retry_after=1.0)
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("OpenAI circuit closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_other(self) -> None:
+        """The call ended in an error that says nothing about the upstream's health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failures_to_open:
+                if self._opened_at is None:
+                    logger.error("OpenAI circuit opened after %d consecutive failures", self._failures)
+                self._opened_at = time.monotonic()
+
+
+breaker = CircuitBreaker()
+
+# ---------------------------------------------------------------------------
+# Latency tracking (for the hedge threshold)
+# ---------------------------------------------------------------------------
+
+_latencies: dict[str, deque] = {}
+_MIN_SAMPLES = 20
+
+
+def _record_latency(op: str, seconds: float) -> None:
+    _latencies.setdefault(op, deque(maxlen=200)).append(seconds)
+
+
+def p95(op: str) -> float | None:
+    samples = sorted(_latencies.get(op, ()))
+    if len(samples) < _MIN_SAMPLES:
+        return None
+    return samples[int(0.95 * (len(samples) - 1))]
+
+
+# ---------------------------------------------------------------------------
+# call()
+# ---------------------------------------------------------------------------
+
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv("OPENAI_CALL_THREADS", 32)), thread_name_prefix="upstream")
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (AttemptTimeout, TimeoutError, ConnectionError)):
+        return True
+    import openai
+
+    if isinstance(exc, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code in _RETRYABLE_STATUS
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _attempt(op: str, fn: Callable[[], T], timeout: float, hedge_after: float | None) -> T:
+    """One attempt, plus a hedged duplicate if it is still running after hedge_after."""
+    started = time.monotonic()
+    # Like asyncio.to_thread, run with the caller's contextvars (LangGraph's stream writer needs them).
+    context = contextvars.copy_context()
+    context.run(_attempt_deadline.set, started + timeout)
+    futures: list[Future] = [_executor.submit(context.copy().run, fn)]
+    can_hedge = hedge_after is not None and hedge_after < timeout
+    while True:
+        limit = hedge_after if can_hedge else timeout
+        done, pending = wait(futures, timeout=max(0.0, limit - (time.monotonic() - started)), return_when=FIRST_COMPLETED)
+        winner = next((f for f in done if f.exception() is None), None)
+        if winner is not None:
+            for f in pending:
+                f.cancel()
+            _record_latency(op, time.monotonic() - started)
+            return winner.result()
+        if done and not pending:
+            raise next(iter(done)).exception()
+        if done:
+            futures = list(pending)  # one request failed; the other may still answer
+            continue
+        if can_hedge:
+            can_hedge = False
+            logger.info("[%s] no response after %.1fs, sending hedged request", op, hedge_after)
+            futures.append(_executor.submit(context.copy().run, fn))
+            continue
+        raise AttemptTimeout(f"{op} attempt timed out after {timeout:.0f}s")
+
+
+def call(op: str, fn: Callable[[], T], policy: Policy | None = None) -> T:
+    """
+    Run fn() (a blocking upstream call) under op's policy. Raises
+    UpstreamUnavailable when the breaker is open, the deadline runs out or
+    retryable failures exhaust the attempts; non-retryable errors (bad
+    request, auth, parsing) propagate unchanged after one attempt.
+    """
+    policy = policy or POLICIES[op]
+    deadline = time.monotonic() + policy.deadline
+    request_deadline = _request_deadline.get()
+    if request_deadline is not None and request_deadline < deadline:
+        deadline = request_deadline
+        if deadline - time.monotonic() < 1:
+            raise UpstreamUnavailable(f"{op}: no time left in this request", retry_after=1.0)
+    breaker.before_call()
+    hedge_after = (p95(op) or policy.hedge_after) if HEDGING_ENABLED else None
+
+    for attempt in range(1, policy.max_attempts + 1):
+        remaining = deadline - time.monotonic()
+        try:
+            result = _attempt(op, fn, min(policy.attempt_timeout, remaining), hedge_after)
+        except Exception as exc:
+            if not _is_retryable(exc):
+                # The request itself was bad: neither an outage nor proof the upstream is healthy.
+                breaker.record_other()
+                raise
+            backoff = random.uniform(0, min(policy.backoff_max, policy.backoff_base * 2 ** (attempt - 1)))
+            backoff = max(backoff, _retry_after(exc) or 0)
+            out_of_time = time.monotonic() + backoff >= deadline
+            logger.warning("[%s] attempt %d/%d failed: %s", op, attempt, policy.max_attempts, exc)
+            if attempt == policy.max_attempts or out_of_time:
+                breaker.record_failure()
+                raise UpstreamUnavailable(
+                    f"{op} failed after {attempt} attempt(s): {exc}", retry_after=_retry_after(exc),
+                ) from exc
+            time.sleep(backoff)
+        else:
+            breaker.record_success()
+            return result
+    raise AssertionError("unreachable")
@@ -1,10 +1,12 @@
 import os
 import secrets
-import uuid
-from fastapi import APIRouter, HTTPException
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
+from app.auth.tokens import current_nurse, issue_token, revoke
+
 load_dotenv()
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -13,8 +15,6 @@ _NURSE_EMAIL = os.getenv("NURSE_EMAIL", "nurse@carebridge.com")
 _NURSE_PASSWORD = os.getenv("NURSE_PASSWORD", "password123")
 _NURSE_NAME = os.getenv("NURSE_NAME", "Demo Nurse")
 
-_tokens: dict[str, dict] = {}
-
 
 class LoginRequest(BaseModel):
     email: str
@@ -28,10 +28,20 @@ async def login(payload: LoginRequest):
     if not (email_match and password_match):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    token = str(uuid.uuid4())
-    _tokens[token] = {"email": _NURSE_EMAIL, "name": _NURSE_NAME}
+    token, claims = issue_token(_NURSE_EMAIL, _NURSE_NAME)
 
     return {
         "token": token,
+        "expires_at": datetime.fromtimestamp(claims["exp"], tz=timezone.utc).isoformat(),
         "nurse": {"name": _NURSE_NAME, "email": _NURSE_EMAIL},
     }
+
+
+@router.get("/me")
+async def me(nurse: dict = Depends(current_nurse)):
+    return {"name": nurse["name"], "email": nurse["sub"]}
+
+
+@router.post("/logout", status_code=204)
+async def logout(nurse: dict = Depends(current_nurse)):
+    await revoke(nurse)
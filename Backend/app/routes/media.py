@@ -1,13 +1,111 @@
-import uuid
-from fastapi import APIRouter, UploadFile, File
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse, ORJSONResponse
+from pydantic import BaseModel, Field
+
+from app.media import store
 
 router = APIRouter(prefix="/media", tags=["media"])
 
+# Largest body accepted by one PUT /uploads/{id}; clients send 1-8 MB chunks.
+_MAX_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+class UploadCreateRequest(BaseModel):
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    size: Optional[int] = Field(default=None, ge=0)
+    sha256: Optional[str] = None
+
+
+def _media_error(exc: store.MediaError) -> HTTPException:
+    if isinstance(exc, store.OffsetMismatch):
+        return HTTPException(status_code=409, detail={"message": str(exc), "offset": exc.offset})
+    return HTTPException(status_code=exc.status_code, detail=str(exc))
 
-@router.post("/upload")
+
+@router.post("/upload", status_code=201)
 async def upload_media(file: UploadFile = File(...)):
-    return {
-        "media_id": str(uuid.uuid4()),
-        "filename": file.filename,
-        "content_type": file.content_type,
-    }
+    """Single-request upload for small files; same store as the resumable flow."""
+    try:
+        record, deduplicated = await asyncio.to_thread(store.put_stream, file.file, file.filename, file.content_type)
+    except store.MediaError as exc:
+        raise _media_error(exc)
+    return {**record, "deduplicated": deduplicated}
+
+
+@router.post("/uploads", status_code=201)
+async def create_upload(payload: UploadCreateRequest):
+    try:
+        created = await asyncio.to_thread(
+            store.create_upload, payload.filename, payload.content_type, payload.size, payload.sha256,
+        )
+    except store.MediaError as exc:
+        raise _media_error(exc)
+    # Already stored: nothing to upload, use media_id directly.
+    return ORJSONResponse(created, status_code=200 if "media_id" in created else 201)
+
+
+@router.get("/uploads/{upload_id}")
+async def get_upload(upload_id: str):
+    try:
+        return await asyncio.to_thread(store.upload_status, upload_id)
+    except store.MediaError as exc:
+        raise _media_error(exc)
+
+
+@router.put("/uploads/{upload_id}")
+async def put_chunk(upload_id: str, request: Request, offset: int = Query(..., ge=0)):
+    """Append the raw request body at `offset`; 409 with the current offset if it doesn't line up."""
+    body = bytearray()
+    async for piece in request.stream():
+        body += piece
+        if len(body) > _MAX_CHUNK_BYTES:
+            raise HTTPException(status_code=413, detail=f"Chunk exceeds {_MAX_CHUNK_BYTES} bytes")
+    try:
+        return await asyncio.to_thread(store.append_chunk, upload_id, offset, bytes(body))
+    except store.MediaError as exc:
+        raise _media_error(exc)
+
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str):
+    try:
+        record, deduplicated = await asyncio.to_thread(store.complete_upload, upload_id)
+    except store.MediaError as exc:
+        raise _media_error(exc)
+    return {**record, "deduplicated": deduplicated}
+
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+async def abort_upload(upload_id: str):
+    try:
+        await asyncio.to_thread(store.abort_upload, upload_id)
+    except store.MediaError as exc:
+        raise _media_error(exc)
+
+
+@router.get("/{media_id}/info")
+async def get_media_info(media_id: str):
+    try:
+        return await asyncio.to_thread(store.get_media, media_id)
+    except store.MediaError as exc:
+        raise _media_error(exc)
+
+
+@router.get("/{media_id}")
+async def get_media(media_id: str):
+    """Stream a stored file (Range requests supported)."""
+    try:
+        record = await asyncio.to_thread(store.get_media, media_id)
+        path = store.media_path(media_id)
+    except store.MediaError as exc:
+        raise _media_error(exc)
+    return FileResponse(
+        path,
+        media_type=record["content_type"] or "application/octet-stream",
+        filename=record["filename"],
+        # Content-addressed: the bytes behind a media_id never change.
+        headers={"Cache-Control": "private, max-age=31536000, immutable", "ETag": f'"{media_id}"'},
+    )
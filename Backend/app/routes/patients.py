@@ -1,10 +1,11 @@
 import json
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from app.db import get_db
-from app.schemas.patient import PatientCreate, PatientOut
+from app.schemas.patient import PatientBatchCreate, PatientCreate, PatientOut, patient_out_from_row
 
 router = APIRouter(prefix="/api/v1/patients", tags=["patients"])
 
@@ -14,7 +15,7 @@ async def create_patient(payload: PatientCreate, db: AsyncSession = Depends(get_
         text("""
             INSERT INTO patients (nurse, patient_info, background, current_assessment, vital_signs)
             VALUES (CAST(:nurse AS JSONB), CAST(:patient_info AS JSONB), CAST(:background AS JSONB), CAST(:current_assessment AS JSONB), CAST(:vital_signs AS JSONB))
-            RETURNING id, nurse, patient_info, background, current_assessment, vital_signs
+            RETURNING id, nurse, patient_info, background, current_assessment, vital_signs, version
         """),
         {
             "nurse": json.dumps(payload.nurse.model_dump()),
@@ -27,11 +28,35 @@ async def create_patient(payload: PatientCreate, db: AsyncSession = Depends(get_
     row = result.mappings().one()
     await db.commit()
 
-    return PatientOut(
-        id=int(row["id"]),
-        nurse=row["nurse"],
-        patient_info=row["patient_info"],
-        background=row["background"],
-        current_assessment=row["current_assessment"],
-        vital_signs=row["vital_signs"],
+    return ORJSONResponse(patient_out_from_row(row))
+
+
+@router.post(":batchCreate", response_model=list[PatientOut])
+async def batch_create_patients(payload: PatientBatchCreate, db: AsyncSession = Depends(get_db)):
+    """Import many patient records with one INSERT ... SELECT over a JSONB array."""
+    records = [
+        {
+            "nurse": p.nurse.model_dump(),
+            "patient_info": p.patient_info.model_dump(),
+            "background": p.background.model_dump(),
+            "current_assessment": p.current_assessment.model_dump(),
+            "vital_signs": p.vital_signs.model_dump(),
+            "medications": [m.model_dump() for m in p.medications] if p.medications else [],
+        }
+        for p in payload.patients
+    ]
+    result = await db.execute(
+        text("""
+            INSERT INTO patients (nurse, patient_info, background, current_assessment, vital_signs, medications)
+            SELECT r->'nurse', r->'patient_info', r->'background', r->'current_assessment', r->'vital_signs', r->'medications'
+            FROM jsonb_array_elements(CAST(:records AS JSONB)) WITH ORDINALITY AS t(r, ord)
+            ORDER BY ord
+            RETURNING id, nurse, patient_info, background, current_assessment, vital_signs, medications, version
+        """),
+        {"records": json.dumps(records)},
     )
+    # Ids come from the sequence in insertion order, so sorting restores input order.
+    rows = sorted(result.mappings().all(), key=lambda row: row["id"])
+    await db.commit()
+
+    return ORJSONResponse([patient_out_from_row(row) for row in rows])
@@ -1,16 +1,24 @@
 import asyncio
 import json
 import logging
-from datetime import date
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+import os
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, List
+from fastapi import APIRouter, Body, Depends, File, Form, Header, HTTPException, Query, UploadFile
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from app.db import get_db
-from app.schemas.patient import PatientCreate, PatientOut
+from app import admission, subsystems
+from app.db import AsyncSessionLocal, get_db, lock_engine
+from app.media import store as media_store
+from app.resilience import UpstreamUnavailable
+from app.schemas.patient import PatientCreate, PatientOut, patient_out_from_row
+from app.schemas.form_patch import parse_form_patch
+from app.routes.svi import build_svi_record, store_svi_record
 from app.stt.transcriber import transcribe_audio
-from app.RAG import compiled_graph
-from app.routes.svi import SVI_AVAILABLE, extract_zip_from_text, zip_to_county, get_info_from_cdcsvi
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/sessions", tags=["sessions"])
@@ -36,15 +44,18 @@ def _count_missing(pi: dict, bg: dict, vs: dict, ca: dict, nurse: dict) -> int:
     return missing
 
 
-def _count_follow_ups(pi: dict) -> int:
+def _count_follow_ups(stored_svi: dict | None, pi: dict, svi) -> int:
     """Count SVI follow-up questions triggered by the patient's geo_location."""
-    if not SVI_AVAILABLE or not get_info_from_cdcsvi:
+    if stored_svi:
+        return len(stored_svi.get("questions") or [])
+    # Rows resolved before patients.svi existed: compute from geo_location.
+    if svi is None:
         return 0
     geo = pi.get("geo_location")
     if not geo:
         return 0
     try:
-        flags = get_info_from_cdcsvi(geo)
+        flags = svi.get_info_from_cdcsvi(geo)
         if "error" in flags:
             return 0
         count = 0
@@ -151,6 +162,37 @@ def _llm_form_to_db_parts(extracted_form: dict) -> dict:
     }
 
 
+# Placeholder form written for a freshly created session until STT/RAG fills it in.
+_BLANK_SESSION = {
+    "nurse": '{"name":"Unknown"}',
+    "patient_info": '{"name":"Unknown","DOB":0,"room_num":0,"allergies":"None","code_status":"Full","reason_for_admission":null,"geo_location":null}',
+    "background": '{"past_medical_history":null,"hospital_day":null,"procedures":null}',
+    "current_assessment": '{"pain_level_0_10":null,"additional_info":null}',
+    "vital_signs": '{"temp_c":null,"hr_bpm":null,"rr_bpm":null,"bp_sys":null,"bp_dia":null}',
+    "medications": '[]',
+}
+
+_MAX_BATCH = 100
+
+# /sessions/changes: how far each request looks back past its watermark (for
+# transactions that committed after a later one), how long deletions are
+# remembered, and the page size.
+_SYNC_OVERLAP = timedelta(seconds=float(os.getenv("SESSIONS_SYNC_OVERLAP_SECONDS", 5)))
+_TOMBSTONE_RETENTION = timedelta(days=int(os.getenv("SESSIONS_TOMBSTONE_DAYS", 30)))
+_MAX_CHANGES = 500
+
+# Keeps the stored SVI record while geo_location is unchanged, clears it otherwise.
+_SVI_IF_SAME_LOCATION = "CASE WHEN svi->>'location' IS NOT DISTINCT FROM CAST(:geo AS TEXT) THEN svi ELSE NULL END"
+
+
+class BatchCreateRequest(BaseModel):
+    count: int = Field(ge=1, le=_MAX_BATCH)
+
+
+class BatchIdsRequest(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=_MAX_BATCH)
+
+
 @router.post("", status_code=201)
 async def create_session(db: AsyncSession = Depends(get_db)):
     result = await db.execute(
@@ -170,20 +212,40 @@ async def create_session(db: AsyncSession = Depends(get_db)):
             )
             RETURNING id
         """),
-        {
-            "nurse": '{"name":"Unknown"}',
-            "patient_info": '{"name":"Unknown","DOB":0,"room_num":0,"allergies":"None","code_status":"Full","reason_for_admission":null,"geo_location":null}',
-            "background": '{"past_medical_history":null,"hospital_day":null,"procedures":null}',
-            "current_assessment": '{"pain_level_0_10":null,"additional_info":null}',
-            "vital_signs": '{"temp_c":null,"hr_bpm":null,"rr_bpm":null,"bp_sys":null,"bp_dia":null}',
-            "medications": '[]',
-        },
+        _BLANK_SESSION,
     )
     row = result.mappings().one()
     await db.commit()
     return {"id": int(row["id"])}
 
 
+@router.post(":batchCreate", status_code=201)
+async def batch_create_sessions(payload: BatchCreateRequest, db: AsyncSession = Depends(get_db)):
+    """Create `count` blank sessions with a single INSERT ... SELECT."""
+    result = await db.execute(
+        text("""
+            INSERT INTO patients (
+                nurse, patient_info, background, current_assessment, vital_signs,
+                medications, status, progress
+            )
+            SELECT CAST(:nurse AS JSONB),
+                   CAST(:patient_info AS JSONB),
+                   CAST(:background AS JSONB),
+                   CAST(:current_assessment AS JSONB),
+                   CAST(:vital_signs AS JSONB),
+                   CAST(:medications AS JSONB),
+                   'pending',
+                   0
+            FROM generate_series(1, :count)
+            RETURNING id
+        """),
+        {**_BLANK_SESSION, "count": payload.count},
+    )
+    ids = sorted(int(row["id"]) for row in result.mappings().all())
+    await db.commit()
+    return {"ids": ids}
+
+
 async def _fetch_patient(session_id: int, db: AsyncSession):
     result = await db.execute(
         text("SELECT id FROM patients WHERE id = :id"),
@@ -195,33 +257,30 @@ async def _fetch_patient(session_id: int, db: AsyncSession):
     return row
 
 
-@router.get("")
-async def list_sessions(
-    limit: int = Query(default=20, ge=1, le=100),
-    offset: int = Query(default=0, ge=0),
-    db: AsyncSession = Depends(get_db),
-):
-    result = await db.execute(
-        text("""
-            SELECT id,
-                   patient_info->>'name' AS name,
-                   (patient_info->>'room_num')::int AS room_num,
-                   created_at,
-                   updated_at,
-                   status,
-                   progress,
-                   patient_info,
-                   background,
-                   vital_signs,
-                   current_assessment,
-                   nurse
-            FROM patients
-            ORDER BY updated_at DESC
-            LIMIT :limit OFFSET :offset
-        """),
-        {"limit": limit, "offset": offset},
-    )
-    rows = result.mappings().all()
+# Columns behind a dashboard row (see _session_summaries).
+_SUMMARY_COLUMNS = """
+    id,
+    patient_info->>'name' AS name,
+    (patient_info->>'room_num')::int AS room_num,
+    created_at,
+    updated_at,
+    status,
+    progress,
+    patient_info,
+    background,
+    vital_signs,
+    current_assessment,
+    nurse,
+    svi
+"""
+
+
+async def _session_summaries(rows) -> list[dict]:
+    # Follow-ups come from the stored SVI record; only load the SVI table when
+    # some row has a location that hasn't been resolved yet.
+    svi = None
+    if any(not row["svi"] and (row["patient_info"] or {}).get("geo_location") for row in rows):
+        svi = await subsystems.aget("svi")
     return [
         {
             "id": int(row["id"]),
@@ -239,12 +298,195 @@ async def list_sessions(
                 row["nurse"] or {},
             ),
             "uncertain": 0,
-            "follow_ups": _count_follow_ups(row["patient_info"] or {}),
+            "follow_ups": _count_follow_ups(row["svi"], row["patient_info"] or {}, svi),
         }
         for row in rows
     ]
 
 
+@router.get("")
+async def list_sessions(
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await db.execute(
+        text(f"""
+            SELECT {_SUMMARY_COLUMNS}
+            FROM patients
+            ORDER BY updated_at DESC
+            LIMIT :limit OFFSET :offset
+        """),
+        {"limit": limit, "offset": offset},
+    )
+    return ORJSONResponse(await _session_summaries(result.mappings().all()))
+
+
+@router.get("/changes")
+async def session_changes(
+    since: datetime | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=_MAX_CHANGES, ge=1, le=_MAX_CHANGES),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delta sync for the dashboard. Returns the sessions changed and the ids
+    deleted since the `since` watermark, plus the watermark to send next
+    time. Without `since` only a watermark is returned: take it before the
+    first full GET /sessions, then poll with it.
+
+    The first page looks back _SYNC_OVERLAP further than `since`, so a
+    transaction that committed late still shows up; clients apply results
+    by id, so the few repeats are harmless. When more than `limit` sessions
+    changed, has_more is true and `cursor` marks the last session sent:
+    ask again with the same `since` and that cursor for the next page
+    (keyset on updated_at, id, so a page never repeats however many rows
+    share a timestamp). The watermark only moves on the last page.
+    A watermark older than the tombstone retention gets 410: reload the list.
+    """
+    now = (await db.execute(text("SELECT now()"))).scalar_one()
+    if since is None:
+        return ORJSONResponse({"sessions": [], "deleted": [], "watermark": now, "has_more": False, "cursor": None})
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if since < now - _TOMBSTONE_RETENTION:
+        raise HTTPException(status_code=410, detail="Watermark is older than the change history; reload the session list")
+
+    after = since - _SYNC_OVERLAP
+    if cursor is None:
+        where, params = "updated_at > :after", {"after": after}
+    else:
+        try:
+            cursor_at, cursor_id = cursor.rsplit(",", 1)
+            params = {"cursor_at": datetime.fromisoformat(cursor_at), "cursor_id": int(cursor_id)}
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Malformed cursor")
+        where = "(updated_at, id) > (:cursor_at, :cursor_id)"
+    result = await db.execute(
+        text(f"""
+            SELECT {_SUMMARY_COLUMNS}
+            FROM patients
+            WHERE {where}
+            ORDER BY updated_at, id
+            LIMIT :limit
+        """),
+        {**params, "limit": limit + 1},
+    )
+    rows = result.mappings().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    deleted = []
+    if cursor is None:  # later pages of the same sync would only repeat them
+        tombstones = await db.execute(
+            text("SELECT id, deleted_at FROM session_tombstones WHERE deleted_at > :after ORDER BY deleted_at"),
+            {"after": after},
+        )
+        deleted = [{"id": int(r["id"]), "deleted_at": r["deleted_at"]} for r in tombstones.mappings().all()]
+    return ORJSONResponse({
+        "sessions": await _session_summaries(rows),
+        "deleted": deleted,
+        "watermark": since if has_more else now,
+        "has_more": has_more,
+        "cursor": f"{rows[-1]['updated_at'].isoformat()},{rows[-1]['id']}" if has_more else None,
+    })
+
+
+async def _record_tombstones(session_ids: list[int], db: AsyncSession) -> None:
+    """Remember deletions for /sessions/changes; drops tombstones past retention."""
+    await db.execute(
+        text("""
+            INSERT INTO session_tombstones (id)
+            SELECT unnest(CAST(:ids AS BIGINT[]))
+            ON CONFLICT (id) DO UPDATE SET deleted_at = now()
+        """),
+        {"ids": session_ids},
+    )
+    await db.execute(
+        text("DELETE FROM session_tombstones WHERE deleted_at < now() - make_interval(secs => :secs)"),
+        {"secs": _TOMBSTONE_RETENTION.total_seconds()},
+    )
+
+
+async def _mark_error(session_id: int, db: AsyncSession) -> None:
+    await db.execute(
+        text("UPDATE patients SET status = 'error', progress = 0, updated_at = now() WHERE id = :id"),
+        {"id": session_id},
+    )
+    await db.commit()
+
+
+def _graph_thread(session_id: int, media_id: str, topology: str = "three_node") -> str:
+    """
+    Checkpoint thread for one recording of a session; a new recording starts
+    a new thread. So does a change of RAG_TOPOLOGY: a checkpoint only
+    resumes in the graph that wrote it.
+    """
+    thread = f"session-{session_id}:{media_id}"
+    return thread if topology == "three_node" else f"{thread}:{topology}"
+
+
+async def _delete_graph_threads(session_ids: list[int], db: AsyncSession) -> None:
+    """Drop leftover checkpoints of deleted sessions (runs that failed and were never retried)."""
+    patterns = [_graph_thread(sid, "%") for sid in session_ids]
+    for table in ("graph_checkpoint_writes", "graph_checkpoints"):
+        await db.execute(text(f"DELETE FROM {table} WHERE thread_id LIKE ANY(:patterns)"), {"patterns": patterns})
+
+
+# Seconds a client is told to wait before retrying a recording whose run is still going.
+_RUN_IN_PROGRESS_RETRY_AFTER = 10
+
+
+@asynccontextmanager
+async def _run_lock(thread_id: str, media_id: str) -> AsyncIterator[None]:
+    """
+    Hold a Postgres advisory lock on a recording's checkpoint thread for its
+    whole run. A retry sent while the first run is still going (the client
+    retries on network errors) gets 409 + Retry-After instead of running the
+    graph on the same thread at the same time. The lock belongs to its
+    connection, so a worker that dies releases it.
+    """
+    async with lock_engine.connect() as conn:
+        locked = await conn.scalar(
+            text("SELECT pg_try_advisory_lock(hashtextextended(:thread_id, 0))"), {"thread_id": thread_id},
+        )
+        await conn.commit()
+        if not locked:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "This recording is already being processed", "media_id": media_id},
+                headers={"Retry-After": str(_RUN_IN_PROGRESS_RETRY_AFTER)},
+            )
+        try:
+            yield
+        finally:
+            await conn.execute(
+                text("SELECT pg_advisory_unlock(hashtextextended(:thread_id, 0))"), {"thread_id": thread_id},
+            )
+            await conn.commit()
+
+
+def _raise_upstream(exc: Exception, message: str, media_id: str):
+    """
+    429 + Retry-After when the instance is at capacity, 503 + Retry-After
+    when OpenAI is down or too slow (either way the client can retry with
+    media_id), else 500.
+    """
+    if isinstance(exc, admission.Overloaded):
+        raise HTTPException(
+            status_code=429,
+            detail={"message": f"{message}: server busy", "reason": str(exc), "media_id": media_id},
+            headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+        )
+    if isinstance(exc, UpstreamUnavailable):
+        retry_after = max(1, round(exc.retry_after or 30))
+        raise HTTPException(
+            status_code=503,
+            detail={"message": f"{message}: speech/LLM service unavailable", "reason": str(exc), "media_id": media_id},
+            headers={"Retry-After": str(retry_after)},
+        )
+    raise HTTPException(status_code=500, detail=message)
+
+
 @router.post("/{session_id}/start")
 async def start_recording(session_id: int, db: AsyncSession = Depends(get_db)):
     await _fetch_patient(session_id, db)
@@ -259,50 +501,202 @@ async def start_recording(session_id: int, db: AsyncSession = Depends(get_db)):
 @router.post("/{session_id}/stop")
 async def stop_recording(
     session_id: int,
-    audio_file: UploadFile = File(...),
+    audio_file: UploadFile | None = File(None),
+    media_id: str | None = Form(None),
+    stream: bool = Query(default=False),
     db: AsyncSession = Depends(get_db),
 ):
+    """
+    Transcribe and process a recording. Send either `media_id` (from
+    /media/upload or a completed resumable upload) or the audio itself as
+    `audio_file`, which is stored first so a retry can pass its media_id.
+
+    With ?stream=true the response is NDJSON: progress events, then form
+    fields as the extraction writes them (status "unverified") and the
+    auditor's verdict after each pass (see app/RAG/field_events.py), ending
+    with a "complete" event carrying the usual response body or an "error"
+    event. Processing carries on if the client disconnects. While an
+    earlier request for the same recording is still running the answer is
+    409 + Retry-After.
+    """
+    if (audio_file is None) == (media_id is None):
+        raise HTTPException(status_code=422, detail="Provide exactly one of audio_file or media_id")
     await _fetch_patient(session_id, db)
-    await db.execute(
-        text("UPDATE patients SET status = 'processing', progress = 25, updated_at = now() WHERE id = :id"),
-        {"id": session_id},
-    )
-    await db.commit()
-    logger.info("[session %d] stop_recording: received audio file '%s'", session_id, audio_file.filename)
 
-    audio_bytes = await audio_file.read()
-    logger.info("[session %d] stop_recording: audio read (%d bytes) — starting transcription", session_id, len(audio_bytes))
+    if audio_file is not None:
+        try:
+            media, _ = await asyncio.to_thread(
+                media_store.put_stream, audio_file.file, audio_file.filename, audio_file.content_type,
+            )
+        except media_store.MediaError as exc:
+            raise HTTPException(status_code=exc.status_code, detail=str(exc))
+        media_id = media["media_id"]
+
+    if stream:
+        return StreamingResponse(_stream_recording(session_id, media_id), media_type="application/x-ndjson")
+    return await _process_recording(session_id, media_id, db, _no_events)
+
+
+def _no_events(event: dict) -> None:
+    pass
+
 
+# Streamed runs in flight. The event loop only keeps weak references to tasks,
+# so without this a run whose client went away could be garbage-collected
+# mid-way, leaving its checkpoint and advisory lock behind.
+_running: set[asyncio.Task] = set()
+
+
+async def _stream_recording(session_id: int, media_id: str):
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def _run() -> dict:
+        # Own DB session: the request's closes when the client goes away, the run doesn't.
+        async with AsyncSessionLocal() as db:
+            return await _process_recording(session_id, media_id, db, events.put_nowait)
+
+    task = asyncio.create_task(_run())
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    task.add_done_callback(lambda _: events.put_nowait(None))
+    while (event := await events.get()) is not None:
+        yield json.dumps(event) + "\n"
     try:
-        transcript = await asyncio.to_thread(transcribe_audio, audio_bytes, filename=audio_file.filename or "audio.m4a")
-        logger.info("[session %d] stop_recording: transcription complete (%d chars)", session_id, len(transcript))
-    except Exception as e:
-        logger.error("[session %d] stop_recording: transcription failed — %s", session_id, e)
-        await db.execute(
-            text("UPDATE patients SET status = 'error', progress = 0, updated_at = now() WHERE id = :id"),
-            {"id": session_id},
-        )
-        await db.commit()
-        raise HTTPException(status_code=500, detail="Transcription failed")
+        yield json.dumps({"event": "complete", **task.result()}) + "\n"
+    except HTTPException as exc:
+        yield json.dumps({
+            "event": "error",
+            "status_code": exc.status_code,
+            "detail": exc.detail,
+            "retry_after": (exc.headers or {}).get("Retry-After"),
+        }) + "\n"
+    except Exception:
+        # The response has already started, so the failure can only be reported in the stream.
+        logger.exception("[session %d] stop_recording: streamed run failed", session_id)
+        yield json.dumps({
+            "event": "error",
+            "status_code": 500,
+            "detail": "Processing failed",
+            "retry_after": None,
+        }) + "\n"
+
+
+async def _process_recording(
+    session_id: int,
+    media_id: str,
+    db: AsyncSession,
+    emit: Callable[[dict], None],
+) -> dict:
+    """
+    STT + RAG pipeline behind /stop; emit receives the streamed events.
+    One run per recording at a time (see _run_lock). Transcription and the
+    graph run each wait for an admission slot (app/admission.py); a full
+    queue answers 429.
+    """
+    # Don't hold a pooled connection while queued for a slot below.
+    await db.commit()
+
+    compiled_graph = await subsystems.aget("rag_graph")
+    thread_id = _graph_thread(session_id, media_id, compiled_graph.name)
+    async with _run_lock(thread_id, media_id):
+        return await _run_recording(session_id, media_id, compiled_graph, thread_id, db, emit)
+
+
+async def _run_recording(
+    session_id: int,
+    media_id: str,
+    compiled_graph,
+    thread_id: str,
+    db: AsyncSession,
+    emit: Callable[[dict], None],
+) -> dict:
+    from langgraph.graph import START
+    from app.RAG.field_events import FieldTracker
+
+    # A retry of a run that was cut off resumes from its last graph checkpoint,
+    # which also holds the transcript, so neither STT nor finished LLM calls
+    # repeat, and the audio is only read when there is no transcript yet (a
+    # retry that lands on another instance may not have the media).
+    graph_config = {"configurable": {"thread_id": thread_id}}
+    checkpoint = await compiled_graph.aget_state(graph_config)
+    resuming = bool(checkpoint.values.get("transcript"))
+
+    if resuming:
+        transcript = checkpoint.values["transcript"]
+        logger.info("[session %d] stop_recording: resuming %s from checkpoint (next: %s)",
+                    session_id, media_id, ", ".join(checkpoint.next) or "done")
+    else:
+        try:
+            audio_bytes, media = await asyncio.to_thread(media_store.read_media, media_id)
+        except media_store.MediaError as exc:
+            raise HTTPException(status_code=exc.status_code, detail=str(exc))
+        try:
+            async with admission.slot("stt"):
+                await db.execute(
+                    text("UPDATE patients SET status = 'processing', progress = 25, updated_at = now() WHERE id = :id"),
+                    {"id": session_id},
+                )
+                await db.commit()
+                emit({"event": "progress", "stage": "transcribe", "progress": 25})
+                logger.info("[session %d] stop_recording: audio %s read (%d bytes) — starting transcription",
+                            session_id, media_id, len(audio_bytes))
+
+                try:
+                    transcript = await asyncio.to_thread(
+                        transcribe_audio, audio_bytes, filename=media["filename"] or "audio.m4a",
+                    )
+                    logger.info("[session %d] stop_recording: transcription complete (%d chars)", session_id, len(transcript))
+                except Exception as e:
+                    logger.error("[session %d] stop_recording: transcription failed — %s", session_id, e)
+                    await _mark_error(session_id, db)
+                    _raise_upstream(e, "Transcription failed", media_id)
+        except admission.Overloaded as e:
+            # Turned away before anything started; the session is left as it was.
+            _raise_upstream(e, "Transcription not started", media_id)
+        # Checkpoint the transcript now, so a run turned away by the llm gate
+        # (or cut off before its first node) resumes without repeating STT.
+        await compiled_graph.aupdate_state(graph_config, {"transcript": transcript}, as_node=START)
 
     await db.execute(
         text("UPDATE patients SET transcript = :transcript, status = 'processing', progress = 75, updated_at = now() WHERE id = :id"),
         {"id": session_id, "transcript": transcript},
     )
     await db.commit()
+    emit({"event": "progress", "stage": "analyze", "progress": 75})
     logger.info("[session %d] stop_recording: starting RAG pipeline", session_id)
 
+    tracker = FieldTracker()
+    # Only ask the extraction to stream when someone is listening.
+    graph_config["configurable"]["stream_fields"] = emit is not _no_events
     try:
-        result = await compiled_graph.ainvoke({"transcript": transcript})
-        logger.info("[session %d] stop_recording: RAG pipeline complete", session_id)
+        async with admission.slot("llm"):
+            if resuming:
+                for event in tracker.resume(checkpoint.values):
+                    emit(event)
+            result = checkpoint.values
+            # A finished graph whose result just wasn't saved has nothing left to run.
+            if not resuming or checkpoint.next:
+                async for mode, chunk in compiled_graph.astream(
+                    None, graph_config, stream_mode=["custom", "updates", "values"],
+                ):
+                    if mode == "values":
+                        result = chunk
+                    elif mode == "custom":
+                        if event := tracker.field(chunk["path"], chunk["value"]):
+                            emit(event)
+                    else:
+                        for node, update in chunk.items():
+                            for event in tracker.node_update(node, update or {}):
+                                emit(event)
+        logger.info("[session %d] stop_recording: RAG pipeline complete (%d correction(s), %s)",
+                    session_id, result.get("loop_count", 0), result.get("termination_reason"))
+    except admission.Overloaded as e:
+        # Turned away before the graph ran; as for STT, the session is left as it was for the retry.
+        _raise_upstream(e, "Processing not started", media_id)
     except Exception as e:
         logger.error("[session %d] stop_recording: RAG pipeline failed — %s", session_id, e)
-        await db.execute(
-            text("UPDATE patients SET status = 'error', progress = 0, updated_at = now() WHERE id = :id"),
-            {"id": session_id},
-        )
-        await db.commit()
-        raise HTTPException(status_code=500, detail="Processing failed")
+        await _mark_error(session_id, db)
+        _raise_upstream(e, "Processing failed", media_id)
 
     await db.execute(
         text("UPDATE patients SET status = 'complete', progress = 100, updated_at = now() WHERE id = :id"),
@@ -310,11 +704,14 @@ async def stop_recording(
     )
     await db.commit()
 
+    emit({"event": "progress", "stage": "prepare", "progress": 100})
+
     # Persist the extracted form fields to DB so GET /form returns them immediately.
     extracted_form = result["extracted_form"]
+    form_version: int | None = None
     try:
         db_parts = _llm_form_to_db_parts(extracted_form)
-        await db.execute(
+        saved = await db.execute(
             text("""
                 UPDATE patients
                 SET nurse              = CAST(:nurse AS JSONB),
@@ -323,8 +720,10 @@ async def stop_recording(
                     current_assessment = CAST(:current_assessment AS JSONB),
                     vital_signs        = CAST(:vital_signs AS JSONB),
                     medications        = CAST(:medications AS JSONB),
+                    version            = version + 1,
                     updated_at         = now()
                 WHERE id = :id
+                RETURNING version
             """),
             {
                 "id": session_id,
@@ -336,6 +735,7 @@ async def stop_recording(
                 "medications": json.dumps(db_parts["medications"]),
             },
         )
+        form_version = saved.scalar_one()
         await db.commit()
         logger.info("[session %d] stop_recording: extracted form saved to DB", session_id)
     except Exception as e:
@@ -343,11 +743,13 @@ async def stop_recording(
 
     # Resolve ZIP code from transcript → county/state and write to geo_location.
     geo_location: str | None = None
-    if SVI_AVAILABLE and extract_zip_from_text and zip_to_county:
+    svi = await subsystems.aget("svi")
+    if svi is not None:
         try:
-            zip_code = extract_zip_from_text(transcript)
+            zip_code = svi.extract_zip_from_text(transcript)
             if zip_code:
-                county_info = await asyncio.to_thread(zip_to_county, zip_code)
+                async with admission.slot("geocode"):
+                    county_info = await asyncio.to_thread(svi.zip_to_county, zip_code)
                 if county_info and county_info.get("county_name") and county_info.get("state_name"):
                     geo_location = f'{county_info["county_name"]}, {county_info["state_name"]}'
                     # Inject into extracted_form so the frontend sessionStorage gets it.
@@ -355,24 +757,42 @@ async def stop_recording(
                     if isinstance(pi, dict):
                         pi["geolocation"] = geo_location
                     # Persist to DB so future GET /form calls also return it.
-                    await db.execute(
+                    geo_saved = await db.execute(
                         text("""
                             UPDATE patients
                             SET patient_info = jsonb_set(patient_info, '{geo_location}', :geo::jsonb),
+                                version = version + 1,
                                 updated_at = now()
-                            WHERE id = :id
+                            WHERE id = :id AND version = :version
+                            RETURNING version
                         """),
-                        {"id": session_id, "geo": json.dumps(geo_location)},
+                        {"id": session_id, "geo": json.dumps(geo_location), "version": form_version},
                     )
+                    form_version = geo_saved.scalar_one_or_none()
                     await db.commit()
                     logger.info("[session %d] geo_location set to: %s", session_id, geo_location)
         except Exception as e:
             logger.warning("[session %d] geo_location lookup failed: %s", session_id, e)
 
+    # Resolve SVI once for the final location so /svi and the dashboard read it from the row.
+    try:
+        final_geo = (extracted_form.get("patient_information") or {}).get("geolocation")
+        if form_version is not None:  # None: the form wasn't saved, or was edited since
+            await store_svi_record(session_id, await build_svi_record(final_geo), form_version, db)
+    except Exception as e:
+        logger.warning("[session %d] failed to store SVI record: %s", session_id, e)
+
+    try:
+        await compiled_graph.checkpointer.adelete_thread(thread_id)
+        await compiled_graph.checkpointer.aprune()
+    except Exception as e:
+        logger.warning("[session %d] failed to clear graph checkpoints: %s", session_id, e)
+
     return {
         "id": session_id,
         "status": "complete",
         "progress": 100,
+        "media_id": media_id,
         "transcript": transcript,
         "form": extracted_form,
     }
@@ -421,7 +841,7 @@ async def get_transcript(session_id: int, db: AsyncSession = Depends(get_db)):
 async def get_form(session_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(
         text("""
-            SELECT id, nurse, patient_info, background, current_assessment, vital_signs, medications
+            SELECT id, nurse, patient_info, background, current_assessment, vital_signs, medications, version
             FROM patients
             WHERE id = :id
         """),
@@ -430,15 +850,7 @@ async def get_form(session_id: int, db: AsyncSession = Depends(get_db)):
     row = result.mappings().one_or_none()
     if row is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    return PatientOut(
-        id=int(row["id"]),
-        nurse=row["nurse"],
-        patient_info=row["patient_info"],
-        background=row["background"],
-        current_assessment=row["current_assessment"],
-        vital_signs=row["vital_signs"],
-        medications=row["medications"] or [],
-    )
+    return ORJSONResponse(patient_out_from_row(row))
 
 
 @router.put("/{session_id}/form", response_model=PatientOut)
@@ -449,7 +861,7 @@ async def update_form(
 ):
     medications_data = [m.model_dump() for m in payload.medications] if payload.medications else []
     result = await db.execute(
-        text("""
+        text(f"""
             UPDATE patients
             SET nurse              = CAST(:nurse AS JSONB),
                 patient_info       = CAST(:patient_info AS JSONB),
@@ -457,9 +869,12 @@ async def update_form(
                 current_assessment = CAST(:current_assessment AS JSONB),
                 vital_signs        = CAST(:vital_signs AS JSONB),
                 medications        = CAST(:medications AS JSONB),
+                svi                = {_SVI_IF_SAME_LOCATION},
+                version            = version + 1,
                 updated_at         = now()
             WHERE id = :id
-            RETURNING id, nurse, patient_info, background, current_assessment, vital_signs, medications
+            RETURNING id, nurse, patient_info, background, current_assessment, vital_signs, medications, version,
+                      svi IS NULL AS svi_stale
         """),
         {
             "id": session_id,
@@ -469,21 +884,110 @@ async def update_form(
             "current_assessment": json.dumps(payload.current_assessment.model_dump()),
             "vital_signs": json.dumps(payload.vital_signs.model_dump()),
             "medications": json.dumps(medications_data),
+            "geo": payload.patient_info.geo_location,
         },
     )
     row = result.mappings().one_or_none()
     if row is None:
         raise HTTPException(status_code=404, detail="Session not found")
     await db.commit()
-    return PatientOut(
-        id=int(row["id"]),
-        nurse=row["nurse"],
-        patient_info=row["patient_info"],
-        background=row["background"],
-        current_assessment=row["current_assessment"],
-        vital_signs=row["vital_signs"],
-        medications=row["medications"] or [],
+    if row["svi_stale"] and payload.patient_info.geo_location:
+        await store_svi_record(
+            session_id, await build_svi_record(payload.patient_info.geo_location), row["version"], db,
+        )
+    return ORJSONResponse(patient_out_from_row(row))
+
+
+def _parse_if_match(if_match: str | None) -> int | None:
+    if if_match is None:
+        return None
+    try:
+        return int(if_match.removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be a form version number")
+
+
+@router.patch("/{session_id}/form")
+async def patch_form(
+    session_id: int,
+    patch: dict[str, Any] | list[dict[str, Any]] = Body(...),
+    if_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Partially update the form. Accepts a merge patch ({"vital_signs": {"hr_bpm": 88}})
+    or a JSON Patch ([{"op": "replace", "path": "/vital_signs/hr_bpm", "value": 88}]).
+    Only the touched fields are validated and written (via jsonb_set); the
+    response carries just those fields plus the new form version. Send the
+    version as If-Match to reject edits made against a stale form (412).
+    """
+    try:
+        replacements, updates = parse_form_patch(patch)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    expected_version = _parse_if_match(if_match)
+    params: dict[str, Any] = {"id": session_id}
+    assignments = []
+
+    # Section and field names come from the schema whitelist in form_patch, so
+    # it is safe to inline them; values are always bound parameters.
+    for section, value in replacements.items():
+        key = f"v{len(params)}"
+        params[key] = json.dumps(value)
+        assignments.append(f"{section} = CAST(:{key} AS JSONB)")
+    for section, fields in updates.items():
+        expr = section
+        for field, value in fields.items():
+            key = f"v{len(params)}"
+            params[key] = json.dumps(value)
+            expr = f"jsonb_set({expr}, '{{{field}}}', CAST(:{key} AS JSONB))"
+        assignments.append(f"{section} = {expr}")
+
+    # A geo_location edit invalidates the stored SVI record; it is recomputed below.
+    patched_info = replacements.get("patient_info") or updates.get("patient_info") or {}
+    geo_touched = "geo_location" in patched_info
+    new_geo = patched_info.get("geo_location")
+    if geo_touched:
+        params["geo"] = new_geo
+        assignments.append(f"svi = {_SVI_IF_SAME_LOCATION}")
+
+    if not assignments:
+        result = await db.execute(text("SELECT version FROM patients WHERE id = :id"), params)
+        row = result.mappings().one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return {"id": session_id, "version": row["version"], "changed": {}}
+
+    version_filter = ""
+    if expected_version is not None:
+        params["expected_version"] = expected_version
+        version_filter = " AND version = :expected_version"
+
+    result = await db.execute(
+        text(f"""
+            UPDATE patients
+            SET {", ".join(assignments)},
+                version    = version + 1,
+                updated_at = now()
+            WHERE id = :id{version_filter}
+            RETURNING version, svi IS NULL AS svi_stale
+        """),
+        params,
     )
+    row = result.mappings().one_or_none()
+    if row is None:
+        await db.rollback()
+        await _fetch_patient(session_id, db)
+        raise HTTPException(status_code=412, detail="Form was modified by another client")
+    await db.commit()
+    if geo_touched and row["svi_stale"] and new_geo:
+        await store_svi_record(session_id, await build_svi_record(new_geo), row["version"], db)
+
+    changed: dict[str, Any] = {**replacements}
+    for section, fields in updates.items():
+        changed[section] = fields
+    return {"id": session_id, "version": row["version"], "changed": changed}
 
 
 @router.post("/{session_id}/finalize")
@@ -501,4 +1005,47 @@ async def finalize_session(session_id: int, db: AsyncSession = Depends(get_db)):
 async def delete_session(session_id: int, db: AsyncSession = Depends(get_db)):
     await _fetch_patient(session_id, db)
     await db.execute(text("DELETE FROM patients WHERE id = :id"), {"id": session_id})
+    await _record_tombstones([session_id], db)
+    await _delete_graph_threads([session_id], db)
+    await db.commit()
+
+
+def _batch_results(requested: list[int], affected: set[int], status: str) -> dict:
+    return {
+        "results": [
+            {"id": sid, "status": status} if sid in affected else {"id": sid, "error": "Session not found"}
+            for sid in requested
+        ]
+    }
+
+
+@router.post(":batchFinalize")
+async def batch_finalize_sessions(payload: BatchIdsRequest, db: AsyncSession = Depends(get_db)):
+    """Finalize many sessions in one UPDATE; ids that don't exist are reported per id."""
+    requested = list(dict.fromkeys(payload.ids))
+    result = await db.execute(
+        text("""
+            UPDATE patients SET status = 'final', progress = 100, updated_at = now()
+            WHERE id = ANY(:ids)
+            RETURNING id
+        """),
+        {"ids": requested},
+    )
+    affected = {int(row["id"]) for row in result.mappings().all()}
+    await db.commit()
+    return _batch_results(requested, affected, "final")
+
+
+@router.post(":batchDelete")
+async def batch_delete_sessions(payload: BatchIdsRequest, db: AsyncSession = Depends(get_db)):
+    """Delete many sessions in one DELETE; ids that don't exist are reported per id."""
+    requested = list(dict.fromkeys(payload.ids))
+    result = await db.execute(
+        text("DELETE FROM patients WHERE id = ANY(:ids) RETURNING id"),
+        {"ids": requested},
+    )
+    affected = {int(row["id"]) for row in result.mappings().all()}
+    await _record_tombstones(list(affected), db)
+    await _delete_graph_threads(list(affected), db)
     await db.commit()
+    return _batch_results(requested, affected, "deleted")
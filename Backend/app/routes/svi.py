@@ -1,43 +1,51 @@
+import asyncio
 import importlib.util
+import json
 import logging
 import os
+from typing import List
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from pydantic import BaseModel, Field, model_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from app.db import get_db
+from app import admission, subsystems
+from app.auth.tokens import current_nurse
+from app.db import AsyncSessionLocal, get_db
+from app.llm_parse import svi_guidance
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/sessions", tags=["svi"])
 
 # ---------------------------------------------------------------------------
-# Attempt to load cdcsvi_lookup from the "LLM Parse" folder at runtime.
+# cdcsvi_lookup lives in the "LLM Parse" folder and pulls in pandas plus the
+# SVI CSV, so it is loaded lazily through the "svi" subsystem.
 # ---------------------------------------------------------------------------
 _llm_parse_dir = os.path.normpath(
     os.path.join(os.path.dirname(__file__), "..", "LLM Parse")
 )
 _svi_lookup_path = os.path.join(_llm_parse_dir, "cdcsvi_lookup.py")
 
-SVI_AVAILABLE = False
-extract_zip_from_text = None
-zip_to_county = None
-get_info_from_cdcsvi = None
-
-try:
-    spec = importlib.util.spec_from_file_location("cdcsvi_lookup", _svi_lookup_path)
-    if spec and spec.loader:
-        _mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(_mod)  # type: ignore[union-attr]
-        extract_zip_from_text = _mod.extract_zip_from_text
-        zip_to_county = _mod.zip_to_county
-        get_info_from_cdcsvi = _mod.get_info_from_cdcsvi
-        SVI_AVAILABLE = True
-        logger.info("SVI lookup loaded successfully from %s", _svi_lookup_path)
-except Exception as exc:
-    logger.warning(
-        "SVI lookup unavailable (missing pandas/CSV or import error): %s", exc
-    )
+
+def load_svi_lookup():
+    """Import cdcsvi_lookup from disk; returns None if pandas/CSV are unavailable."""
+    try:
+        spec = importlib.util.spec_from_file_location("cdcsvi_lookup", _svi_lookup_path)
+        if spec and spec.loader:
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)  # type: ignore[union-attr]
+            footprint = mod.svi_memory_footprint()
+            logger.info(
+                "SVI lookup loaded successfully from %s (%d rows, %.0f KB in memory)",
+                _svi_lookup_path, footprint["rows"], footprint["total_bytes"] / 1024,
+            )
+            return mod
+    except Exception as exc:
+        logger.warning(
+            "SVI lookup unavailable (missing pandas/CSV or import error): %s", exc
+        )
+    return None
 
 
 # ---------------------------------------------------------------------------
@@ -123,62 +131,213 @@ def _svi_flags_to_questions(flags: dict) -> list[dict]:
     return questions
 
 
+def _county_info_to_location(county_info: dict | None) -> str | None:
+    if county_info and county_info.get("county_name") and county_info.get("state_name"):
+        return f'{county_info["county_name"]}, {county_info["state_name"]}'
+    return None
+
+
+async def _zip_to_location(svi, zip_code: str) -> str | None:
+    """'County, State' for a ZIP, within the geocode admission gate."""
+    async with admission.slot("geocode"):
+        return _county_info_to_location(await asyncio.to_thread(svi.zip_to_county, zip_code))
+
+
+def _svi_response(flags: dict) -> dict:
+    if "error" in flags:
+        return {"metrics": [], "questions": [], "error": flags["error"]}
+    return {
+        "metrics": _svi_flags_to_metrics(flags),
+        "questions": _svi_flags_to_questions(flags),
+    }
+
+
+def _svi_record(svi, location: str, flags: dict) -> dict:
+    """Shape persisted in patients.svi for a resolved location."""
+    record = {"location": location, **_svi_response(flags)}
+    if "error" not in flags:
+        record["flags"] = flags
+        # County key for the cached LLM guidance (app/llm_parse/svi_guidance.py).
+        record["stcnty"] = svi.resolve_stcnty(location)
+        record["dataset_version"] = svi.SVI_DATASET_VERSION
+    return record
+
+
+def is_current_record(record: dict | None, svi) -> bool:
+    """
+    Whether a stored patients.svi record can be served as is: resolved
+    without error against the SVI CSV now loaded. Anything else (error
+    records stored before they were skipped, records from an older CSV) is
+    recomputed. With no lookup loaded a stored record is all there is.
+    """
+    if not record:
+        return False
+    return svi is None or ("error" not in record and record.get("dataset_version") == svi.SVI_DATASET_VERSION)
+
+
+def svi_record_response(record: dict) -> dict:
+    """Strip a stored patients.svi record down to the /svi response shape."""
+    return {k: record[k] for k in ("metrics", "questions", "error") if k in record}
+
+
+async def build_svi_record(location: str | None) -> dict | None:
+    """
+    Resolve flags, metrics and questions for a location in the shape stored
+    in patients.svi. Returns None when there is nothing to store (no
+    location, the SVI lookup is unavailable or the location doesn't
+    resolve), which leaves the column NULL so the next read tries again.
+    """
+    if not location:
+        return None
+    svi = await subsystems.aget("svi")
+    if svi is None:
+        return None
+    try:
+        record = _svi_record(svi, location, svi.get_info_from_cdcsvi(location))
+    except Exception as exc:
+        logger.error("SVI lookup failed for '%s': %s", location, exc)
+        return None
+    return None if "error" in record else record
+
+
+async def store_svi_record(session_id: int, record: dict | None, version: int, db: AsyncSession) -> None:
+    """
+    Persist (or clear, for None) the resolved SVI record for a session,
+    unless the form has moved past `version` since the record was resolved:
+    that edit has its own record (or NULL, resolved on the next read).
+    Error records are never stored.
+    """
+    if record is not None and "error" in record:
+        record = None
+    await db.execute(
+        text("""
+            UPDATE patients
+            SET svi = CAST(:svi AS JSONB),
+                -- Follow-up counts come from svi, so a change has to reach /sessions/changes.
+                updated_at = CASE WHEN svi IS DISTINCT FROM CAST(:svi AS JSONB) THEN now() ELSE updated_at END
+            WHERE id = :id AND version = :version
+        """),
+        {"id": session_id, "version": version, "svi": json.dumps(record) if record is not None else None},
+    )
+    await db.commit()
+
+
+async def _generate_guidance(stcnty: str) -> None:
+    """
+    Generate a county's guidance for the SVI CSV now loaded. Stored records
+    from an older CSV are rebuilt on read (is_current_record) before their
+    guidance is looked up, so this is the version the next read asks for.
+    """
+    svi = await subsystems.aget("svi")
+    if svi is None:
+        return
+    county = svi.get_county_record(stcnty)
+    if county:
+        async with AsyncSessionLocal() as db:
+            await svi_guidance.ensure_guidance(county, svi.SVI_DATASET_VERSION, db)
+
+
+async def attach_guidance(
+    pairs: list[tuple[dict, dict]], background_tasks: BackgroundTasks, db: AsyncSession
+) -> None:
+    """
+    Set "guidance" on each response from the county cache for its record.
+    Misses get None now and are generated after the response is sent, so
+    the next request for that county is served from the cache.
+    """
+    by_version: dict[str, list[str]] = {}
+    for out, record in pairs:
+        out["guidance"] = None
+        if record.get("stcnty") and record.get("dataset_version"):
+            by_version.setdefault(record["dataset_version"], []).append(record["stcnty"])
+
+    for dataset_version, stcntys in by_version.items():
+        try:
+            cached = await svi_guidance.get_cached_many(stcntys, dataset_version, db)
+        except Exception as exc:
+            logger.warning("SVI guidance cache read failed: %s", exc)
+            continue
+        scheduled: set[str] = set()
+        for out, record in pairs:
+            stcnty = record.get("stcnty")
+            if record.get("dataset_version") != dataset_version or not stcnty:
+                continue
+            if stcnty in cached:
+                out["guidance"] = cached[stcnty]
+            elif stcnty not in scheduled:
+                scheduled.add(stcnty)
+                background_tasks.add_task(_generate_guidance, stcnty)
+
+
 # ---------------------------------------------------------------------------
-# Route
+# Routes
 # ---------------------------------------------------------------------------
 
 @router.get("/{session_id}/svi")
 async def get_svi(
     session_id: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     location_override: str | None = Query(default=None, alias="location"),
 ):
     """
-    Return Social Vulnerability Index metrics and follow-up questions for a
-    session. Resolves location via three strategies in priority order:
-      0. Use the ?location= query param if provided (zip code or 'County, State').
+    Return Social Vulnerability Index metrics, follow-up questions and the
+    county's LLM nurse guidance (null until cached, see attach_guidance) for
+    a session.
+
+    Normally served from patients.svi, which is computed whenever the
+    session's geo_location is set (stop_recording or a form edit). A
+    ?location= override (ZIP or 'County, State', e.g. a live form edit) is
+    resolved on the fly and not stored. Sessions with no stored value yet
+    fall back to resolving, in priority order:
       1. Extract ZIP from transcript and resolve county/state via external APIs.
-      2. Use geo_location already stored in patient_info (set by the regular
-         recording flow or by a manual nurse edit).
+      2. Use geo_location already stored in patient_info.
+    and persist the result.
     """
-    if not SVI_AVAILABLE:
+    svi = await subsystems.aget("svi")
+    if not location_override:
+        result = await db.execute(
+            text("SELECT transcript, patient_info, svi, version FROM patients WHERE id = :id"),
+            {"id": session_id},
+        )
+        row = result.mappings().one_or_none()
+        if row and is_current_record(row["svi"], svi):
+            response = svi_record_response(row["svi"])
+            await attach_guidance([(response, row["svi"])], background_tasks, db)
+            return response
+
+    if svi is None:
         logger.info("SVI lookup not available — returning empty response")
         return {"metrics": [], "questions": [], "error": "svi_unavailable"}
 
     location: str | None = None
 
-    # Strategy 0: explicit location override from the caller (e.g. live form edit).
+    # Explicit location override from the caller (e.g. live form edit).
     if location_override:
         loc = location_override.strip()
         # If it looks like a bare ZIP code, resolve it to county/state first.
         if loc.isdigit() and len(loc) == 5:
             try:
-                county_info = zip_to_county(loc)  # type: ignore[misc]
-                if county_info and county_info.get("county_name") and county_info.get("state_name"):
-                    location = f'{county_info["county_name"]}, {county_info["state_name"]}'
+                location = await _zip_to_location(svi, loc)
+            except admission.Overloaded:
+                raise
             except Exception as exc:
                 logger.warning("SVI ZIP resolution failed for override '%s': %s", loc, exc)
         if not location and loc:
             # Treat as "County, State" or whatever format get_info_from_cdcsvi accepts.
             location = loc
-
-    if not location:
-        result = await db.execute(
-            text("SELECT transcript, patient_info FROM patients WHERE id = :id"),
-            {"id": session_id},
-        )
-        row = result.mappings().one_or_none()
+    else:
         transcript: str | None = row["transcript"] if row else None
         patient_info: dict = (row["patient_info"] if row else None) or {}
 
         # Strategy 1: extract ZIP from transcript and resolve to county/state.
         if transcript:
             try:
-                zip_code = extract_zip_from_text(transcript)  # type: ignore[misc]
+                zip_code = svi.extract_zip_from_text(transcript)
                 if zip_code:
-                    county_info = zip_to_county(zip_code)  # type: ignore[misc]
-                    if county_info and county_info.get("county_name") and county_info.get("state_name"):
-                        location = f'{county_info["county_name"]}, {county_info["state_name"]}'
+                    location = await _zip_to_location(svi, zip_code)
+            except admission.Overloaded:
+                raise
             except Exception as exc:
                 logger.warning("SVI ZIP extraction failed for session %d: %s", session_id, exc)
 
@@ -193,16 +352,178 @@ async def get_svi(
         return {"metrics": [], "questions": [], "error": "no_location_found"}
 
     try:
-        svi_flags = get_info_from_cdcsvi(location)  # type: ignore[misc]
-
-        if "error" in svi_flags:
-            return {"metrics": [], "questions": [], "error": svi_flags["error"]}
-
-        return {
-            "metrics": _svi_flags_to_metrics(svi_flags),
-            "questions": _svi_flags_to_questions(svi_flags),
-        }
-
+        record = _svi_record(svi, location, svi.get_info_from_cdcsvi(location))
     except Exception as exc:
         logger.error("SVI lookup failed for session %d: %s", session_id, exc)
         return {"metrics": [], "questions": [], "error": str(exc)}
+
+    if not location_override and row:
+        await store_svi_record(session_id, record, row["version"], db)
+    response = svi_record_response(record)
+    await attach_guidance([(response, record)], background_tasks, db)
+    return response
+
+
+class SviBatchRequest(BaseModel):
+    session_ids: List[int] = Field(default_factory=list, max_length=100)
+    locations: List[str] = Field(default_factory=list, max_length=100)
+
+    @model_validator(mode="after")
+    def _not_empty(self):
+        if not self.session_ids and not self.locations:
+            raise ValueError("Provide session_ids and/or locations")
+        return self
+
+
+def _batch_session_result(session_id: int, records: dict[int, dict]) -> dict:
+    record = records.get(session_id)
+    if record is None:
+        return {"id": session_id, "location": None, "metrics": [], "questions": [], "error": "Session not found"}
+    return {"id": session_id, "location": record.get("location"), **svi_record_response(record)}
+
+
+@router.post("/svi:batch")
+async def get_svi_batch(
+    payload: SviBatchRequest, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)
+):
+    """
+    SVI metrics, questions and cached county guidance for many sessions
+    and/or locations at once.
+
+    Sessions are loaded with one query and served from their stored
+    patients.svi where it is current (see is_current_record). The rest are resolved like GET /{id}/svi
+    (ZIP from transcript, then stored geo_location) and persisted in one
+    UPDATE. Each distinct ZIP is geocoded once, concurrently, and all distinct
+    locations are matched against the SVI table in a single join.
+    """
+    session_ids = list(dict.fromkeys(payload.session_ids))
+    rows = {}
+    if session_ids:
+        result = await db.execute(
+            text("SELECT id, transcript, patient_info, svi, version FROM patients WHERE id = ANY(:ids)"),
+            {"ids": session_ids},
+        )
+        rows = {int(row["id"]): row for row in result.mappings().all()}
+
+    svi = await subsystems.aget("svi") if rows or payload.locations else None
+    records: dict[int, dict] = {sid: row["svi"] for sid, row in rows.items() if is_current_record(row["svi"], svi)}
+    unresolved = [sid for sid in rows if sid not in records]
+    requested_locations = [loc.strip() for loc in payload.locations]
+
+    if unresolved or requested_locations:
+        if svi is None:
+            unavailable = {"metrics": [], "questions": [], "error": "svi_unavailable"}
+            for sid in unresolved:
+                records[sid] = {"location": None, **unavailable}
+            return {
+                "sessions": [_batch_session_result(sid, records) for sid in session_ids],
+                "locations": [{"location": loc, **unavailable} for loc in requested_locations],
+            }
+
+    # Collect every ZIP we need to geocode: from transcripts and bare-ZIP locations.
+    session_zips: dict[int, str] = {}
+    for sid in unresolved:
+        transcript = rows[sid]["transcript"]
+        if transcript:
+            try:
+                zip_code = svi.extract_zip_from_text(transcript)
+            except Exception as exc:
+                logger.warning("SVI ZIP extraction failed for session %d: %s", sid, exc)
+                zip_code = None
+            if zip_code:
+                session_zips[sid] = zip_code
+    zips = set(session_zips.values()) | {
+        loc for loc in requested_locations if loc.isdigit() and len(loc) == 5
+    }
+
+    # Queue at most a gate's worth of lookups at once, so one big batch can't fill the geocode queue alone.
+    fan_out = asyncio.Semaphore(admission.GATES["geocode"].limit)
+
+    async def _resolve_zip(zip_code: str) -> tuple[str, str | None]:
+        async with fan_out:
+            try:
+                return zip_code, await _zip_to_location(svi, zip_code)
+            except admission.Overloaded:
+                raise  # 429 rather than storing "no location" for every session
+            except Exception as exc:
+                logger.warning("SVI ZIP resolution failed for '%s': %s", zip_code, exc)
+                return zip_code, None
+
+    zip_locations = dict(await asyncio.gather(*(_resolve_zip(z) for z in zips)))
+
+    session_locations: dict[int, str | None] = {}
+    for sid in unresolved:
+        location = zip_locations.get(session_zips.get(sid, ""))
+        if not location:
+            geo = (rows[sid]["patient_info"] or {}).get("geo_location")
+            location = geo if geo and isinstance(geo, str) else None
+        session_locations[sid] = location
+    resolved_requests = {loc: zip_locations.get(loc) or loc for loc in requested_locations}
+
+    to_lookup = [loc for loc in (*session_locations.values(), *resolved_requests.values()) if loc]
+    flags_by_location: dict[str, dict] = {}
+    if to_lookup:
+        try:
+            flags_by_location = svi.get_info_from_cdcsvi_many(to_lookup)
+        except Exception as exc:
+            logger.error("SVI batch lookup failed: %s", exc)
+            flags_by_location = {loc: {"error": str(exc)} for loc in to_lookup}
+
+    new_records: dict[int, dict] = {}
+    for sid, location in session_locations.items():
+        if location:
+            records[sid] = _svi_record(svi, location, flags_by_location[location])
+            if "error" not in records[sid]:
+                new_records[sid] = records[sid]
+        else:
+            records[sid] = {"location": None, "metrics": [], "questions": [], "error": "no_location_found"}
+    if new_records:
+        await db.execute(
+            text("""
+                UPDATE patients AS p
+                SET svi = r.value->'svi',
+                    updated_at = CASE WHEN p.svi IS DISTINCT FROM r.value->'svi' THEN now() ELSE p.updated_at END
+                FROM jsonb_each(CAST(:records AS JSONB)) AS r
+                WHERE p.id = CAST(r.key AS BIGINT) AND p.version = CAST(r.value->>'version' AS INT)
+            """),
+            {"records": json.dumps({str(sid): {"svi": rec, "version": rows[sid]["version"]}
+                                    for sid, rec in new_records.items()})},
+        )
+        await db.commit()
+
+    location_records = {
+        loc: _svi_record(svi, resolved_requests[loc], flags_by_location[resolved_requests[loc]])
+        if resolved_requests[loc] else {"location": None, "metrics": [], "questions": [], "error": "no_location_found"}
+        for loc in requested_locations
+    }
+    sessions_out = [_batch_session_result(sid, records) for sid in session_ids]
+    locations_out = [{"location": loc, **svi_record_response(location_records[loc])} for loc in requested_locations]
+    await attach_guidance(
+        [(out, records.get(sid, {})) for out, sid in zip(sessions_out, session_ids)]
+        + [(out, location_records[loc]) for out, loc in zip(locations_out, requested_locations)],
+        background_tasks, db,
+    )
+    return {"sessions": sessions_out, "locations": locations_out}
+
+
+class SviPrewarmRequest(BaseModel):
+    # 5-digit county FIPS codes; empty means every county with a stored session.
+    stcnty: List[str] = Field(default_factory=list, max_length=500)
+
+
+# Can start hundreds of model calls, so it needs a signed-in nurse even when AUTH_REQUIRED is off.
+@router.post("/svi:prewarm", dependencies=[Depends(current_nurse)])
+async def prewarm_svi_guidance(payload: SviPrewarmRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Generate and cache LLM nurse guidance for the given counties (default:
+    the counties of all stored sessions) so /svi serves it without waiting
+    on the model. Already-cached counties are skipped.
+    """
+    svi = await subsystems.aget("svi")
+    if svi is None:
+        return {"counties": 0, "cached": 0, "generated": 0, "failed": 0, "error": "svi_unavailable"}
+    if payload.stcnty:
+        counties = [c for c in map(svi.get_county_record, payload.stcnty) if c]
+    else:
+        counties = await svi_guidance.served_counties(svi, db)
+    return await svi_guidance.prewarm(counties, svi.SVI_DATASET_VERSION, AsyncSessionLocal)
@@ -0,0 +1,131 @@
+"""
+Parsing and validation for partial handoff form updates.
+
+PATCH /sessions/{id}/form accepts either an RFC 7396 merge patch (a JSON
+object shaped like a subset of PatientCreate) or an RFC 6902 JSON Patch (a
+list of operations). Both are reduced to the same two dicts so the route can
+write them with jsonb_set without re-validating untouched sections:
+
+  replacements: {section: whole new value}     e.g. {"medications": [...]}
+  updates:      {section: {field: new value}}  e.g. {"patient_info": {"room_num": 12}}
+"""
+from __future__ import annotations
+from functools import lru_cache
+from typing import Annotated, Any, List
+
+from pydantic import BaseModel, TypeAdapter
+
+from .patient import (
+    Background,
+    CurrentAssessment,
+    Medication,
+    Nurse,
+    PatientInfo,
+    VitalSigns,
+)
+
+# Section name → sub-model. Section names double as the JSONB column names.
+SECTIONS: dict[str, type[BaseModel]] = {
+    "nurse": Nurse,
+    "patient_info": PatientInfo,
+    "background": Background,
+    "current_assessment": CurrentAssessment,
+    "vital_signs": VitalSigns,
+}
+LIST_SECTIONS: dict[str, TypeAdapter] = {
+    "medications": TypeAdapter(List[Medication]),
+}
+
+
+class FormPatchError(ValueError):
+    """Raised when a patch references unknown paths or uses unsupported ops."""
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(section: str, field: str) -> TypeAdapter:
+    info = SECTIONS[section].model_fields[field]
+    if not info.metadata:
+        return TypeAdapter(info.annotation)
+    return TypeAdapter(Annotated[(info.annotation, *info.metadata)])
+
+
+def _validate_field(section: str, field: str, value: Any) -> Any:
+    if section not in SECTIONS:
+        raise FormPatchError(f"Cannot patch individual fields of '{section}'")
+    if field not in SECTIONS[section].model_fields:
+        raise FormPatchError(f"Unknown field '{section}.{field}'")
+    adapter = _field_adapter(section, field)
+    return adapter.dump_python(adapter.validate_python(value), mode="json")
+
+
+def _validate_section(section: str, value: Any) -> Any:
+    if section in LIST_SECTIONS:
+        adapter = LIST_SECTIONS[section]
+        return adapter.dump_python(adapter.validate_python(value or []), mode="json")
+    if section in SECTIONS:
+        return SECTIONS[section].model_validate(value).model_dump(mode="json")
+    raise FormPatchError(f"Unknown section '{section}'")
+
+
+def _parse_merge_patch(body: dict) -> tuple[dict, dict]:
+    replacements: dict[str, Any] = {}
+    updates: dict[str, dict[str, Any]] = {}
+    for section, value in body.items():
+        if section in LIST_SECTIONS:
+            # Arrays are replaced wholesale under merge-patch semantics.
+            replacements[section] = _validate_section(section, value)
+        elif section in SECTIONS:
+            if not isinstance(value, dict):
+                raise FormPatchError(f"'{section}' must be an object")
+            for field, field_value in value.items():
+                updates.setdefault(section, {})[field] = _validate_field(section, field, field_value)
+        else:
+            raise FormPatchError(f"Unknown section '{section}'")
+    return replacements, updates
+
+
+def _split_pointer(path: str) -> list[str]:
+    if not path.startswith("/"):
+        raise FormPatchError(f"Invalid JSON pointer '{path}'")
+    return [p.replace("~1", "/").replace("~0", "~") for p in path[1:].split("/")]
+
+
+def _parse_json_patch(ops: list) -> tuple[dict, dict]:
+    replacements: dict[str, Any] = {}
+    updates: dict[str, dict[str, Any]] = {}
+    for op in ops:
+        if not isinstance(op, dict) or "op" not in op or "path" not in op:
+            raise FormPatchError("Each JSON Patch operation needs 'op' and 'path'")
+        kind = op["op"]
+        if kind not in ("add", "replace", "remove"):
+            raise FormPatchError(f"Unsupported JSON Patch op '{kind}'")
+        value = None if kind == "remove" else op.get("value")
+
+        parts = _split_pointer(op["path"])
+        if len(parts) == 1:
+            section = parts[0]
+            replacements[section] = _validate_section(section, value)
+            updates.pop(section, None)
+        elif len(parts) == 2:
+            section, field = parts
+            validated = _validate_field(section, field, value)
+            if section in replacements:
+                replacements[section][field] = validated
+            else:
+                updates.setdefault(section, {})[field] = validated
+        else:
+            raise FormPatchError(f"Path '{op['path']}' is deeper than section/field")
+    return replacements, updates
+
+
+def parse_form_patch(body: Any) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """
+    Validate a merge patch (dict) or JSON Patch (list) against only the
+    sub-models it touches. Returns (replacements, updates); raises
+    FormPatchError or pydantic.ValidationError (both ValueErrors) on bad input.
+    """
+    if isinstance(body, list):
+        return _parse_json_patch(body)
+    if isinstance(body, dict):
+        return _parse_merge_patch(body)
+    raise FormPatchError("Patch body must be a JSON object or a JSON Patch array")
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional, List
+from typing import Any, List, Mapping, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -77,3 +77,31 @@ class PatientOut(BaseModel):
     current_assessment: CurrentAssessment
     vital_signs: VitalSigns
     medications: Optional[List[Medication]] = None
+    version: Optional[int] = None
+
+
+def patient_out_from_row(row: Mapping[str, Any]) -> dict:
+    """
+    Build the PatientOut response for a patients row, validated once.
+
+    The form columns hold RAG pipeline output as well as validated
+    PatientCreate data, so they are checked against PatientOut like any
+    response. Routes return this dict in an ORJSONResponse, which skips
+    FastAPI's second validation pass through response_model.
+    """
+    return PatientOut.model_validate({
+        "id": int(row["id"]),
+        "nurse": row["nurse"],
+        "patient_info": row["patient_info"],
+        "background": row["background"],
+        "current_assessment": row["current_assessment"],
+        "vital_signs": row["vital_signs"],
+        "medications": row.get("medications") or [],
+        "version": row.get("version"),
+    }).model_dump()
+
+
+class PatientBatchCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    patients: List[PatientCreate] = Field(min_length=1, max_length=500)
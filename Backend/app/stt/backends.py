@@ -0,0 +1,72 @@
+"""
+Speech-to-text backends, selected with STT_BACKEND:
+
+  openai  (default)  OpenAI transcription API (STT_OPENAI_MODEL, default
+                     gpt-4o-transcribe); audio is normalized to 16 kHz mono
+                     Opus first (app/stt/normalize.py)
+  local              faster-whisper on CPU in a process pool; see
+                     app/stt/local_whisper.py. Nothing leaves the host.
+
+The chosen backend is built once through the "stt" subsystem.
+"""
+from __future__ import annotations
+import abc
+import logging
+import os
+from io import BytesIO
+
+from app import resilience, subsystems
+from app.stt.normalize import normalize_audio
+
+logger = logging.getLogger(__name__)
+
+
+class STTBackend(abc.ABC):
+    """Interface: transcribe() is blocking and is called from worker threads."""
+
+    name = "base"
+
+    @abc.abstractmethod
+    def transcribe(self, audio_bytes: bytes, filename: str) -> str:
+        """The transcript of one recording."""
+
+    def warm(self) -> None:
+        """Load whatever transcribe() would otherwise load on first use."""
+
+
+class OpenAIBackend(STTBackend):
+    name = "openai"
+
+    def __init__(self, model: str | None = None):
+        self.model = model or os.getenv("STT_OPENAI_MODEL", "gpt-4o-transcribe")
+
+    def transcribe(self, audio_bytes: bytes, filename: str) -> str:
+        audio = normalize_audio(audio_bytes, filename)
+        logger.info("STT input '%s': %s", filename, audio.summary())
+
+        def _create() -> str:
+            audio_file = BytesIO(audio.data)  # fresh per attempt; a failed upload consumed the last one
+            audio_file.name = audio.filename  # OpenAI SDK requires a name with an extension
+            return subsystems.get("openai").audio.transcriptions.create(
+                model=self.model,
+                file=audio_file,
+                response_format="text",
+                language="en",
+                timeout=resilience.time_left(),
+            )
+
+        return resilience.call("stt", _create)
+
+    def warm(self) -> None:
+        subsystems.get("openai")
+
+
+def load_backend(name: str | None = None) -> STTBackend:
+    name = (name or os.getenv("STT_BACKEND", "openai")).lower()
+    if name == "openai":
+        return OpenAIBackend()
+    if name == "local":
+        from app.stt.local_whisper import LocalWhisperBackend
+
+        return LocalWhisperBackend()
+    raise ValueError(f"Unknown STT_BACKEND '{name}' (expected 'openai' or 'local')")
@@ -0,0 +1,126 @@
+"""
+Local CPU speech-to-text with faster-whisper (CTranslate2, int8-quantized
+Whisper), for on-prem deployments that can't send audio to OpenAI.
+
+Transcription is CPU-bound and holds the GIL for long stretches, so it runs
+in a process pool. Each worker loads the model once in its initializer and
+keeps it for its lifetime; requests only ship 16 kHz float32 PCM (about
+3.8 MB per audio minute) to a worker and get text back. Decoding and
+silence trimming happen in the parent via app/stt/normalize.py, so workers
+never re-encode anything.
+
+Sizing, by default, fills the host: STT_LOCAL_THREADS intra-op threads per
+worker (2, or 1 on a single core) and cores // threads workers.
+
+  STT_LOCAL_MODEL         model name or path to a converted CTranslate2
+                          directory (default base.en; use a path when the
+                          host can't reach the Hugging Face hub)
+  STT_LOCAL_COMPUTE_TYPE  CTranslate2 compute type (default int8)
+  STT_LOCAL_WORKERS       worker processes
+  STT_LOCAL_THREADS       threads per worker
+  STT_LOCAL_BEAM_SIZE     decoding beam (default 1, greedy)
+
+Needs faster-whisper, which is in requirements-local.txt rather than
+requirements.txt (it is large, and the OpenAI backend and the Vercel bundle
+don't use it): `pip install -r requirements-local.txt`, or build the image
+with `--build-arg STT_LOCAL=1`.
+"""
+from __future__ import annotations
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from app.stt.backends import STTBackend
+from app.stt.normalize import SAMPLE_RATE, decode_pcm, trim_silence
+
+logger = logging.getLogger(__name__)
+
+_CORES = os.cpu_count() or 1
+
+# Set in each worker process by _init_worker.
+_model = None
+_beam_size = 1
+
+
+def _init_worker(model: str, compute_type: str, threads: int, beam_size: int) -> None:
+    global _model, _beam_size
+    from faster_whisper import WhisperModel
+
+    _model = WhisperModel(model, device="cpu", compute_type=compute_type, cpu_threads=threads, num_workers=1)
+    _beam_size = beam_size
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _transcribe_pcm(pcm: np.ndarray) -> str:
+    segments, _ = _model.transcribe(
+        pcm, language="en", beam_size=_beam_size,
+        # Silence is already trimmed and handoffs rarely pause long enough for VAD to pay off.
+        vad_filter=False, condition_on_previous_text=False,
+    )
+    return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+class LocalWhisperBackend(STTBackend):
+    name = "local"
+
+    def __init__(self):
+        self.model = os.getenv("STT_LOCAL_MODEL", "base.en")
+        self.compute_type = os.getenv("STT_LOCAL_COMPUTE_TYPE", "int8")
+        self.threads = int(os.getenv("STT_LOCAL_THREADS", 2 if _CORES >= 2 else 1))
+        self.workers = int(os.getenv("STT_LOCAL_WORKERS", max(1, _CORES // self.threads)))
+        self.beam_size = int(os.getenv("STT_LOCAL_BEAM_SIZE", 1))
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # spawn, not fork: the parent runs an event loop and threads.
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model, self.compute_type, self.threads, self.beam_size),
+                )
+                logger.info("Local STT: %d worker(s) x %d thread(s), model %s (%s)",
+                            self.workers, self.threads, self.model, self.compute_type)
+            return self._pool
+
+    def _reset_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def warm(self) -> None:
+        """Start every worker so the model is loaded before the first request."""
+        pool = self._get_pool()
+        try:
+            for future in [pool.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise RuntimeError(f"Local STT workers failed to load model '{self.model}'")
+
+    def transcribe(self, audio_bytes: bytes, filename: str) -> str:
+        pcm, input_seconds = decode_pcm(audio_bytes)
+        pcm = trim_silence(pcm)
+        logger.info("STT input '%s': %.1f s -> %.1f s after trimming", filename, input_seconds, len(pcm) / SAMPLE_RATE)
+        if len(pcm) == 0:
+            return ""
+
+        pool = self._get_pool()
+        try:
+            return pool.submit(_transcribe_pcm, pcm.astype(np.float32) / 32768.0).result()
+        except BrokenProcessPool:
+            # A worker died (OOM, bad model path); start a fresh pool next time.
+            self._reset_pool(pool)
+            raise
@@ -0,0 +1,150 @@
+"""
+Audio normalization ahead of speech-to-text.
+
+Browsers record 48 kHz (often stereo) Opus/WebM or AAC/MP4 at whatever
+bitrate they like, with dead air before the nurse starts and after they
+stop. None of that helps transcription; it only costs upload time and
+billed seconds. normalize_audio() decodes the recording, downmixes to mono,
+resamples to 16 kHz (what the STT models work at internally), trims
+leading/trailing silence and re-encodes as 24 kbps Opus in Ogg.
+
+Decoding and encoding use PyAV (bundled FFmpeg). If it is not installed, or
+the input cannot be decoded, the original bytes are passed through
+unchanged. Set STT_NORMALIZE=0 to disable the stage.
+"""
+from __future__ import annotations
+import io
+import logging
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+try:
+    import av
+except ImportError:  # optional: without it audio goes to STT as recorded
+    av = None
+
+logger = logging.getLogger(__name__)
+
+NORMALIZE_ENABLED = os.getenv("STT_NORMALIZE", "1").lower() not in ("0", "false", "no")
+
+SAMPLE_RATE = 16_000
+OPUS_BITRATE = 24_000
+# Size is set by the bitrate; libopus' default complexity (10) only buys
+# quality we can't use at 24 kbps speech and is ~5x slower than 3.
+_OPUS_OPTIONS = {"application": "audio", "compression_level": "3", "frame_duration": "60"}
+# Frames (20 ms) quieter than this, relative to the loudest frame, count as silence.
+_SILENCE_DB = -40.0
+_SILENCE_FLOOR_DB = -55.0  # absolute dBFS floor, for recordings that are quiet throughout
+_FRAME = SAMPLE_RATE // 50
+_PAD_SECONDS = 0.3  # kept either side of speech so word onsets aren't clipped
+
+
+@dataclass
+class NormalizedAudio:
+    data: bytes
+    filename: str
+    input_bytes: int
+    output_bytes: int
+    input_seconds: float | None = None
+    output_seconds: float | None = None
+
+    @property
+    def applied(self) -> bool:
+        return self.output_seconds is not None
+
+    def summary(self) -> str:
+        if not self.applied:
+            return f"{self.input_bytes / 1e6:.2f} MB passed through unchanged"
+        return (
+            f"{self.input_bytes / 1e6:.2f} MB -> {self.output_bytes / 1e6:.2f} MB "
+            f"({_reduction(self.input_bytes, self.output_bytes):.0%} smaller), "
+            f"{self.input_seconds:.1f} s -> {self.output_seconds:.1f} s "
+            f"({_reduction(self.input_seconds, self.output_seconds):.0%} shorter)"
+        )
+
+
+def _reduction(before: float, after: float) -> float:
+    return 1 - after / before if before else 0.0
+
+
+def decode_pcm(audio_bytes: bytes) -> tuple[np.ndarray, float]:
+    """Decode any container to 16 kHz mono int16 PCM; returns (pcm, input duration in seconds)."""
+    with av.open(io.BytesIO(audio_bytes)) as container:
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+        chunks, input_samples = [], 0
+        for frame in container.decode(stream):
+            input_samples += frame.samples
+            input_rate = frame.sample_rate
+            chunks.extend(f.to_ndarray().reshape(-1) for f in resampler.resample(frame))
+        chunks.extend(f.to_ndarray().reshape(-1) for f in resampler.resample(None))
+    if not chunks:
+        raise ValueError("No audio frames decoded")
+    return np.concatenate(chunks), input_samples / input_rate
+
+
+def trim_silence(pcm: np.ndarray) -> np.ndarray:
+    """Drop leading and trailing silence (20 ms energy frames), keeping a little padding."""
+    n_frames = len(pcm) // _FRAME
+    if n_frames == 0:
+        return pcm
+    frames = pcm[: n_frames * _FRAME].astype(np.float32).reshape(n_frames, _FRAME) / 32768.0
+    db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-12)
+    voiced = np.flatnonzero(db > max(db.max() + _SILENCE_DB, _SILENCE_FLOOR_DB))
+    if len(voiced) == 0:
+        return pcm[:0]
+    pad = int(_PAD_SECONDS * SAMPLE_RATE)
+    start = max(0, voiced[0] * _FRAME - pad)
+    end = min(len(pcm), (voiced[-1] + 1) * _FRAME + pad)
+    return pcm[start:end]
+
+
+def encode_opus(pcm: np.ndarray) -> bytes:
+    """Encode 16 kHz mono int16 PCM as Opus in an Ogg container."""
+    out = io.BytesIO()
+    with av.open(out, "w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=SAMPLE_RATE, layout="mono", options=_OPUS_OPTIONS)
+        stream.bit_rate = OPUS_BITRATE
+        # PyAV re-blocks frames to the codec's frame size, so feed it a second at a time.
+        for start in range(0, len(pcm), SAMPLE_RATE):
+            block = np.ascontiguousarray(pcm[start:start + SAMPLE_RATE]).reshape(1, -1)
+            frame = av.AudioFrame.from_ndarray(block, format="s16", layout="mono")
+            frame.sample_rate = SAMPLE_RATE
+            frame.pts = start
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return out.getvalue()
+
+
+def normalize_audio(audio_bytes: bytes, filename: str = "audio.m4a") -> NormalizedAudio:
+    """
+    Mono / 16 kHz / silence-trimmed / Opus version of a recording, with
+    before/after size and duration. Falls back to the original bytes
+    (applied == False) when disabled or when decoding fails; also keeps the
+    original if the result would somehow be larger and no shorter.
+    """
+    passthrough = NormalizedAudio(audio_bytes, filename, len(audio_bytes), len(audio_bytes))
+    if not NORMALIZE_ENABLED or av is None:
+        return passthrough
+    try:
+        pcm, input_seconds = decode_pcm(audio_bytes)
+        trimmed = trim_silence(pcm)
+        if len(trimmed) == 0:
+            # All silence: let STT see the original rather than an empty file.
+            return passthrough
+        encoded = encode_opus(trimmed)
+    except Exception as exc:
+        logger.warning("Audio normalization failed for '%s', sending as recorded: %s", filename, exc)
+        return passthrough
+
+    output_seconds = len(trimmed) / SAMPLE_RATE
+    if len(encoded) >= len(audio_bytes) and output_seconds >= input_seconds:
+        return passthrough
+    stem = filename.rsplit(".", 1)[0] if "." in filename else filename
+    return NormalizedAudio(
+        encoded, f"{stem}.ogg", len(audio_bytes), len(encoded), input_seconds, output_seconds,
+    )
@@ -1,23 +1,6 @@
-import os
-from io import BytesIO
-
-from openai import OpenAI
-from dotenv import load_dotenv
-
-load_dotenv()
-
-_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from app import subsystems
 
 
 def transcribe_audio(audio_bytes: bytes, filename: str = "audio.m4a") -> str:
-    """Convert raw audio bytes to a transcript string using Whisper."""
-    audio_file = BytesIO(audio_bytes)
-    audio_file.name = filename  # OpenAI SDK requires a name with an extension
-
-    transcript = _client.audio.transcriptions.create(
-        model="gpt-4o-transcribe",
-        file=audio_file,
-        response_format="text",
-        language="en",
-    )
-    return transcript
+    """Convert raw audio bytes to a transcript string with the configured STT backend."""
+    return subsystems.get("stt").transcribe(audio_bytes, filename)
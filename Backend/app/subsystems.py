@@ -0,0 +1,117 @@
+"""
+Registry of heavy subsystems that are initialized lazily on first use.
+
+Importing app.main must stay cheap so a serverless cold start serving
+/health or GET /sessions doesn't pay for pandas, langchain/langgraph or the
+OpenAI SDK. Anything expensive to import or construct is registered here by
+name and built the first time a request calls get()/aget(); later calls
+return the cached instance. Load times are recorded for diagnostics.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class _Subsystem:
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.value: Any = None
+        self.load_seconds: float | None = None
+
+
+_subsystems: dict[str, _Subsystem] = {}
+
+
+def register(name: str, factory: Callable[[], Any]) -> None:
+    _subsystems[name] = _Subsystem(factory)
+
+
+def get(name: str) -> Any:
+    """Return the named subsystem, building it on first use (thread-safe)."""
+    sub = _subsystems[name]
+    if sub.loaded:
+        return sub.value
+    with sub.lock:
+        if not sub.loaded:
+            start = time.perf_counter()
+            sub.value = sub.factory()
+            sub.load_seconds = time.perf_counter() - start
+            sub.loaded = True
+            logger.info("Subsystem '%s' initialized in %.2fs", name, sub.load_seconds)
+    return sub.value
+
+
+async def aget(name: str) -> Any:
+    """Async get(): the first load runs in a worker thread so it doesn't block the event loop."""
+    sub = _subsystems[name]
+    if sub.loaded:
+        return sub.value
+    return await asyncio.to_thread(get, name)
+
+
+def reset(name: str) -> None:
+    """Forget a cached instance (e.g. a failed load that returned None) so the next get() builds it again."""
+    sub = _subsystems[name]
+    with sub.lock:
+        sub.loaded, sub.value, sub.load_seconds = False, None, None
+
+
+def is_loaded(name: str) -> bool:
+    return _subsystems[name].loaded
+
+
+def load_seconds(name: str) -> float | None:
+    return _subsystems[name].load_seconds
+
+
+def names() -> list[str]:
+    return list(_subsystems)
+
+
+# ---------------------------------------------------------------------------
+# Factories. Imports are local so nothing heavy loads until first use.
+# ---------------------------------------------------------------------------
+
+def _openai_client():
+    from openai import OpenAI
+
+    from app.resilience import CLIENT_TIMEOUT
+
+    # Retries, deadlines and hedging are handled by app.resilience.call().
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=CLIENT_TIMEOUT, max_retries=0)
+
+
+def _svi_lookup():
+    from app.routes.svi import load_svi_lookup
+
+    return load_svi_lookup()
+
+
+def _stt_backend():
+    from app.stt.backends import load_backend
+
+    return load_backend()
+
+
+def _rag_graph():
+    from app.RAG.graph import compile_checkpointed
+
+    return compile_checkpointed()
+
+
+register("openai", _openai_client)
+register("svi", _svi_lookup)
+register("stt", _stt_backend)
+register("rag_graph", _rag_graph)
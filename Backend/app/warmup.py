@@ -0,0 +1,138 @@
+"""
+Startup warm-up for long-running deployments (Docker/Render).
+
+When WARMUP_ON_STARTUP is set, the app lifespan starts warm_up() in the
+background: it pre-opens the DB pool over SSL, loads the SVI table, ZIP
+table and county shapes, builds the RAG graph, primes the OpenAI client's
+HTTP connection and starts the STT backend (with STT_BACKEND=local, every
+Whisper worker loads its model), recording per-step state and timings.
+/ready reports that state so a load balancer only routes to warm
+instances; /health stays a static liveness check.
+
+A failed step is retried in the background with exponential backoff
+(capped at WARMUP_RETRY_MAX_SECONDS) until it succeeds, so an instance
+that booted during a short DB outage becomes ready once the DB is back.
+SVI is optional, as it is for the routes: while it isn't loaded /ready
+still answers 200 and lists it under "degraded".
+
+Serverless (Vercel) leaves the flag unset and keeps lazy loading.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+
+from app import subsystems
+from app.db import engine
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.getenv("WARMUP_ON_STARTUP", "").lower() in ("1", "true", "yes")
+
+# step name → {"ready": bool, "seconds": float | None, "error": str | None}
+_state: dict[str, dict] = {}
+_phase = "disabled" if not WARMUP_ENABLED else "pending"
+
+_RETRY_BASE_SECONDS = 2.0
+_RETRY_MAX_SECONDS = float(os.getenv("WARMUP_RETRY_MAX_SECONDS", 60))
+
+# Steps /ready doesn't wait for; the routes work without them.
+_OPTIONAL = {"svi"}
+
+
+async def _warm_db() -> None:
+    pool = engine.sync_engine.pool
+    pool_size = pool.size() if hasattr(pool, "size") else 1
+    count = int(os.getenv("WARMUP_DB_CONNECTIONS", pool_size))
+    conns = [await engine.connect() for _ in range(count)]
+    try:
+        await asyncio.gather(*(c.execute(text("SELECT 1")) for c in conns))
+    finally:
+        # Returning the connections leaves them open in the pool.
+        for c in conns:
+            await c.close()
+
+
+async def _warm_svi() -> None:
+    lookup = await subsystems.aget("svi")
+    if lookup is None:
+        subsystems.reset("svi")  # so the retry loads it again
+        raise RuntimeError("SVI lookup unavailable")
+    # The ZIP table and county boundaries are loaded on first use otherwise.
+    await asyncio.to_thread(lookup.load_zip_table)
+    await asyncio.to_thread(lookup.load_county_shapes)
+
+
+async def _warm_openai() -> None:
+    client = await subsystems.aget("openai")
+    try:
+        # Any cheap authenticated call opens and pools the TLS connection.
+        await asyncio.to_thread(client.with_options(timeout=10, max_retries=0).models.list)
+    except Exception as exc:
+        logger.warning("Warm-up: OpenAI connection priming failed (client still usable): %s", exc)
+
+
+async def _warm_stt() -> None:
+    # Local Whisper loads its model in every pool worker; the OpenAI backend just builds the client.
+    backend = await subsystems.aget("stt")
+    await asyncio.to_thread(backend.warm)
+
+
+async def _warm_rag_graph() -> None:
+    await subsystems.aget("rag_graph")
+
+
+_STEPS: dict[str, Callable[[], Awaitable[None]]] = {
+    "db": _warm_db,
+    "svi": _warm_svi,
+    "openai": _warm_openai,
+    "stt": _warm_stt,
+    "rag_graph": _warm_rag_graph,
+}
+
+
+async def _run_step(name: str, step: Callable[[], Awaitable[None]]) -> None:
+    start = time.perf_counter()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            await step()
+            _state[name] = {"ready": True, "seconds": round(time.perf_counter() - start, 3), "error": None,
+                            "attempts": attempt}
+            logger.info("Warm-up: %s ready in %.2fs", name, _state[name]["seconds"])
+            return
+        except Exception as exc:
+            _state[name] = {"ready": False, "seconds": round(time.perf_counter() - start, 3), "error": str(exc),
+                            "attempts": attempt}
+            delay = min(_RETRY_BASE_SECONDS * 2 ** (attempt - 1), _RETRY_MAX_SECONDS)
+            logger.error("Warm-up: %s failed (attempt %d) — %s; retrying in %.0fs", name, attempt, exc, delay)
+            await asyncio.sleep(delay)
+
+
+async def warm_up() -> None:
+    """Run all warm-up steps concurrently; each is retried until it succeeds, failures are recorded, not raised."""
+    global _phase
+    _phase = "running"
+    for name in _STEPS:
+        _state[name] = {"ready": False, "seconds": None, "error": None, "attempts": 0}
+    await asyncio.gather(*(_run_step(name, step) for name, step in _STEPS.items()))
+    _phase = "complete"
+
+
+def readiness() -> tuple[bool, dict]:
+    """Return (ready, report) for the /ready endpoint."""
+    if not WARMUP_ENABLED:
+        report_steps = {
+            name: {"ready": subsystems.is_loaded(name), "seconds": subsystems.load_seconds(name), "error": None}
+            for name in subsystems.names()
+        }
+        return True, {"ready": True, "warmup": _phase, "degraded": [], "subsystems": report_steps}
+
+    ready = bool(_state) and all(s["ready"] for name, s in _state.items() if name not in _OPTIONAL)
+    degraded = sorted(name for name in _OPTIONAL if name in _state and not _state[name]["ready"])
+    return ready, {"ready": ready, "warmup": _phase, "degraded": degraded, "subsystems": dict(_state)}
@@ -0,0 +1,74 @@
+"""
+Audio normalization before STT (app/stt/normalize.py): bytes and seconds
+sent to the transcription API before and after, and the CPU time it costs.
+
+Inputs are synthetic recordings shaped like what browsers upload: 48 kHz
+stereo at browser-default bitrates (Opus/WebM from Chrome/Firefox,
+AAC/MP4 from Safari), with a few seconds of dead air before and after a
+minute of speech-like audio (voiced harmonics with syllable-rate
+modulation and short pauses).
+
+STT is billed per input second, and upload time scales with bytes.
+
+Run from Backend/:  python -m benchmarks.bench_audio_normalize
+"""
+import io
+import time
+
+import av
+import numpy as np
+
+from app.stt.normalize import normalize_audio
+
+RATE = 48_000
+
+
+def _speechlike(seconds: float, rng) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    f0 = 140 + 25 * np.sin(2 * np.pi * 0.4 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+    pauses = (np.sin(2 * np.pi * 0.15 * t) > -0.8).astype(float)
+    return 0.3 * voiced * syllables * pauses + 0.002 * rng.standard_normal(len(t))
+
+
+def _recording(lead: float, speech: float, tail: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    room = lambda s: 0.001 * rng.standard_normal(int(s * RATE))  # noqa: E731
+    mono = np.concatenate([room(lead), _speechlike(speech, rng), room(tail)])
+    return np.stack([mono, mono * 0.9]).astype(np.float32)
+
+
+def _encode(samples: np.ndarray, fmt: str, codec: str, bit_rate: int) -> bytes:
+    out = io.BytesIO()
+    with av.open(out, "w", format=fmt) as container:
+        stream = container.add_stream(codec, rate=RATE, layout="stereo")
+        stream.bit_rate = bit_rate
+        size = stream.codec_context.frame_size or 1024
+        for i, start in enumerate(range(0, samples.shape[1] - size + 1, size)):
+            frame = av.AudioFrame.from_ndarray(np.ascontiguousarray(samples[:, start:start + size]), format="fltp", layout="stereo")
+            frame.sample_rate, frame.pts = RATE, i * size
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return out.getvalue()
+
+
+CASES = [
+    ("webm/opus 128k", "recording.webm", "webm", "libopus", 128_000),
+    ("mp4/aac 128k", "recording.m4a", "mp4", "aac", 128_000),
+]
+
+if __name__ == "__main__":
+    samples = _recording(lead=4, speech=60, tail=8)
+    print(f"{'input':16} {'bytes':>18} {'seconds':>16} {'time':>8}")
+    for label, filename, fmt, codec, bit_rate in CASES:
+        raw = _encode(samples, fmt, codec, bit_rate)
+        start = time.perf_counter()
+        result = normalize_audio(raw, filename)
+        elapsed = time.perf_counter() - start
+        print(f"{label:16} {result.input_bytes / 1e6:6.2f} -> {result.output_bytes / 1e6:5.2f} MB "
+              f"{result.input_seconds:5.1f} -> {result.output_seconds:5.1f} s {elapsed * 1e3:6.0f} ms")
+        print(f"{'':16} {result.summary()}")
@@ -0,0 +1,80 @@
+"""
+Offline lat/lon -> county resolver (cdcsvi_lookup.latlon_to_stcnty*) that
+replaces the FCC Area API hop in zip_to_county.
+
+Reports:
+  load          one-time cost of reading county_shapes.npz and building the indexes
+  accuracy      hand-labelled points (city centres, independent cities, an
+                antimeridian island, open ocean) and the self-hit rate of
+                every county's own centroid
+  latency       single-point calls and the batch API over 10k points
+                (the FCC API is one HTTPS round trip per point, typically
+                100+ ms)
+
+Run from Backend/:  python -m benchmarks.bench_county_locator
+"""
+import importlib.util
+import os
+import time
+
+import numpy as np
+
+_LOOKUP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app", "LLM Parse", "cdcsvi_lookup.py")
+
+spec = importlib.util.spec_from_file_location("cdcsvi_lookup", _LOOKUP)
+cdcsvi = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cdcsvi)
+
+LABELLED = [
+    ("Kissimmee, FL", 28.2920, -81.4076, "12097"),
+    ("Orlando, FL", 28.5383, -81.3792, "12095"),
+    ("Key West, FL", 24.5551, -81.7800, "12087"),
+    ("Brooklyn, NY", 40.6782, -73.9442, "36047"),
+    ("Chicago, IL", 41.8781, -87.6298, "17031"),
+    ("New Orleans, LA", 29.9511, -90.0715, "22071"),
+    ("St. Louis (city), MO", 38.6270, -90.1994, "29510"),
+    ("Richmond (city), VA", 37.5407, -77.4360, "51760"),
+    ("Washington, DC", 38.9072, -77.0369, "11001"),
+    ("Juneau, AK", 58.3019, -134.4197, "02110"),
+    ("Adak, AK", 51.8800, -176.6500, "02016"),
+    ("Attu, AK (east of 180)", 52.9000, 173.2000, "02016"),
+    ("Honolulu, HI", 21.3069, -157.8583, "15003"),
+    ("Los Angeles, CA", 34.0522, -118.2437, "06037"),
+    ("Denver, CO", 39.7392, -104.9903, "08031"),
+    ("Atlantic Ocean", 30.0000, -60.0000, None),
+]
+
+
+def _us(fn, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    shapes = cdcsvi.load_county_shapes()
+    print(f"load            {time.perf_counter() - start:6.2f} s   "
+          f"({len(shapes['stcnty'])} counties, {shapes['edges'].shape[1]} banded edges)")
+
+    hits = sum(cdcsvi.latlon_to_stcnty(lat, lon) == expected for _, lat, lon, expected in LABELLED)
+    print(f"labelled        {hits}/{len(LABELLED)} correct")
+    for name, lat, lon, expected in LABELLED:
+        got = cdcsvi.latlon_to_stcnty(lat, lon)
+        if got != expected:
+            print(f"  miss: {name} -> {got} (expected {expected})")
+
+    centroids = shapes["centroid"]
+    own = cdcsvi.latlon_to_stcnty_many(centroids[:, 1], centroids[:, 0])
+    self_hits = sum(got == f"{code:05d}" for got, code in zip(own, shapes["stcnty"]))
+    print(f"centroids       {self_hits / len(own):6.1%} resolve to their own county")
+
+    rng = np.random.default_rng(0)
+    pick = rng.integers(0, len(centroids), 10_000)
+    lats = centroids[pick, 1] + rng.normal(0, 0.05, len(pick))
+    lons = centroids[pick, 0] + rng.normal(0, 0.05, len(pick))
+    single = _us(lambda: [cdcsvi.latlon_to_stcnty(a, b) for a, b in zip(lats[:1000].tolist(), lons[:1000].tolist())], 3) / 1000
+    batch = _us(lambda: cdcsvi.latlon_to_stcnty_many(lats, lons), 3) / len(lats)
+    print(f"single point    {single:6.1f} us/lookup")
+    print(f"batch (10k)     {batch:6.1f} us/lookup")
@@ -0,0 +1,127 @@
+"""
+Single-call vs sectioned extraction (app/llm_parse/parser.py): wall-clock
+time and token usage.
+
+By default the calls go to a local fake OpenAI server whose latency follows
+the usual shape of a chat completion: fixed time to first token, prefill
+proportional to prompt tokens, then decode proportional to output tokens.
+It answers with a fixed reference form cut down to the requested
+sub-schema, and reports usage with tokens estimated as characters / 4.
+Absolute numbers are a model, not a measurement; the split between modes is
+what matters. With --live the real API is used (needs OPENAI_API_KEY) and
+usage comes from the API.
+
+Run from Backend/:  python -m benchmarks.bench_extraction_modes [--live] [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TTFT_SECONDS = 0.35
+PREFILL_TOKENS_PER_SECOND = 8_000
+DECODE_TOKENS_PER_SECOND = 90
+
+TRANSCRIPT = """\
+Okay, this is Maria Lopez giving report on John Doe in room 312, date of birth March 14th 1958.
+He's full code, allergic to penicillin, causes hives. He came in three days ago for community-acquired
+pneumonia, right lower lobe on the chest x-ray. History of hypertension, type 2 diabetes and COPD.
+No procedures other than the chest x-ray and blood cultures, cultures are still pending.
+Last set of vitals: temp 99.1, heart rate 88, resp rate 18, blood pressure 128 over 76, sat 95 percent
+on two liters nasal cannula. Pain is about a 3 out of 10, mostly pleuritic when he coughs.
+He's on ceftriaxone one gram IV every 24 hours and azithromycin 500 milligrams IV daily, metformin
+is on hold, lisinopril 10 milligrams PO daily, insulin sliding scale with meals, albuterol nebs every
+four hours as needed, and acetaminophen 650 every six hours PRN for pain or fever.
+Blood sugars have been 140 to 180. He's ambulating to the bathroom with one assist, tolerating a
+cardiac diabetic diet, good urine output. Plan is to wean the oxygen, repeat the chest x-ray tomorrow,
+and follow up on the cultures. Family is his daughter, she's calling around noon.
+""" * 2
+
+REFERENCE_FORM = {
+    "patient_information": {"patient_id": None, "name": "John Doe", "dob": "1958-03-14", "room": "312",
+                            "allergies": "Penicillin (hives)", "code_status": "Full code",
+                            "reason_for_admission": "Community-acquired pneumonia, right lower lobe",
+                            "geolocation": None},
+    "background": {"relevant_pmh": "Hypertension, type 2 diabetes, COPD", "hospital_day": 3,
+                   "post_op_day": None, "procedures": "Chest x-ray, blood cultures (pending)"},
+    "vital_signs": {"temperature_f": 99.1, "heart_rate": 88, "respiratory_rate": 18,
+                    "bp_systolic": 128, "bp_diastolic": 76, "spo2": 95},
+    "current_assessment": {"pain_level_0_10": 3, "additional_info": (
+        "Pleuritic pain with coughing, 3/10. SpO2 95% on 2 L nasal cannula; plan to wean oxygen. "
+        "Blood glucose 140-180 on sliding-scale insulin with meals, metformin on hold. Ambulating to "
+        "bathroom with one assist, tolerating cardiac/diabetic diet, good urine output. Repeat chest "
+        "x-ray tomorrow; follow up pending blood cultures. Daughter calling around noon.")},
+    "nurse_on_shift": "Maria Lopez",
+    "medications": [
+        {"name": "Ceftriaxone", "dose": "1 g IV", "frequency": "every 24 hours"},
+        {"name": "Azithromycin", "dose": "500 mg IV", "frequency": "daily"},
+        {"name": "Metformin", "dose": None, "frequency": "on hold"},
+        {"name": "Lisinopril", "dose": "10 mg PO", "frequency": "daily"},
+        {"name": "Insulin", "dose": "sliding scale", "frequency": "with meals"},
+        {"name": "Albuterol", "dose": "nebulizer", "frequency": "every 4 hours PRN"},
+        {"name": "Acetaminophen", "dose": "650 mg", "frequency": "every 6 hours PRN pain or fever"},
+    ],
+}
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.complete(json.loads(self.rfile.read(int(self.headers["content-length"]))))
+
+    def complete(self, body: dict) -> None:
+        keys = body["response_format"]["json_schema"]["schema"]["properties"]
+        content = json.dumps({k: REFERENCE_FORM[k] for k in keys})
+        prompt_tokens = sum(_tokens(m["content"]) for m in body["messages"]) + _tokens(
+            json.dumps(body["response_format"]))
+        completion_tokens = _tokens(content)
+        time.sleep(TTFT_SECONDS + prompt_tokens / PREFILL_TOKENS_PER_SECOND
+                   + completion_tokens / DECODE_TOKENS_PER_SECOND)
+        raw = json.dumps({
+            "id": "chatcmpl-fake", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="call the real OpenAI API")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if not args.live:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+        os.environ["OPENAI_API_KEY"] = "sk-fake"
+
+    from app.llm_parse.parser import SECTIONS, extract_form
+
+    print(f"{'mode':10} {'wall p50':>9} {'wall max':>9} {'prompt tok':>11} {'completion tok':>15}")
+    forms = {}
+    for mode in ("single", "sectioned"):
+        walls = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            forms[mode], usage = extract_form(TRANSCRIPT, mode)
+            walls.append(time.perf_counter() - start)
+        print(f"{mode:10} {statistics.median(walls):8.2f}s {max(walls):8.2f}s "
+              f"{usage['prompt_tokens']:11d} {usage['completion_tokens']:15d}")
+    print(f"sections: {[' + '.join(s) for s in SECTIONS]}")
+    print(f"merged form identical to single-call form: {forms['single'] == forms['sectioned']}")
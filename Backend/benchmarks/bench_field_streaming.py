@@ -0,0 +1,106 @@
+"""
+Time to first form field: blocking extraction vs streamed extraction with
+incremental field parsing (extract_form(on_field=...), app/llm_parse/partial_json.py).
+
+Uses the fake OpenAI server and latency model from bench_extraction_modes,
+extended to stream: the response is sent as server-sent chunks of ~4
+characters (about one token) paced at the decode rate after the time to
+first token and prefill. Without streaming the nurse sees nothing until the
+whole form is decoded, and in the app not until the verify/regenerate loop
+has finished as well; with streaming each field is shown as soon as the
+model has written it. --audit-seconds adds the verify loop's time to the
+blocking column to show what the client waits for end to end.
+
+Run from Backend/:  python -m benchmarks.bench_field_streaming [--runs 5] [--audit-seconds 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from benchmarks.bench_extraction_modes import (
+    DECODE_TOKENS_PER_SECOND,
+    PREFILL_TOKENS_PER_SECOND,
+    REFERENCE_FORM,
+    TRANSCRIPT,
+    TTFT_SECONDS,
+    FakeOpenAI,
+    _tokens,
+)
+
+
+class FakeStreamingOpenAI(FakeOpenAI):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        if not body.get("stream"):
+            return self.complete(body)
+
+        keys = body["response_format"]["json_schema"]["schema"]["properties"]
+        content = json.dumps({k: REFERENCE_FORM[k] for k in keys})
+        prompt_tokens = sum(_tokens(m["content"]) for m in body["messages"]) + _tokens(
+            json.dumps(body["response_format"]))
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.end_headers()
+        time.sleep(TTFT_SECONDS + prompt_tokens / PREFILL_TOKENS_PER_SECOND)
+
+        def send(payload: dict) -> None:
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+            self.wfile.flush()
+
+        base = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": 0, "model": body["model"]}
+        for i in range(0, len(content), 4):
+            send({**base, "choices": [{"index": 0, "delta": {"content": content[i:i + 4]}, "finish_reason": None}]})
+            time.sleep(1 / DECODE_TOKENS_PER_SECOND)
+        send({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        send({**base, "choices": [], "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": _tokens(content),
+                                               "total_tokens": prompt_tokens + _tokens(content)}})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+def _streamed(extract_form, mode: str) -> tuple[float, float, int]:
+    """(time to first field, time to last field, fields seen)."""
+    start = time.perf_counter()
+    seen: list[float] = []
+    lock = threading.Lock()
+
+    def on_field(path, value):
+        with lock:
+            seen.append(time.perf_counter() - start)
+
+    extract_form(TRANSCRIPT, mode, on_field=on_field)
+    return seen[0], seen[-1], len(seen)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--audit-seconds", type=float, default=20.0,
+                        help="verify/regenerate loop time added to the blocking path")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeStreamingOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ["OPENAI_API_KEY"] = "sk-fake"
+
+    from app.llm_parse.parser import extract_form
+
+    print(f"{'mode':10} {'blocking':>9} {'+ verify':>9} {'1st field':>10} {'last field':>11} {'fields':>7}")
+    for mode in ("single", "sectioned"):
+        blocking, first, last = [], [], []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            extract_form(TRANSCRIPT, mode)
+            blocking.append(time.perf_counter() - start)
+            to_first, to_last, count = _streamed(extract_form, mode)
+            first.append(to_first)
+            last.append(to_last)
+        b = statistics.median(blocking)
+        print(f"{mode:10} {b:8.2f}s {b + args.audit_seconds:8.2f}s {statistics.median(first):9.2f}s "
+              f"{statistics.median(last):10.2f}s {count:7d}")
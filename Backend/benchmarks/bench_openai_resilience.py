@@ -0,0 +1,155 @@
+"""
+app/resilience.py against a local fake OpenAI server that injects latency
+and faults. The real call sites are exercised: generate_form (parse) over
+the OpenAI SDK and verify_node (audit) over LangChain, both pointed at the
+fake server through OPENAI_BASE_URL.
+
+Scenarios (budgets scaled down so the run takes seconds, not minutes):
+
+  tail      10% of responses take 3 s, the rest ~50 ms. "before" is the
+            SDK's own defaults; "after" adds per-attempt timeouts and
+            p95-triggered hedging. Reports p50/p95/p99/max.
+  flaky     30% of requests fail with 500 or 429. Reports success rate.
+  outage    every request fails with 503. Reports how long callers wait
+            before the breaker opens, and how fast they fail afterwards.
+  recovery  the upstream comes back; the half-open trial closes the breaker.
+
+Run from Backend/:  python -m benchmarks.bench_openai_resilience
+"""
+import json
+import logging
+import os
+import random
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    slow_rate = 0.0       # fraction of requests delayed by slow_seconds
+    slow_seconds = 3.0
+    fault_rate = 0.0      # fraction answered with an error status
+    fault_statuses = (500, 429)
+    calls = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):  # models.list (warm-up)
+        self._send(200, {"object": "list", "data": []})
+
+    def do_POST(self):
+        type(self).calls += 1
+        body = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+        time.sleep(self.slow_seconds if random.random() < self.slow_rate else random.uniform(0.03, 0.07))
+        if random.random() < self.fault_rate:
+            status = random.choice(self.fault_statuses)
+            headers = {"retry-after": "0.1"} if status == 429 else {}
+            return self._send(status, {"error": {"message": "injected", "type": "server_error"}}, headers)
+        schema_name = ((body.get("response_format") or {}).get("json_schema") or {}).get("name", "")
+        content = '{"is_valid": true, "errors": []}' if schema_name == "VerificationResult" else "{}"
+        self._send(200, {
+            "id": "chatcmpl-fake", "object": "chat.completion", "created": 0, "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        })
+
+    def _send(self, status: int, payload: dict, headers: dict | None = None):
+        raw = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(raw)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+# Abandoned attempts close their connection on time; the late reply has nowhere to go.
+server.handle_error = lambda request, client_address: None
+threading.Thread(target=server.serve_forever, daemon=True).start()
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+os.environ["OPENAI_API_KEY"] = "sk-fake"
+os.environ["OPENAI_HEDGING"] = "1"
+os.environ["OPENAI_BREAKER_RESET_SECONDS"] = "1"
+
+from openai import OpenAI  # noqa: E402
+
+from app import resilience  # noqa: E402
+from app.llm_parse.parser import generate_form  # noqa: E402
+from app.RAG.node_verify import verify_node  # noqa: E402
+
+# Scaled-down budgets: seconds instead of minutes.
+resilience.POLICIES["parse"] = resilience.Policy(deadline=4, attempt_timeout=1.0, backoff_base=0.05, hedge_after=0.5)
+resilience.POLICIES["audit"] = resilience.Policy(deadline=4, attempt_timeout=1.0, backoff_base=0.05, hedge_after=0.5)
+
+STATE = {"transcript": "Patient in 312, vitals stable.", "extracted_form": {}, "loop_count": 0}
+
+
+def _configure(slow=0.0, fault=0.0, statuses=(500, 429)):
+    FakeOpenAI.slow_rate, FakeOpenAI.fault_rate, FakeOpenAI.fault_statuses = slow, fault, statuses
+
+
+def _run(fn, n: int) -> tuple[list[float], int]:
+    latencies, ok = [], 0
+    for _ in range(n):
+        start = time.perf_counter()
+        try:
+            fn()
+            ok += 1
+        except Exception:
+            pass
+        latencies.append(time.perf_counter() - start)
+    return latencies, ok
+
+
+def _pct(values: list[float], q: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(q * len(values)))]
+
+
+def _report(label: str, latencies: list[float], ok: int) -> None:
+    print(f"  {label:26} ok {ok:3d}/{len(latencies)}  p50 {statistics.median(latencies) * 1e3:6.0f} ms  "
+          f"p95 {_pct(latencies, 0.95) * 1e3:6.0f} ms  p99 {_pct(latencies, 0.99) * 1e3:6.0f} ms  "
+          f"max {max(latencies) * 1e3:6.0f} ms")
+
+
+if __name__ == "__main__":
+    logging.getLogger("app.resilience").setLevel(logging.CRITICAL)  # per-attempt warnings would drown the report
+    random.seed(0)
+    sdk_defaults = OpenAI()  # timeout 600 s, max_retries 2
+
+    def before():
+        sdk_defaults.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "x"}])
+
+    print("tail: 10% of responses take 3 s")
+    _configure(slow=0.10)
+    _run(lambda: generate_form("warm-up"), 25)  # enough samples for the p95 hedge threshold
+    _report("before (SDK defaults)", *_run(before, 100))
+    _report("after  parse", *_run(lambda: generate_form(STATE["transcript"]), 100))
+    _report("after  audit (LangChain)", *_run(lambda: verify_node(STATE), 100))
+
+    print("flaky: 30% of requests fail with 500/429")
+    _configure(fault=0.30)
+    raw = OpenAI(max_retries=0)
+    _report("before (no retries)", *_run(lambda: raw.chat.completions.create(
+        model="gpt-4o-mini", messages=[{"role": "user", "content": "x"}]), 100))
+    _report("after  parse", *_run(lambda: generate_form(STATE["transcript"]), 100))
+
+    print("outage: every request fails with 503")
+    _configure(fault=1.0, statuses=(503,))
+    FakeOpenAI.calls = 0
+    latencies, ok = _run(lambda: generate_form(STATE["transcript"]), 20)
+    opened_after = next(i for i, t in enumerate(latencies) if t < 0.01)
+    print(f"  breaker {resilience.breaker.state} after {opened_after} calls "
+          f"({FakeOpenAI.calls} upstream requests); later calls fail in "
+          f"{statistics.median(latencies[opened_after:]) * 1e6:.0f} us")
+
+    print("recovery: upstream healthy again")
+    _configure()
+    time.sleep(resilience.breaker.reset_seconds)
+    _report("after  parse", *_run(lambda: generate_form(STATE["transcript"]), 20))
+    print(f"  breaker {resilience.breaker.state}")
+    server.shutdown()
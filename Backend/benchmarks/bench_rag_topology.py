@@ -0,0 +1,193 @@
+"""
+RAG graph topologies (RAG_TOPOLOGY, app/RAG/graph.py): the three-node
+graph (verify_node audits, regenerate_node corrects) vs the fused one
+(audit_correct_node audits and corrects in one call), on latency and on
+how many fields of the final form are right.
+
+Offline the model calls are scripted, as in bench_verify_loop: the auditor
+flags every field that differs from the reference form of
+bench_extraction_modes, and each scenario's corrector behaves differently:
+
+  clean        the extraction is already right
+  fixes_all    fixes every flagged field
+  one_per_pass fixes one flagged field per correction (3 wrong fields)
+  no_op        returns the form unchanged
+  flailing     replaces each flagged value with a different wrong value
+
+The fused model audits the same way and corrects as the scenario's
+corrector would. Latency is modelled per call with bench_extraction_modes'
+shape (time to first token + prefill + decode, tokens = characters / 4)
+and summed over the calls after extraction, which both topologies share.
+Scripted models agree by construction, so offline accuracy only shows that
+a topology loses or keeps corrections, not how well a model corrects.
+
+With --live (needs OPENAI_API_KEY) each sample is extracted once and both
+topologies verify that same form with the real API; reported are wall
+time, model calls and atomic fields right against the sample's reference
+form (see bench_transcript_condense).
+
+Run from Backend/:  python -m benchmarks.bench_rag_topology [--live] [--runs 3]
+"""
+import argparse
+import copy
+import json
+import logging
+import os
+import statistics
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-unused")
+
+from app import resilience  # noqa: E402
+from app.RAG import node_audit_correct, node_generate, node_regenerate, node_verify  # noqa: E402
+from app.RAG.convergence import flatten  # noqa: E402
+from app.RAG.graph import TOPOLOGIES, build  # noqa: E402
+from benchmarks.bench_extraction_modes import (  # noqa: E402
+    DECODE_TOKENS_PER_SECOND, PREFILL_TOKENS_PER_SECOND, REFERENCE_FORM, TRANSCRIPT, TTFT_SECONDS, _tokens,
+)
+
+TRUTH = REFERENCE_FORM
+WRONG = {"vital_signs.heart_rate": 98, "patient_information.room": "213", "background.hospital_day": 5}
+SCENARIOS = ("clean", "fixes_all", "one_per_pass", "no_op", "flailing")
+
+_generate_form = node_generate.generate_form  # the real extraction, for --live
+
+
+def _set(form: dict, path: str, value) -> None:
+    *parents, last = path.split(".")
+    for part in parents:
+        form = form[part]
+    form[last] = value
+
+
+class Model:
+    """Scripted stand-in for every model call of a run; keeps each call's modelled latency."""
+
+    def __init__(self, mode: str, latencies: list[float]):
+        self.mode, self.latencies = mode, latencies
+
+    def _bill(self, messages, output) -> None:
+        prompt_tokens = sum(_tokens(m["content"]) for m in messages)
+        completion_tokens = _tokens(json.dumps(output))
+        self.latencies.append(TTFT_SECONDS + prompt_tokens / PREFILL_TOKENS_PER_SECOND
+                              + completion_tokens / DECODE_TOKENS_PER_SECOND)
+
+    def _errors(self, shown: dict) -> list[str]:
+        truth = flatten(TRUTH)
+        return [f"{path}: transcript says {truth[path]!r}, not {value!r}"
+                for path, value in flatten(shown).items() if truth.get(path) != value]
+
+    def _correct(self, form: dict, errors: list[str]) -> dict:
+        form, truth = copy.deepcopy(form), flatten(TRUTH)
+        for i, path in enumerate(e.split(":", 1)[0] for e in errors):
+            if self.mode == "fixes_all" or (self.mode == "one_per_pass" and i == 0):
+                _set(form, path, truth[path])
+            elif self.mode == "flailing":
+                _set(form, path, f"{flatten(form)[path]}0")
+        return form
+
+
+class Auditor(Model):
+    def invoke(self, messages, timeout=None):
+        errors = self._errors(json.loads(messages[1]["content"].rsplit(":\n", 1)[1]))
+        result = node_verify.VerificationResult(is_valid=not errors, errors=errors)
+        self._bill(messages, result.model_dump())
+        return result
+
+
+class Corrector(Model):
+    def invoke(self, messages, timeout=None):
+        body = messages[1]["content"]
+        form = json.loads(body.split("PREVIOUSLY EXTRACTED JSON:\n", 1)[1].split("\n\nVERIFICATION ERRORS:", 1)[0])
+        errors = [line[2:] for line in body.split("VERIFICATION ERRORS:\n", 1)[1].splitlines()]
+        corrected = self._correct(form, errors)
+        self._bill(messages, corrected)
+        return corrected
+
+
+class AuditCorrector(Model):
+    def invoke(self, messages, timeout=None):
+        form = json.loads(messages[1]["content"].rsplit(":\n", 1)[1])
+        errors = self._errors(form)
+        result = {"is_valid": not errors, "errors": errors,
+                  "corrected_form": self._correct(form, errors) if errors else None}
+        self._bill(messages, result)
+        return result
+
+
+def _initial(mode: str) -> dict:
+    form = copy.deepcopy(TRUTH)
+    if mode != "clean":
+        for path, value in WRONG.items():
+            _set(form, path, value)
+    return form
+
+
+def _right(form: dict) -> tuple[int, int]:
+    truth, got = flatten(TRUTH), flatten(form)
+    return sum(got.get(path) == value for path, value in truth.items()), len(truth)
+
+
+def offline() -> None:
+    graphs = {topology: build(topology).compile() for topology in TOPOLOGIES}
+    print(f"{'scenario':13} {'calls':>8} {'model latency':>17} {'fields right':>15}  stop reason")
+    for mode in SCENARIOS:
+        node_generate.generate_form = lambda transcript, on_field=None, mode=mode: _initial(mode)
+        results = {}
+        for topology, graph in graphs.items():
+            latencies: list[float] = []
+            node_verify._auditor = Auditor(mode, latencies)
+            node_regenerate._corrector = Corrector(mode, latencies)
+            node_audit_correct._auditor = AuditCorrector(mode, latencies)
+            state = graph.invoke({"transcript": TRANSCRIPT})
+            results[topology] = (len(latencies), sum(latencies), _right(state["extracted_form"]),
+                                 state["termination_reason"])
+        (c3, l3, (r3, n), s3), (cf, lf, (rf, _), sf) = results["three_node"], results["fused"]
+        print(f"{mode:13} {c3:>3} -> {cf:<3} {l3:6.2f}s -> {lf:5.2f}s {r3:>5}/{n} -> {rf}/{n}  "
+              f"{s3}{'' if s3 == sf else f' -> {sf}'}")
+
+
+def live(runs: int) -> None:
+    from benchmarks.bench_transcript_condense import _samples, _score
+
+    calls = {"n": 0}
+    resilience_call = resilience.call
+
+    def counting_call(op, fn, *args, **kwargs):
+        calls["n"] += 1
+        return resilience_call(op, fn, *args, **kwargs)
+
+    resilience.call = counting_call
+    graphs = {topology: build(topology).compile() for topology in TOPOLOGIES}
+
+    print(f"\n{'sample':20} {'topology':11} {'wall p50':>9} {'calls':>6} {'fields right':>13}  stop reasons")
+    for name, (transcript, reference) in _samples().items():
+        if reference is None:
+            continue
+        extracted = _generate_form(transcript)
+        node_generate.generate_form = lambda t, on_field=None, form=extracted: copy.deepcopy(form)
+        for topology, graph in graphs.items():
+            walls, counts, scores, reasons = [], [], [], []
+            for _ in range(runs):
+                calls["n"] = 0
+                start = time.perf_counter()
+                state = graph.invoke({"transcript": transcript})
+                walls.append(time.perf_counter() - start)
+                counts.append(calls["n"])
+                scores.append(_score(reference, state["extracted_form"]))
+                reasons.append(state["termination_reason"])
+            ok, total = min(scores)
+            print(f"{name:20} {topology:11} {statistics.median(walls):8.2f}s {statistics.median(counts):>6} "
+                  f"{ok:>6}/{total:<6}  {', '.join(reasons)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="also run both topologies against the real API")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.getLogger("app.RAG").setLevel(logging.ERROR)
+    offline()
+    if args.live:
+        live(args.runs)
@@ -0,0 +1,128 @@
+"""
+Serialization cost of the get_form and list_sessions response paths.
+
+"before" reproduces what FastAPI did when routes returned PatientOut (or a
+plain list) with the default JSONResponse: construct the model, re-validate
+it through the route's response_model field, then json.dumps the result.
+"after" is the current path: the row is validated once against PatientOut
+(list_sessions rows carry no form columns and go straight to orjson) and
+the dict is serialized with orjson. Both paths must produce the same JSON;
+the script checks that before timing them.
+
+Run from Backend/:  python -m benchmarks.bench_serialization
+"""
+import asyncio
+import json
+import timeit
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.schemas.patient import PatientOut, patient_out_from_row
+
+ROW = {
+    "id": 42,
+    "nurse": {"name": "Maria Lopez"},
+    "patient_info": {
+        "name": "John Doe",
+        "DOB": 67,
+        "room_num": 312,
+        "allergies": "Penicillin",
+        "code_status": "DNR",
+        "reason_for_admission": "Community-acquired pneumonia",
+        "geo_location": "Osceola County, Florida",
+    },
+    "background": {
+        "past_medical_history": ["HTN", "T2DM", "COPD"],
+        "hospital_day": 3,
+        "procedures": ["CXR", "Blood cultures"],
+    },
+    "current_assessment": {
+        "pain_level_0_10": 3,
+        "additional_info": "Afebrile overnight, tolerating diet, ambulating with assistance.",
+    },
+    "vital_signs": {"temp_c": 37.2, "hr_bpm": 88, "rr_bpm": 18, "bp_sys": 132, "bp_dia": 78},
+    "medications": [
+        {"id": f"ai-med-{i}", "name": name, "dose": dose, "frequency": freq, "source": "AI"}
+        for i, (name, dose, freq) in enumerate([
+            ("Ceftriaxone", "1 g", "q24h"),
+            ("Azithromycin", "500 mg", "daily"),
+            ("Metformin", "500 mg", "BID"),
+            ("Lisinopril", "10 mg", "daily"),
+        ])
+    ],
+    "version": 7,
+}
+
+_NOW = datetime.now(timezone.utc)
+SESSION_ROWS = [
+    {
+        "id": i,
+        "name": "John Doe",
+        "room_num": 300 + i,
+        "created_at": _NOW,
+        "updated_at": _NOW,
+        "status": "complete",
+        "progress": 100,
+        "missing": 2,
+        "uncertain": 0,
+        "follow_ups": 1,
+    }
+    for i in range(20)
+]
+
+
+def _response_field():
+    app = FastAPI()
+
+    @app.get("/form", response_model=PatientOut)
+    def _form():
+        ...
+
+    route = next(r for r in app.routes if isinstance(r, APIRoute))
+    return route.response_field
+
+
+_FIELD = _response_field()
+_loop = asyncio.new_event_loop()
+
+
+def get_form_before() -> bytes:
+    out = PatientOut(**ROW)
+    content = _loop.run_until_complete(serialize_response(field=_FIELD, response_content=out))
+    return JSONResponse(content).body
+
+
+def get_form_after() -> bytes:
+    return ORJSONResponse(patient_out_from_row(ROW)).body
+
+
+def list_sessions_before() -> bytes:
+    content = _loop.run_until_complete(serialize_response(response_content=SESSION_ROWS))
+    return JSONResponse(content).body
+
+
+def list_sessions_after() -> bytes:
+    return ORJSONResponse(SESSION_ROWS).body
+
+
+def _bench(fn, number: int) -> float:
+    """Best-of-5 microseconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+if __name__ == "__main__":
+    for name, before, after in [
+        ("get_form", get_form_before, get_form_after),
+        ("list_sessions", list_sessions_before, list_sessions_after),
+    ]:
+        assert json.loads(before()) == json.loads(after()), f"{name}: responses differ"
+    for name, before, after, number in [
+        ("get_form", get_form_before, get_form_after, 5000),
+        ("list_sessions (20 rows)", list_sessions_before, list_sessions_after, 2000),
+    ]:
+        b = _bench(before, number)
+        a = _bench(after, number)
+        print(f"{name:<24} before {b:8.1f} us   after {a:8.1f} us   speedup {b / a:5.1f}x")
@@ -0,0 +1,59 @@
+"""
+Cold-start cost of the Vercel entry point (api/index.py).
+
+Each scenario runs in a fresh interpreter and reports wall-clock import time
+and peak RSS:
+
+  lazy   import api/index.py only (what /health and GET /sessions pay now)
+  eager  import, then initialize every registered subsystem (the old
+         import-time behaviour: pandas + SVI CSV, langgraph, OpenAI clients)
+
+Run from Backend/:  python -m benchmarks.bench_startup
+"""
+import json
+import os
+import subprocess
+import sys
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+_SCRIPT = """
+import json, os, resource, sys, time
+sys.path.insert(0, os.path.join({root!r}, "api"))
+start = time.perf_counter()
+import index
+from app import subsystems
+loads = {{}}
+if {eager!r}:
+    for name in subsystems.names():
+        t = time.perf_counter()
+        subsystems.get(name)
+        loads[name] = round(time.perf_counter() - t, 3)
+elapsed = time.perf_counter() - start
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({{"seconds": elapsed, "rss_mb": rss_mb, "loads": loads}}))
+"""
+
+
+def _run(eager: bool) -> dict:
+    env = {
+        "DATABASE_URL": "postgresql://bench@localhost/bench",
+        "OPENAI_API_KEY": "sk-bench",
+        **os.environ,
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", _SCRIPT.format(root=_REPO_ROOT, eager=eager)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    runs = 3
+    for label, eager in [("lazy", False), ("eager", True)]:
+        results = [_run(eager) for _ in range(runs)]
+        best = min(results, key=lambda r: r["seconds"])
+        print(f"{label:<6} import {best['seconds']:6.2f} s   peak RSS {best['rss_mb']:7.1f} MB")
+        if best["loads"]:
+            for name, secs in best["loads"].items():
+                print(f"         {name:<10} {secs:6.2f} s")
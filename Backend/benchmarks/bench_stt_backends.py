@@ -0,0 +1,75 @@
+"""
+Latency per audio minute of the STT backends (app/stt/backends.py).
+
+For each backend: start-up cost (client creation, or model load in every
+local worker), then each file transcribed on its own (seconds of
+processing per minute of audio, i.e. real-time factor x 60), then all files
+submitted at once to show pool throughput (audio minutes per wall minute).
+
+Pass real recordings for meaningful numbers; without arguments a synthetic
+72 s speech-like clip from bench_audio_normalize is used, which measures
+latency but not accuracy. The local backend needs faster-whisper and a
+model (STT_LOCAL_MODEL); openai needs OPENAI_API_KEY.
+
+Run from Backend/:
+    python -m benchmarks.bench_stt_backends [--backends openai,local] [--repeat 2] [file ...]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.stt.backends import load_backend
+from app.stt.normalize import decode_pcm
+from benchmarks.bench_audio_normalize import _encode, _recording
+
+
+def _inputs(paths: list[str]) -> list[tuple[str, bytes, float]]:
+    if not paths:
+        raw = _encode(_recording(lead=4, speech=60, tail=8), "webm", "libopus", 128_000)
+        return [("synthetic.webm", raw, decode_pcm(raw)[1])]
+    out = []
+    for path in paths:
+        with open(path, "rb") as f:
+            raw = f.read()
+        out.append((path, raw, decode_pcm(raw)[1]))
+    return out
+
+
+def bench(name: str, inputs: list[tuple[str, bytes, float]], repeat: int) -> None:
+    start = time.perf_counter()
+    backend = load_backend(name)
+    backend.warm()
+    print(f"[{name}] start-up {time.perf_counter() - start:.2f} s")
+
+    for filename, raw, seconds in inputs:
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            text = backend.transcribe(raw, filename)
+            times.append(time.perf_counter() - t0)
+        best = min(times)
+        print(f"[{name}] {filename}: {seconds:.1f} s audio, {best:.2f} s "
+              f"-> {best / (seconds / 60):.2f} s per audio minute ({len(text)} chars)")
+
+    jobs = inputs * repeat
+    audio_minutes = sum(s for _, _, s in jobs) / 60
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        list(pool.map(lambda job: backend.transcribe(job[1], job[0]), jobs))
+    wall = time.perf_counter() - t0
+    print(f"[{name}] concurrent x{len(jobs)}: {wall:.2f} s wall, {audio_minutes / (wall / 60):.1f} audio min per wall min")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--backends", default="openai,local")
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    inputs = _inputs(args.files)
+    for name in args.backends.split(","):
+        try:
+            bench(name.strip(), inputs, args.repeat)
+        except Exception as exc:
+            print(f"[{name}] unavailable: {exc}")
@@ -0,0 +1,83 @@
+"""
+Hit rate and latency of county/state resolution: the previous exact matcher
+(lowercase, drop " county", compare full state names) vs the alias index in
+cdcsvi_lookup.py.
+
+Two corpora:
+
+  handwritten  benchmarks/data/svi_location_corpus.csv — spellings as they
+               show up in transcripts (abbreviations, "Saint", apostrophes,
+               accents, parishes, boroughs, independent cities), hand-labelled
+               with the expected STCNTY
+  generated    every county in the table rendered as "<name>, <ST>",
+               "<name without suffix>, <State>" and a punctuation-free
+               lowercase form
+
+Run from Backend/:  python -m benchmarks.bench_svi_aliases
+"""
+import csv
+import importlib.util
+import os
+import re
+import timeit
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_CORPUS = os.path.join(_HERE, "data", "svi_location_corpus.csv")
+_LOOKUP = os.path.join(_HERE, "..", "app", "LLM Parse", "cdcsvi_lookup.py")
+
+spec = importlib.util.spec_from_file_location("cdcsvi_lookup", _LOOKUP)
+cdcsvi = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cdcsvi)
+df = cdcsvi.svi_df
+
+# The previous matcher, reproduced over the same table: lowercase, drop
+# " county", then a boolean mask over normalized categorical columns per call.
+_COUNTY_NORM = df["COUNTY"].astype(str).str.lower().str.replace(" county", "", regex=False).astype("category")
+_STATE_NORM = df["STATE"].astype(str).str.lower().astype("category")
+
+
+def legacy_resolve(location: str) -> str | None:
+    parts = [x.strip().lower() for x in location.split(",")]
+    if len(parts) != 2:
+        return None
+    county, state = parts
+    match = df["STCNTY"][(_COUNTY_NORM == county.replace(" county", "")) & (_STATE_NORM == state)]
+    return f"{match.iloc[0]:05d}" if not match.empty else None
+
+
+def _handwritten() -> list[tuple[str, str | None]]:
+    with open(_CORPUS, newline="", encoding="utf-8") as f:
+        return [(row["location"], row["stcnty"] or None) for row in csv.DictReader(f)]
+
+
+def _generated() -> list[tuple[str, str | None]]:
+    corpus = []
+    for county, state, abbr, stcnty in zip(
+        df["COUNTY"].astype(str), df["STATE"].astype(str), df["ST_ABBR"].astype(str), df["STCNTY"]
+    ):
+        expected = f"{stcnty:05d}"
+        bare = re.sub(r" (County|Parish|Borough|Census Area|City and Borough|Municipality|Planning Region)$", "", county)
+        corpus.append((f"{county}, {abbr}", expected))
+        corpus.append((f"{bare}, {state}", expected))
+        corpus.append((f"{re.sub(r'[^A-Za-z ]', '', county).lower()}, {state.lower()}", expected))
+    return corpus
+
+
+def _hit_rate(resolve, corpus) -> float:
+    return sum(resolve(loc) == expected for loc, expected in corpus) / len(corpus)
+
+
+def _us_per_lookup(resolve, corpus) -> float:
+    locations = [loc for loc, _ in corpus][:2000]
+    best = min(timeit.repeat(lambda: [resolve(loc) for loc in locations], number=1, repeat=3))
+    return best / len(locations) * 1e6
+
+
+if __name__ == "__main__":
+    for label, corpus in [("handwritten", _handwritten()), ("generated", _generated())]:
+        print(f"{label} ({len(corpus)} locations)")
+        for name, resolve in [("legacy exact", legacy_resolve), ("alias index", cdcsvi.resolve_stcnty)]:
+            print(
+                f"  {name:<13} hit rate {_hit_rate(resolve, corpus):6.1%}"
+                f"   {_us_per_lookup(resolve, corpus):6.2f} us/lookup"
+            )
@@ -0,0 +1,197 @@
+"""
+Transcript condensation (app/RAG/condense.py): how many prompt tokens it
+saves and whether the facts the form needs survive it.
+
+Samples: the two transcripts in "LLM Parse/transcripts", the handoff
+report from bench_extraction_modes (read out twice, as when a recording
+loops), benchmarks/data/noisy_bedside_transcript.txt, a synthetic
+bedside conversation with the filler, small talk and read-backs of real
+speech-to-text output, and CLINICAL_EDGE, handoff lines an earlier
+version of condense() wrongly dropped or merged; all of it must survive.
+
+Offline it reports, per sample:
+
+  tokens     raw vs condensed transcript (tiktoken o200k_base, the
+             gpt-4o-mini encoding, when its file can be loaded; else
+             characters / 4)
+  session    transcript tokens over a session's model calls: the
+             extraction (condensed) plus one audit per pass and one
+             correction per loop (always the raw transcript);
+             typical = extract + audit, worst = MAX_LOOPS corrections
+  evidence   quotes from the raw transcript that support a form field,
+             and how many are still in the condensed text verbatim and
+             map back (span map) to where they were said
+
+With --live (needs OPENAI_API_KEY) each sample is also extracted from the
+raw and from the condensed transcript, and the atomic fields (numbers,
+short strings, medication names) are scored against the sample's
+reference form, or against the raw extraction when there is none.
+
+Run from Backend/:  python -m benchmarks.bench_transcript_condense [--live] [--show NAME]
+"""
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-unused")
+
+from app.RAG.condense import condense, locate  # noqa: E402
+from app.RAG.convergence import flatten  # noqa: E402
+from app.RAG.state import MAX_LOOPS  # noqa: E402
+from benchmarks.bench_extraction_modes import REFERENCE_FORM, TRANSCRIPT  # noqa: E402
+
+BACKEND = Path(__file__).resolve().parent.parent
+SAMPLES_DIR = BACKEND / "app" / "LLM Parse" / "transcripts"
+
+CLINICAL_EDGE = """\
+Nurse: Good morning. Okay, thanks.
+Nurse: She has been NPO since the weekend.
+Nurse: Patient ambulated twice over the weekend with PT.
+Nurse: Stroke team consulted.
+Nurse: Palliative team is following.
+Nurse: No bowel movement since the weekend.
+Patient: It is raining so her knee is stiff.
+Nurse: Gave 4 mg morphine IV.
+Nurse: Gave 4 mg morphine IV.
+Nurse: Okay. Two two oh five is the extension. Thank you.
+"""
+
+# Quotes (verbatim from the raw transcript) that a correct form depends on.
+EVIDENCE = {
+    "transcript": [
+        "room 207", "patient ID 1128", "my name is Jasmine", "George Murillo",
+        "September 3rd of 2001", "No, that I'm aware of, no.", "34771", "big headache", "97.3",
+        "180 over 20", "7.", "Tylenol", "morphine",
+    ],
+    "perfect_transcript": [
+        "Patient ID: 123", "My Name is Jess", "John Johnson, March 3rd, 1954", "room 412",
+        "allergic to penicillin", "I get a rash", "pneumonia", "infection in my right lung",
+        "short of breath for a few days", "hospital day 2", "COPD and high blood pressure",
+        "type 2 diabetes", "128 over 74", "99.1", "antibiotics and oxygen", "oxygen levels overnight",
+    ],
+    "handoff_x2": [
+        "Maria Lopez", "John Doe in room 312", "March 14th 1958", "full code", "allergic to penicillin, causes hives",
+        "community-acquired\npneumonia", "hypertension, type 2 diabetes and COPD", "temp 99.1", "heart rate 88",
+        "resp rate 18", "128 over 76", "sat 95 percent", "3 out of 10", "ceftriaxone one gram IV every 24 hours",
+        "azithromycin 500 milligrams IV daily", "lisinopril 10 milligrams PO daily", "Blood sugars have been 140 to 180",
+        "repeat the chest x-ray tomorrow", "daughter",
+    ],
+    "noisy_bedside": [
+        "my name is Keisha", "Ramon Alvarez", "June twelfth, nineteen fifty-one", "room 618, bed B", "Sulfa",
+        "hives", "two days ago", "cellulitis on your left leg", "diabetes, type 2", "knee replacement",
+        "Right knee, twenty nineteen", "temperature is 100.2", "Heart rate is 96", "142 over 88",
+        "breathing 18 a minute", "97 percent on room air", "a six", "throbs when I stand up",
+        "cefazolin, two grams IV every eight hours", "oxycodone five milligrams every four hours as needed",
+        "sugar this morning was 212", "four units of the lispro", "mark the redness with a pen",
+        "elevated on two pillows", "full code", "daughter Elena called, she's coming around five",
+    ],
+    "clinical_edge": [
+        "She has been NPO since the weekend.", "Patient ambulated twice over the weekend with PT.",
+        "Stroke team consulted.", "Palliative team is following.", "No bowel movement since the weekend.",
+        "It is raining so her knee is stiff.", "Gave 4 mg morphine IV.\nNurse: Gave 4 mg morphine IV.",
+        "Two two oh five is the extension.",
+    ],
+}
+
+
+def _samples() -> dict:
+    return {
+        "transcript": ((SAMPLES_DIR / "transcript.txt").read_text(encoding="utf-8"),
+                       json.loads((SAMPLES_DIR / "transcript.json").read_text(encoding="utf-8"))),
+        "perfect_transcript": ((SAMPLES_DIR / "perfect_transcript.txt").read_text(encoding="utf-8"), None),
+        "handoff_x2": (TRANSCRIPT, REFERENCE_FORM),
+        "noisy_bedside": ((BACKEND / "benchmarks" / "data" / "noisy_bedside_transcript.txt").read_text(encoding="utf-8"),
+                          None),
+        "clinical_edge": (CLINICAL_EDGE, None),
+    }
+
+
+def _token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return (lambda text: len(encoding.encode(text))), "o200k_base"
+    except Exception:
+        return (lambda text: max(1, len(text) // 4)), "chars/4 (o200k_base not available offline)"
+
+
+def _evidence(raw: str, condensed, quotes: list[str]) -> tuple[int, list[str]]:
+    kept, lost = 0, []
+    for quote in quotes:
+        assert quote in raw, f"evidence {quote!r} is not in the raw transcript"
+        span = locate(condensed, quote)
+        if span is not None and raw[span[0]:span[1]] == quote:
+            kept += 1
+        else:
+            lost.append(quote)
+    return kept, lost
+
+
+def _atomic(form: dict) -> dict:
+    """Fields that can be compared exactly: numbers, short strings and the set of medication names."""
+    fields = {}
+    for path, value in flatten(form or {}).items():
+        if path == "medications" and isinstance(value, list):
+            fields[path] = sorted(str((m or {}).get("name", "")).lower() for m in value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            fields[path] = float(value)
+        elif isinstance(value, str) and value.strip() and len(value) <= 40:
+            fields[path] = re.sub(r"\W+", " ", value).strip().lower()
+    return fields
+
+
+def _score(reference: dict, form: dict) -> tuple[int, int]:
+    expected, got = _atomic(reference), _atomic(form)
+    return sum(got.get(path) == value for path, value in expected.items()), len(expected)
+
+
+def _live(samples: dict, condensed: dict) -> None:
+    from app.llm_parse.parser import extract_form
+
+    print(f"\n{'sample':20} {'reference':>10} {'raw':>12} {'condensed':>12} {'prompt tok raw':>15} {'condensed':>10}")
+    for name, (raw, reference) in samples.items():
+        raw_form, raw_usage = extract_form(raw)
+        cond_form, cond_usage = extract_form(condensed[name].text)
+        label = "given" if reference else "raw run"
+        reference = reference or raw_form
+        r_ok, r_n = _score(reference, raw_form)
+        c_ok, c_n = _score(reference, cond_form)
+        print(f"{name:20} {label:>10} {r_ok:>5}/{r_n:<6} {c_ok:>5}/{c_n:<6} "
+              f"{raw_usage['prompt_tokens']:>15} {cond_usage['prompt_tokens']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="also extract with the real API and score accuracy")
+    parser.add_argument("--show", help="print the condensed text of one sample")
+    args = parser.parse_args()
+
+    count, encoding = _token_counter()
+    samples = _samples()
+    condensed = {}
+    print(f"tokens: {encoding}")
+    print(f"{'sample':20} {'raw tok':>8} {'condensed':>10} {'saved':>6} {'typical':>17} {'worst':>17} "
+          f"{'evidence':>9} {'ms':>6}")
+    for name, (raw, _) in samples.items():
+        start = time.perf_counter()
+        condensed[name] = result = condense(raw)
+        ms = (time.perf_counter() - start) * 1000
+        raw_tokens, cond_tokens = count(raw), count(result.text)
+        # extract + 1 audit; extract + (MAX_LOOPS + 1) audits + MAX_LOOPS corrections. Only the extraction is condensed.
+        typical, worst = 2, 2 * MAX_LOOPS + 2
+        kept, lost = _evidence(raw, result, EVIDENCE[name])
+        print(f"{name:20} {raw_tokens:>8} {cond_tokens:>10} {1 - cond_tokens / raw_tokens:>6.0%} "
+              f"{raw_tokens * typical:>7} -> {cond_tokens + raw_tokens * (typical - 1):<7} "
+              f"{raw_tokens * worst:>7} -> {cond_tokens + raw_tokens * (worst - 1):<7} "
+              f"{kept:>4}/{len(EVIDENCE[name]):<4} {ms:>6.2f}")
+        for quote in lost:
+            print(f"{'':20} lost: {quote!r}")
+
+    if args.show:
+        print(f"\n--- {args.show} (condensed) ---\n{condensed[args.show].text}")
+    if args.live:
+        _live(samples, condensed)
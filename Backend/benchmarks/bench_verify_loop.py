@@ -0,0 +1,133 @@
+"""
+Audit cost of the verify/regenerate loop: the previous loop (full audit
+every pass, stop only when valid or after MAX_LOOPS corrections) vs the
+convergence-aware one in app/RAG (diff-scoped re-audits, early stop when
+errors repeat or stop shrinking, or the corrector changes nothing).
+
+The model calls are scripted so runs are deterministic and offline: the
+auditor flags every field it is shown that differs from a ground-truth
+form, and each scenario's corrector behaves differently:
+
+  fixes_all    fixes every flagged field
+  one_per_pass fixes one flagged field per correction (3 wrong fields)
+  no_op        returns the form unchanged
+  flailing     replaces each flagged value with a different wrong value
+
+Reports auditor calls, auditor input characters (proxy for prompt tokens),
+corrector calls and why the new loop stopped.
+
+Run from Backend/:  python -m benchmarks.bench_verify_loop
+"""
+import copy
+import json
+import logging
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-unused")
+# Compare loop strategies on the same transcript (bench_transcript_condense covers condensation).
+os.environ.setdefault("TRANSCRIPT_CONDENSE", "0")
+
+from app.RAG import node_generate, node_regenerate, node_verify  # noqa: E402
+from app.RAG.convergence import flatten, subset  # noqa: E402
+from app.RAG.graph import compiled_graph  # noqa: E402
+from app.RAG.prompts import VERIFY_SYSTEM_PROMPT  # noqa: E402
+from app.RAG.state import MAX_LOOPS  # noqa: E402
+
+TRANSCRIPT = "Handoff for John Doe in room 312, DOB 1958-03-14, admitted for pneumonia. " * 40
+
+TRUTH = {
+    "patient_information": {"patient_id": None, "name": "John Doe", "dob": "1958-03-14", "room": "312",
+                            "allergies": "Penicillin", "code_status": "Full code",
+                            "reason_for_admission": "Community-acquired pneumonia", "geolocation": None},
+    "background": {"relevant_pmh": "HTN, T2DM", "hospital_day": 3, "post_op_day": None, "procedures": None},
+    "vital_signs": {"temperature_f": 98.6, "heart_rate": 88, "respiratory_rate": 18,
+                    "bp_systolic": 128, "bp_diastolic": 76, "spo2": 95},
+    "current_assessment": {"pain_level_0_10": 3, "additional_info": "Ambulating with assistance."},
+    "nurse_on_shift": {"name": "Maria Lopez"},
+    "medications": [{"name": "Ceftriaxone", "dose": "1 g", "route": "IV", "frequency": "q24h"}],
+}
+WRONG = {"vital_signs.heart_rate": 98, "patient_information.room": "213", "background.hospital_day": 5}
+
+
+def _set(form: dict, path: str, value) -> None:
+    *parents, last = path.split(".")
+    for part in parents:
+        form = form[part]
+    form[last] = value
+
+
+class Auditor:
+    def __init__(self):
+        self.calls = self.chars = 0
+
+    def invoke(self, messages, timeout=None):
+        self.calls += 1
+        self.chars += sum(len(m["content"]) for m in messages)
+        shown = json.loads(messages[1]["content"].split(":\n", 2)[-1])
+        truth = flatten(TRUTH)
+        errors = [f"{path}: transcript says {truth[path]!r}, not {value!r}"
+                  for path, value in flatten(shown).items() if truth.get(path) != value]
+        return node_verify.VerificationResult(is_valid=not errors, errors=errors)
+
+
+class Corrector:
+    def __init__(self, mode: str):
+        self.mode, self.calls = mode, 0
+
+    def invoke(self, messages, timeout=None):
+        self.calls += 1
+        body = messages[1]["content"]
+        form = json.loads(body.split("PREVIOUSLY EXTRACTED JSON:\n", 1)[1].split("\n\nVERIFICATION ERRORS:", 1)[0])
+        flagged = [line[2:].split(":", 1)[0] for line in body.split("VERIFICATION ERRORS:\n", 1)[1].splitlines()]
+        truth = flatten(TRUTH)
+        for i, path in enumerate(flagged):
+            if self.mode == "fixes_all" or (self.mode == "one_per_pass" and i == 0):
+                _set(form, path, truth[path])
+            elif self.mode == "flailing":
+                _set(form, path, f"{flatten(form)[path]}0")
+        return form
+
+
+def _initial() -> dict:
+    form = copy.deepcopy(TRUTH)
+    for path, value in WRONG.items():
+        _set(form, path, value)
+    return form
+
+
+def old_loop(auditor: Auditor, corrector: Corrector) -> None:
+    """The previous graph: full audit per pass, correct until valid or MAX_LOOPS."""
+    form, loop = _initial(), 0
+    while True:
+        result = auditor.invoke([
+            {"role": "system", "content": VERIFY_SYSTEM_PROMPT},
+            {"role": "user", "content": f"RAW TRANSCRIPT:\n{TRANSCRIPT}\n\nEXTRACTED JSON FORM:\n{json.dumps(form, indent=2)}"},
+        ])
+        if result.is_valid or loop >= MAX_LOOPS:
+            return
+        errors = "\n".join(f"- {e}" for e in result.errors)
+        form = corrector.invoke([
+            {"role": "system", "content": ""},
+            {"role": "user", "content": f"RAW TRANSCRIPT:\n{TRANSCRIPT}\n\nPREVIOUSLY EXTRACTED JSON:\n"
+                                        f"{json.dumps(form, indent=2)}\n\nVERIFICATION ERRORS:\n{errors}"},
+        ])
+        loop += 1
+
+
+def new_loop(auditor: Auditor, corrector: Corrector) -> dict:
+    node_verify._auditor, node_regenerate._corrector = auditor, corrector
+    node_generate.generate_form = lambda transcript, on_field=None: _initial()
+    return compiled_graph.invoke({"transcript": TRANSCRIPT})
+
+
+if __name__ == "__main__":
+    logging.getLogger("app.RAG").setLevel(logging.ERROR)
+    assert subset(TRUTH, ["vital_signs.heart_rate"]) == {"vital_signs": {"heart_rate": 88}}
+    print(f"{'scenario':13} {'audits':>11} {'audit chars':>19} {'corrections':>12}  stop reason")
+    for mode in ("fixes_all", "one_per_pass", "no_op", "flailing"):
+        old_a, old_c = Auditor(), Corrector(mode)
+        old_loop(old_a, old_c)
+        new_a, new_c = Auditor(), Corrector(mode)
+        state = new_loop(new_a, new_c)
+        print(f"{mode:13} {old_a.calls:4d} -> {new_a.calls:<4d} {old_a.chars:8d} -> {new_a.chars:<8d} "
+              f"{old_c.calls:4d} -> {new_c.calls:<4d}  {state['termination_reason']} (errors left: {len(state['verification_errors'])})")
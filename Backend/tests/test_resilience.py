@@ -0,0 +1,284 @@
+"""
+app/resilience.py: retries, deadlines, hedging and the circuit breaker,
+with scripted upstream calls and, for status handling, the OpenAI SDK
+against a local fake server.
+
+Run from Backend/:  python -m pytest tests
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import resilience
+from app.resilience import CircuitBreaker, Policy, UpstreamUnavailable
+
+FAST = Policy(deadline=2, attempt_timeout=0.5, max_attempts=3, backoff_base=0.01, backoff_max=0.02)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(resilience, "breaker", CircuitBreaker(failures=3, reset_seconds=0.2))
+    monkeypatch.setattr(resilience, "_latencies", {})
+    monkeypatch.setattr(resilience, "HEDGING_ENABLED", False)
+
+
+class Upstream:
+    """fn for call(): plays one scripted outcome per attempt (an exception, a delay in seconds, or a value)."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.time_left: list[float] = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+            self.calls += 1
+        self.time_left.append(resilience.time_left())
+        if isinstance(outcome, BaseException):
+            raise outcome
+        if isinstance(outcome, float):
+            time.sleep(outcome)
+            return f"slept {outcome}"
+        return outcome
+
+
+# ---------------------------------------------------------------------------
+# Retries
+# ---------------------------------------------------------------------------
+
+def test_retries_transient_failures_then_succeeds():
+    upstream = Upstream(ConnectionError("reset"), ConnectionError("reset"), "ok")
+    assert resilience.call("test", upstream, FAST) == "ok"
+    assert upstream.calls == 3
+    assert resilience.breaker.state == "closed"
+
+
+def test_exhausted_retries_raise_upstream_unavailable_and_count_one_failure():
+    upstream = Upstream(ConnectionError("reset"))
+    with pytest.raises(UpstreamUnavailable):
+        resilience.call("test", upstream, FAST)
+    assert upstream.calls == FAST.max_attempts
+    assert resilience.breaker._failures == 1
+
+
+def test_non_retryable_error_propagates_after_one_attempt_and_leaves_breaker_alone():
+    resilience.breaker.record_failure()
+    resilience.breaker.record_failure()
+    upstream = Upstream(ValueError("bad request"))
+    with pytest.raises(ValueError):
+        resilience.call("test", upstream, FAST)
+    assert upstream.calls == 1
+    assert resilience.breaker._failures == 2  # not reset, as a success would
+
+
+# ---------------------------------------------------------------------------
+# Deadlines
+# ---------------------------------------------------------------------------
+
+def test_slow_attempts_time_out_and_are_retried():
+    upstream = Upstream(5.0, "ok")
+    started = time.monotonic()
+    assert resilience.call("test", upstream, FAST) == "ok"
+    assert time.monotonic() - started < FAST.attempt_timeout + 0.3
+    assert upstream.calls == 2
+
+
+def test_call_never_runs_past_its_deadline():
+    policy = Policy(deadline=0.6, attempt_timeout=0.4, max_attempts=5, backoff_base=0.01, backoff_max=0.02)
+    started = time.monotonic()
+    with pytest.raises(UpstreamUnavailable):
+        resilience.call("test", Upstream(5.0), policy)
+    assert time.monotonic() - started < policy.deadline + 0.2
+
+
+def test_time_left_is_the_attempt_timeout():
+    upstream = Upstream("ok")
+    resilience.call("test", upstream, FAST)
+    assert 0 < upstream.time_left[0] <= FAST.attempt_timeout
+    assert resilience.time_left() == resilience.CLIENT_TIMEOUT  # outside an attempt
+
+
+def test_request_budget_caps_the_op_deadline():
+    policy = Policy(deadline=30, attempt_timeout=30, max_attempts=5, backoff_base=0.01, backoff_max=0.02)
+    started = time.monotonic()
+    with resilience.request_budget(1.5), pytest.raises(UpstreamUnavailable):
+        resilience.call("test", Upstream(5.0), policy)
+    assert time.monotonic() - started < 1.8
+
+
+def test_spent_request_budget_fails_without_calling_upstream():
+    upstream = Upstream("ok")
+    with resilience.request_budget(0.5), pytest.raises(UpstreamUnavailable):
+        resilience.call("test", upstream, FAST)
+    assert upstream.calls == 0
+
+
+def test_policies_fit_the_request_budget():
+    fitted = resilience._fit(Policy(deadline=120, attempt_timeout=90, hedge_after=30), budget=50)
+    assert (fitted.deadline, fitted.attempt_timeout, fitted.hedge_after) == (50, 50, pytest.approx(50 / 3))
+    roomy = Policy(deadline=30, attempt_timeout=10)
+    assert resilience._fit(roomy, budget=50) is roomy
+
+
+# ---------------------------------------------------------------------------
+# Hedging
+# ---------------------------------------------------------------------------
+
+def test_hedged_request_answers_when_the_first_is_slow(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGING_ENABLED", True)
+    policy = Policy(deadline=2, attempt_timeout=1.5, hedge_after=0.1)
+    upstream = Upstream(1.0, "hedge")
+    started = time.monotonic()
+    assert resilience.call("test", upstream, policy) == "hedge"
+    assert time.monotonic() - started < 0.5
+    assert upstream.calls == 2
+
+
+def test_no_hedge_when_the_first_answers_in_time(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGING_ENABLED", True)
+    upstream = Upstream("ok")
+    assert resilience.call("test", upstream, Policy(deadline=2, attempt_timeout=1.5, hedge_after=0.5)) == "ok"
+    assert upstream.calls == 1
+
+
+def test_hedge_threshold_follows_observed_p95(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGING_ENABLED", True)
+    for _ in range(resilience._MIN_SAMPLES):
+        resilience._record_latency("test", 0.05)
+    upstream = Upstream(1.0, "hedge")
+    started = time.monotonic()
+    # hedge_after=1.0 would wait out the slow request; the observed p95 (0.05 s) doesn't.
+    assert resilience.call("test", upstream, Policy(deadline=2, attempt_timeout=1.5, hedge_after=1.0)) == "hedge"
+    assert time.monotonic() - started < 0.5
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failures_to_open):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast():
+    breaker = resilience.breaker
+    _open(breaker)
+    assert breaker.state == "open"
+    upstream = Upstream("ok")
+    with pytest.raises(UpstreamUnavailable) as raised:
+        resilience.call("test", upstream, FAST)
+    assert upstream.calls == 0
+    assert 0 < raised.value.retry_after <= breaker.reset_seconds
+
+
+def test_success_resets_the_failure_count():
+    breaker = resilience.breaker
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_lets_one_trial_through_and_closes_on_success():
+    breaker = resilience.breaker
+    _open(breaker)
+    time.sleep(breaker.reset_seconds)
+    assert breaker.state == "half_open"
+    breaker.before_call()
+    with pytest.raises(UpstreamUnavailable):
+        breaker.before_call()  # the trial is still in flight
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = resilience.breaker
+    _open(breaker)
+    time.sleep(breaker.reset_seconds)
+    with pytest.raises(UpstreamUnavailable):
+        resilience.call("test", Upstream(ConnectionError("reset")), FAST)
+    assert breaker.state == "open"
+
+
+def test_non_retryable_trial_releases_the_half_open_slot():
+    breaker = resilience.breaker
+    _open(breaker)
+    time.sleep(breaker.reset_seconds)
+    with pytest.raises(ValueError):
+        resilience.call("test", Upstream(ValueError("bad request")), FAST)
+    assert breaker.state == "half_open"
+    assert resilience.call("test", Upstream("ok"), FAST) == "ok"
+    assert breaker.state == "closed"
+
+
+# ---------------------------------------------------------------------------
+# The OpenAI SDK against a fake server
+# ---------------------------------------------------------------------------
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    statuses: list[int] = []
+    calls = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        status = self.statuses[min(type(self).calls, len(self.statuses) - 1)]
+        type(self).calls += 1
+        payload = {"error": {"message": "injected", "type": "server_error"}} if status >= 400 else {
+            "id": "chatcmpl-fake", "object": "chat.completion", "created": 0, "model": "fake",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "hi"}}],
+        }
+        raw = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(raw)))
+        if status == 429:
+            self.send_header("retry-after", "0.05")
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+@pytest.fixture
+def fake_openai():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FakeOpenAI.calls = 0
+    from openai import OpenAI
+
+    client = OpenAI(api_key="sk-fake", base_url=f"http://127.0.0.1:{server.server_port}/v1", max_retries=0)
+
+    def complete():
+        return client.chat.completions.create(
+            model="fake", messages=[{"role": "user", "content": "x"}], timeout=resilience.time_left(),
+        ).choices[0].message.content
+
+    yield complete
+    server.shutdown()
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_retryable_statuses_are_retried(fake_openai, status):
+    FakeOpenAI.statuses = [status, 200]
+    assert resilience.call("test", fake_openai, FAST) == "hi"
+    assert FakeOpenAI.calls == 2
+
+
+@pytest.mark.parametrize("status", [400, 401, 422])
+def test_client_errors_are_not_retried(fake_openai, status):
+    import openai
+
+    FakeOpenAI.statuses = [status]
+    with pytest.raises(openai.APIStatusError):
+        resilience.call("test", fake_openai, FAST)
+    assert FakeOpenAI.calls == 1
+    assert resilience.breaker._failures == 0
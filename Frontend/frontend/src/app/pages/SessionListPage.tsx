@@ -1,4 +1,4 @@
-import { useState, useEffect, useMemo } from "react";
+import { useState, useEffect, useMemo, useRef } from "react";
 import { useNavigate } from "react-router";
 import { Button } from "../components/ui/button";
 import { Plus, Upload, RefreshCw, Loader2 } from "lucide-react";
@@ -58,11 +58,17 @@ export default function SessionListPage() {
     DEFAULT_SESSION_FILTERS
   );
 
+  // Server time the list is current as of; refreshes only fetch what changed since.
+  const watermark = useRef<string | null>(null);
+
   const fetchSessions = async () => {
     try {
       setLoading(true);
+      // Watermark first, so nothing changed during the list fetch is missed.
+      const { watermark: since } = (await api.getSessionChanges())!;
       const data = await api.listSessions(100, 0);
       setSessions(data.map(api.backendSessionToFrontend));
+      watermark.current = since;
       setError(null);
     } catch {
       setError("Failed to load sessions. Please try again.");
@@ -81,10 +87,34 @@ export default function SessionListPage() {
   };
 
   const handleRefresh = async () => {
+    if (!watermark.current) return fetchSessions();
     setRefreshing(true);
     try {
-      const data = await api.listSessions(100, 0);
-      setSessions(data.map(api.backendSessionToFrontend));
+      const since = watermark.current;
+      let changes = await api.getSessionChanges(since);
+      while (changes) {
+        const { sessions: changed, deleted } = changes;
+        const removed = new Set(deleted.map((d) => String(d.id)));
+        const updated = new Map(
+          changed.map((row) => [String(row.id), api.backendSessionToFrontend(row)]),
+        );
+        setSessions((prev) => [
+          ...changed
+            .filter((row) => !prev.some((s) => s.id === String(row.id)))
+            .map((row) => updated.get(String(row.id))!),
+          ...prev
+            .filter((s) => !removed.has(s.id))
+            .map((s) => updated.get(s.id) ?? s),
+        ]);
+        watermark.current = changes.watermark;
+        if (!changes.has_more) break;
+        changes = await api.getSessionChanges(since, changes.cursor);
+      }
+      if (!changes) {
+        // Too long since the last sync for the server to know what was deleted.
+        watermark.current = null;
+        await fetchSessions();
+      }
     } catch {
       // Silently ignore refresh errors — list already shown
     } finally {
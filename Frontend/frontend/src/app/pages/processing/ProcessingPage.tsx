@@ -3,6 +3,7 @@ import { useParams, useLocation, useNavigate } from "react-router";
 import { TopNav } from "../../components/TopNav";
 import { StatusCard } from "./components/StatusCard";
 import { StatusCardSkeleton } from "./components/StatusCardSkeleton";
+import { LiveFields, LiveField } from "./components/LiveFields";
 import { Step } from "./components/Stepper";
 import { ArrowLeft, User, Calendar } from "lucide-react";
 import { Link } from "react-router";
@@ -61,12 +62,36 @@ export default function ProcessingPage() {
   const [progress, setProgress] = useState(0);
   const [steps, setSteps] = useState<Step[]>(BASE_STEPS);
   const [error, setError] = useState<any>(null);
+  const [liveFields, setLiveFields] = useState<LiveField[]>([]);
 
   // Use a ref for the interval so the callback can always read the current ID.
   const pollIntervalRef = useRef<ReturnType<typeof setInterval> | null>(null);
   // Guard against double-execution in React 18 Strict Mode.
   const ranRef = useRef(false);
 
+  /** Apply a streamed pipeline event: new/corrected fields and the auditor's verdicts. */
+  const onStopEvent = (event: api.StopEvent) => {
+    if (event.event === 'field') {
+      const field: LiveField = { path: event.path, value: event.value, status: 'unverified' };
+      setLiveFields((prev) =>
+        prev.some((f) => f.path === field.path)
+          ? prev.map((f) => (f.path === field.path ? field : f))
+          : [...prev, field]
+      );
+    } else if (event.event === 'verification') {
+      const verified = new Set(event.verified);
+      setLiveFields((prev) =>
+        prev.map((f) =>
+          event.flagged[f.path]
+            ? { ...f, status: 'flagged', notes: event.flagged[f.path] }
+            : verified.has(f.path)
+            ? { ...f, status: 'verified', notes: undefined }
+            : f
+        )
+      );
+    }
+  };
+
   const stopPolling = () => {
     if (pollIntervalRef.current !== null) {
       clearInterval(pollIntervalRef.current);
@@ -114,7 +139,7 @@ export default function ProcessingPage() {
       setSteps(progressToSteps(0, 'pending'));
 
       api
-        .stopRecording(numericId, audioBlob!)
+        .stopRecording(numericId, audioBlob!, onStopEvent)
         .then((result) => {
           stopPolling();
           sessionStorage.setItem(`transcript-${sessionId}`, result.transcript ?? '');
@@ -239,6 +264,13 @@ export default function ProcessingPage() {
           )}
         </div>
 
+        {/* Fields stream in as they are extracted, then get verified or flagged */}
+        {liveFields.length > 0 && (
+          <div className="w-full max-w-4xl mt-6">
+            <LiveFields fields={liveFields} />
+          </div>
+        )}
+
         {/* Dev Controls */}
         <div className="mt-12 p-4 border border-dashed border-border rounded-lg bg-muted/20 w-full max-w-4xl">
           <p className="text-xs font-mono text-muted-foreground mb-3 uppercase tracking-wider">
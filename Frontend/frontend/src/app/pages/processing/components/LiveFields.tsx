@@ -0,0 +1,72 @@
+import type { ReactNode } from "react";
+import { CheckCircle2, AlertTriangle, Loader2 } from "lucide-react";
+
+export type LiveFieldStatus = 'unverified' | 'verified' | 'flagged';
+
+export interface LiveField {
+  path: string;
+  value: unknown;
+  status: LiveFieldStatus;
+  notes?: string[];
+}
+
+interface LiveFieldsProps {
+  fields: LiveField[];
+}
+
+/** "vital_signs.heart_rate" → "Vital signs · Heart rate" */
+function fieldLabel(path: string): string {
+  return path
+    .split('.')
+    .map((part) => part.replace(/_/g, ' ').replace(/^\w/, (c) => c.toUpperCase()))
+    .join(' · ');
+}
+
+function formatValue(value: unknown): string {
+  if (value === null || value === undefined || value === '') return '—';
+  if (Array.isArray(value)) {
+    return value
+      .map((item) => (item && typeof item === 'object' && 'name' in item ? String((item as any).name) : String(item)))
+      .join(', ') || '—';
+  }
+  return typeof value === 'object' ? JSON.stringify(value) : String(value);
+}
+
+const STATUS_ICON: Record<LiveFieldStatus, ReactNode> = {
+  unverified: <Loader2 className="w-3.5 h-3.5 text-muted-foreground animate-spin" />,
+  verified: <CheckCircle2 className="w-3.5 h-3.5 text-green-500" />,
+  flagged: <AlertTriangle className="w-3.5 h-3.5 text-amber-500" />,
+};
+
+const STATUS_LABEL: Record<LiveFieldStatus, string> = {
+  unverified: 'Unverified',
+  verified: 'Verified',
+  flagged: 'Flagged',
+};
+
+/** Form fields as the pipeline extracts them, until the auditor confirms or flags each one. */
+export function LiveFields({ fields }: LiveFieldsProps) {
+  if (fields.length === 0) return null;
+
+  return (
+    <div className="w-full border border-border rounded-lg bg-card overflow-hidden">
+      <div className="px-4 py-3 border-b border-border flex items-center justify-between">
+        <span className="text-sm font-medium text-foreground">Extracted so far</span>
+        <span className="text-xs text-muted-foreground">
+          {fields.filter((f) => f.status === 'verified').length}/{fields.length} verified
+        </span>
+      </div>
+      <ul className="divide-y divide-border max-h-80 overflow-y-auto">
+        {fields.map((field) => (
+          <li key={field.path} className="px-4 py-2 flex items-start gap-3 text-sm animate-in fade-in">
+            <span className="mt-0.5" title={field.notes?.join('\n') ?? STATUS_LABEL[field.status]}>
+              {STATUS_ICON[field.status]}
+            </span>
+            <span className="text-muted-foreground w-56 shrink-0">{fieldLabel(field.path)}</span>
+            <span className="text-foreground break-words">{formatValue(field.value)}</span>
+          </li>
+        ))}
+      </ul>
+    </div>
+  );
+}
@@ -24,6 +24,12 @@ import { HandoffForm, HandoffStatus } from '../types/handoff';
 const BASE_URL: string =
   (import.meta as any).env?.VITE_API_BASE_URL ?? 'http://localhost:8000';
 
+// Chunked uploads need every request of an upload to reach the same media
+// store. Serverless instances each have their own /tmp, so they are opt-in
+// (VITE_RESUMABLE_UPLOADS=true) for backends with one persistent MEDIA_ROOT.
+const RESUMABLE_UPLOADS: boolean =
+  (import.meta as any).env?.VITE_RESUMABLE_UPLOADS === 'true';
+
 // ---------------------------------------------------------------------------
 // Backend types (mirror of Pydantic schemas)
 // ---------------------------------------------------------------------------
@@ -103,10 +109,32 @@ export interface StopResponse {
   id: number;
   status: string;
   progress: number;
+  media_id: string;
   transcript: string;
   form: Record<string, unknown>;
 }
 
+/** Events of POST /sessions/{id}/stop?stream=true (one JSON object per line). */
+export type StopEvent =
+  | { event: 'progress'; stage: 'transcribe' | 'analyze' | 'prepare'; progress: number }
+  | { event: 'field'; path: string; value: unknown; status: 'unverified' }
+  | {
+      event: 'verification';
+      loop: number;
+      final: boolean;
+      verified: string[];
+      flagged: Record<string, string[]>;
+      errors: string[];
+    }
+  | ({ event: 'complete' } & StopResponse)
+  | { event: 'error'; status_code: number; detail: unknown; retry_after: string | null };
+
+interface UploadCreated {
+  upload_id?: string;
+  media_id?: string;
+  offset?: number;
+}
+
 interface SVIResponse {
   metrics: SVIMetric[];
   questions: FollowUpQuestion[];
@@ -129,19 +157,6 @@ async function request<T>(path: string, opts?: RequestInit): Promise<T> {
   return res.json() as Promise<T>;
 }
 
-async function postForm<T>(path: string, formData: FormData): Promise<T> {
-  const res = await fetch(`${BASE_URL}${path}`, {
-    method: 'POST',
-    body: formData,
-    // Do NOT set Content-Type — browser sets it with the multipart boundary.
-  });
-  if (!res.ok) {
-    const text = await res.text().catch(() => res.statusText);
-    throw new Error(`API POST ${path} failed (${res.status}): ${text}`);
-  }
-  return res.json() as Promise<T>;
-}
-
 // ---------------------------------------------------------------------------
 // API calls
 // ---------------------------------------------------------------------------
@@ -161,14 +176,173 @@ export async function listSessions(
   );
 }
 
-/** Upload audio and trigger the transcription + RAG pipeline. */
+/** GET /sessions/changes: what changed since a watermark. */
+export interface SessionChanges {
+  sessions: BackendSessionRow[];
+  deleted: { id: number; deleted_at: string }[];
+  watermark: string;
+  has_more: boolean;
+  /** With has_more: pass back, with the same `since`, for the next page. */
+  cursor: string | null;
+}
+
+/**
+ * Sessions changed and deleted since `since`. Without `since` only a fresh
+ * watermark is returned; take it before the first full listSessions().
+ * Returns null when the watermark is too old for the server's change
+ * history (410) — reload the whole list then. When has_more is set, call
+ * again with the same `since` and the returned cursor for the next page.
+ */
+export async function getSessionChanges(
+  since?: string,
+  cursor?: string | null,
+): Promise<SessionChanges | null> {
+  const params = new URLSearchParams();
+  if (since) params.set('since', since);
+  if (cursor) params.set('cursor', cursor);
+  const query = params.toString() ? `?${params}` : '';
+  const res = await fetch(`${BASE_URL}/sessions/changes${query}`);
+  if (res.status === 410) return null;
+  if (!res.ok) {
+    const text = await res.text().catch(() => res.statusText);
+    throw new Error(`API GET /sessions/changes failed (${res.status}): ${text}`);
+  }
+  return res.json() as Promise<SessionChanges>;
+}
+
+const UPLOAD_CHUNK_BYTES = 2 * 1024 * 1024;
+const UPLOAD_MAX_RETRIES = 5;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Upload a blob to the media store in resumable chunks. A failed chunk is
+ * retried from the offset the server reports, so a dropped connection only
+ * re-sends the current chunk. Returns the content-addressed media_id.
+ */
+export async function uploadMedia(blob: Blob, filename: string): Promise<string> {
+  const created = await request<UploadCreated>('/media/uploads', {
+    method: 'POST',
+    body: JSON.stringify({ filename, content_type: blob.type || null, size: blob.size }),
+  });
+  if (created.media_id) return created.media_id;
+
+  const uploadId = created.upload_id!;
+  let offset = 0;
+  let failures = 0;
+  while (offset < blob.size) {
+    try {
+      const res = await fetch(`${BASE_URL}/media/uploads/${uploadId}?offset=${offset}`, {
+        method: 'PUT',
+        body: blob.slice(offset, offset + UPLOAD_CHUNK_BYTES),
+      });
+      if (res.ok || res.status === 409) {
+        const body = await res.json();
+        offset = res.ok ? body.offset : body.detail.offset;
+        failures = 0;
+        continue;
+      }
+      throw new Error(`chunk upload failed (${res.status})`);
+    } catch (err) {
+      if (++failures > UPLOAD_MAX_RETRIES) throw err;
+      await sleep(500 * 2 ** failures);
+      // Resume from wherever the server actually got to.
+      offset = (await request<{ offset: number }>(`/media/uploads/${uploadId}`).catch(() => ({ offset }))).offset;
+    }
+  }
+  const done = await request<{ media_id: string }>(`/media/uploads/${uploadId}/complete`, { method: 'POST' });
+  return done.media_id;
+}
+
+const STOP_MAX_RETRIES = 2;
+// 409: an earlier request for this recording is still running; 429: the
+// server's admission queue is full; 5xx: upstream outage or a restart.
+const RETRYABLE_STOP_STATUS = [409, 429, 502, 503, 504];
+
+class StopFailed extends Error {
+  retryable: boolean;
+  retryAfter?: number;
+
+  constructor(message: string, retryable: boolean, retryAfter?: number) {
+    super(message);
+    this.retryable = retryable;
+    this.retryAfter = retryAfter;
+  }
+}
+
+/** Read an NDJSON stop stream, passing each event on; resolves with the "complete" body. */
+async function readStopStream(
+  res: Response,
+  path: string,
+  onEvent: (event: StopEvent) => void,
+): Promise<StopResponse> {
+  const reader = res.body!.pipeThrough(new TextDecoderStream()).getReader();
+  let buffered = '';
+  for (;;) {
+    const { value, done } = await reader.read().catch(() => ({ value: undefined, done: true }));
+    if (done) throw new StopFailed(`API POST ${path} stream ended early`, true);
+    buffered += value;
+    const lines = buffered.split('\n');
+    buffered = lines.pop() ?? '';
+    for (const line of lines.filter(Boolean)) {
+      const event = JSON.parse(line) as StopEvent;
+      if (event.event === 'complete') {
+        const { event: _complete, ...body } = event;
+        return body;
+      }
+      if (event.event === 'error') {
+        throw new StopFailed(
+          `API POST ${path} failed (${event.status_code}): ${JSON.stringify(event.detail)}`,
+          RETRYABLE_STOP_STATUS.includes(event.status_code),
+          Number(event.retry_after) || undefined,
+        );
+      }
+      onEvent(event);
+    }
+  }
+}
+
+/**
+ * Upload audio and trigger the transcription + RAG pipeline. By default the
+ * audio goes with the request itself; with RESUMABLE_UPLOADS it is uploaded
+ * in chunks first and the request carries its media_id. If the request is
+ * cut off (timeout, crashed worker, upstream outage) or turned away because
+ * the server is busy, it is retried the same way after the server's
+ * Retry-After; the backend resumes from its last pipeline checkpoint.
+ *
+ * With onEvent, the response is streamed: progress, each form field as soon
+ * as it is extracted (unverified) and the auditor's verdicts arrive while
+ * the pipeline is still running.
+ */
 export async function stopRecording(
   sessionId: number,
   audioBlob: Blob,
+  onEvent?: (event: StopEvent) => void,
 ): Promise<StopResponse> {
-  const formData = new FormData();
-  formData.append('audio_file', audioBlob, 'recording.webm');
-  return postForm<StopResponse>(`/sessions/${sessionId}/stop`, formData);
+  const mediaId = RESUMABLE_UPLOADS ? await uploadMedia(audioBlob, 'recording.webm') : null;
+  const path = `/sessions/${sessionId}/stop${onEvent ? '?stream=true' : ''}`;
+  for (let attempt = 0; ; attempt++) {
+    const formData = new FormData();
+    if (mediaId) formData.append('media_id', mediaId);
+    else formData.append('audio_file', audioBlob, 'recording.webm');
+    try {
+      // No Content-Type: the browser sets it with the multipart boundary.
+      const res = await fetch(`${BASE_URL}${path}`, { method: 'POST', body: formData }).catch(() => null);
+      if (!res) throw new StopFailed(`API POST ${path} failed (network)`, true);
+      if (!res.ok) {
+        const text = await res.text().catch(() => res.statusText);
+        throw new StopFailed(
+          `API POST ${path} failed (${res.status}): ${text}`,
+          RETRYABLE_STOP_STATUS.includes(res.status),
+          Number(res.headers.get('Retry-After')) || undefined,
+        );
+      }
+      return onEvent ? await readStopStream(res, path, onEvent) : ((await res.json()) as StopResponse);
+    } catch (err) {
+      if (!(err instanceof StopFailed) || !err.retryable || attempt >= STOP_MAX_RETRIES) throw err;
+      await sleep(err.retryAfter ? err.retryAfter * 1000 : 2000 * 2 ** attempt);
+    }
+  }
 }
 
 /** Poll the current processing status and progress (0–100). */
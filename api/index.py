@@ -11,6 +11,20 @@ import sys
 # Make `app.*` importable from the Backend directory.
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Backend"))
 
+# Only /tmp is writable on Vercel, and it is per-instance: the requests of a
+# resumable upload can land on different instances, so the frontend sends
+# audio with /stop itself unless VITE_RESUMABLE_UPLOADS is set.
+os.environ.setdefault("MEDIA_ROOT", "/tmp/media_store")
+
+# maxDuration in vercel.json is 60 s: upstream calls give up (503 +
+# Retry-After) in time for the response to get out before the kill.
+os.environ.setdefault("REQUEST_BUDGET_SECONDS", "50")
+
+# AUTH_SECRET must be set in the Vercel project's environment variables (a
+# long random string, as render.yaml generates): every invocation may run on
+# a different instance, so tokens only verify everywhere with a shared key.
+# With AUTH_REQUIRED=1 the function refuses to start without it.
+
 from app.main import app as _backend_app  # noqa: E402
 
 